@@ -2,14 +2,44 @@ import os
 from openai import OpenAI
 from typing import Optional, Dict, Any
 import time
+from utils.assistant_cache import AssistantIdCache, assistant_id_cache
+from utils.run_waiter import poll, wait_for_run
 
 class Assistant:
     """Handles conversation and analysis using OpenAI's Assistant API."""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.assistant = self._get_or_create_assistant()
-        self.thread = self.client.beta.threads.create()
+    assistant_name = "DROE Life Story Assistant"
+    
+    def __init__(self, assistant_cache: Optional[AssistantIdCache] = None):
+        # The client, assistant and thread are all created on first use
+        self.assistant_cache = assistant_cache or assistant_id_cache
+        self._client: Optional[OpenAI] = None
+        self._assistant_id: Optional[str] = None
+        self._thread_id: Optional[str] = None
+        self._last_run_id: Optional[str] = None
+
+    @property
+    def client(self) -> OpenAI:
+        """OpenAI client, created on first use."""
+        if self._client is None:
+            self._client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._client
+
+    @property
+    def assistant_id(self) -> str:
+        """ID of the assistant, resolved on first use and cached on disk."""
+        if self._assistant_id is None:
+            self._assistant_id = self.assistant_cache.get_or_resolve(
+                self.assistant_name, lambda: self._get_or_create_assistant().id
+            )
+        return self._assistant_id
+
+    @property
+    def thread_id(self) -> str:
+        """ID of this conversation's thread, created on first use."""
+        if self._thread_id is None:
+            self._thread_id = self.client.beta.threads.create().id
+        return self._thread_id
 
     def _get_or_create_assistant(self):
         """Get existing assistant or create a new one."""
@@ -18,12 +48,12 @@ class Assistant:
         
         # Look for our assistant
         for assistant in assistants.data:
-            if assistant.name == "DROE Life Story Assistant":
+            if assistant.name == self.assistant_name:
                 return assistant
         
         # Create new assistant if not found
         return self.client.beta.assistants.create(
-            name="DROE Life Story Assistant",
+            name=self.assistant_name,
             instructions="You are a helpful assistant designed to help people document their life stories.",
             model="gpt-4-turbo-preview"
         )
@@ -31,7 +61,7 @@ class Assistant:
     def create_message(self, content: str) -> Dict[str, Any]:
         """Create a new message in the thread."""
         message = self.client.beta.threads.messages.create(
-            thread_id=self.thread.id,
+            thread_id=self.thread_id,
             role="user",
             content=content
         )
@@ -40,28 +70,31 @@ class Assistant:
     def create_run(self) -> Dict[str, Any]:
         """Create a new run for the current thread."""
         run = self.client.beta.threads.runs.create(
-            thread_id=self.thread.id,
-            assistant_id=self.assistant.id
+            thread_id=self.thread_id,
+            assistant_id=self.assistant_id
         )
+        self._last_run_id = run.id
         return {'id': run.id}
     
     def get_response(self, timeout: int = 30) -> str:
         """Get the assistant's response."""
         # Wait for the run to complete
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        if self._last_run_id:
+            wait_for_run(self.client, self.thread_id, self._last_run_id, timeout=timeout)
+        
+        def latest_reply():
             messages = self.client.beta.threads.messages.list(
-                thread_id=self.thread.id
+                thread_id=self.thread_id
             )
-            
             # Get the most recent assistant message
             for message in messages.data:
                 if message.role == "assistant":
                     return message.content[0].text.value
-            
-            time.sleep(1)
+            return None
         
-        raise TimeoutError("Assistant did not respond in time")
+        return poll(latest_reply, lambda reply: reply is not None,
+                    timeout=max(deadline - time.monotonic(), 0))
 
     def analyze_text(self, text: str) -> Dict[str, Any]:
         """
@@ -76,31 +109,23 @@ class Assistant:
         try:
             # Add the user's message to the thread
             message = self.client.beta.threads.messages.create(
-                thread_id=self.thread.id,
+                thread_id=self.thread_id,
                 role="user",
                 content=f"Analyze this text: {text}"
             )
             
             # Create a run with the assistant
             run = self.client.beta.threads.runs.create(
-                thread_id=self.thread.id,
-                assistant_id=self.assistant.id
+                thread_id=self.thread_id,
+                assistant_id=self.assistant_id
             )
             
             # Wait for the run to complete
-            while True:
-                run_status = self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread.id,
-                    run_id=run.id
-                )
-                if run_status.status == 'completed':
-                    break
-                elif run_status.status == 'failed':
-                    raise Exception("Run failed")
+            wait_for_run(self.client, self.thread_id, run.id)
             
             # Get the assistant's response
             messages = self.client.beta.threads.messages.list(
-                thread_id=self.thread.id
+                thread_id=self.thread_id
             )
             
             analysis = messages.data[0].content[0].text.value
@@ -126,31 +151,23 @@ class Assistant:
         try:
             # Add the user's message to the thread
             message = self.client.beta.threads.messages.create(
-                thread_id=self.thread.id,
+                thread_id=self.thread_id,
                 role="user",
                 content=f"Generate a follow-up question based on this context: {context}"
             )
             
             # Create a run with the assistant
             run = self.client.beta.threads.runs.create(
-                thread_id=self.thread.id,
-                assistant_id=self.assistant.id
+                thread_id=self.thread_id,
+                assistant_id=self.assistant_id
             )
             
             # Wait for the run to complete
-            while True:
-                run_status = self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread.id,
-                    run_id=run.id
-                )
-                if run_status.status == 'completed':
-                    break
-                elif run_status.status == 'failed':
-                    raise Exception("Run failed")
+            wait_for_run(self.client, self.thread_id, run.id)
             
             # Get the assistant's response
             messages = self.client.beta.threads.messages.list(
-                thread_id=self.thread.id
+                thread_id=self.thread_id
             )
             
             return messages.data[0].content[0].text.value
@@ -1,9 +1,11 @@
 from flask import Flask, jsonify, request, session, make_response
 from flask_cors import CORS
-from flask_session import Session
 from db import SessionLocal
-from db.utils import save_card, card_to_model, get_cards_for_session, get_timeline_for_session
+from db.utils import save_card, card_to_model, get_cards_page, get_timeline_page
 from db.init_db import init_db
+from routes.caching import cached_json_response
+from db.session_interface import SQLiteSessionInterface
+from db.session_db import session_db
 from cards.event_card import EventCard
 from cards.location_card import LocationCard
 from cards.person_card import PersonCard
@@ -11,25 +13,44 @@ from cards.emotion_card import EmotionCard
 from routes.interview import interview_bp
 from routes.timeline import timeline_bp
 from routes.cards import cards_bp
+from routes.pagination import get_page_args
+import atexit
+import threading
 import uuid
 import os
 from datetime import timedelta
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # Generate a secure secret key
-app.config['SESSION_TYPE'] = 'filesystem'
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=1)
 app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
-app.config['SESSION_FILE_DIR'] = os.path.join(os.getcwd(), 'flask_session')
-app.config['SESSION_FILE_THRESHOLD'] = 100
 
-# Create session directory if it doesn't exist
-os.makedirs(app.config['SESSION_FILE_DIR'], exist_ok=True)
+# Server-side sessions in SQLite, expired after PERMANENT_SESSION_LIFETIME
+SQLiteSessionInterface(
+    os.getenv('FLASK_SESSION_DB'),
+    max_size=int(os.getenv('FLASK_SESSION_MAX_SIZE', 64 * 1024))
+).init_app(app)
 
-# Initialize Flask-Session
-Session(app)
+_sweeper_lock = threading.Lock()
+_sweeper_started = False
+
+@app.before_request
+def start_session_sweeper():
+    """Start expiring sessions on the first request rather than on import.
+
+    The sweeper thread is stopped again when the interpreter exits.
+    """
+    global _sweeper_started
+    if _sweeper_started:
+        return
+    with _sweeper_lock:
+        if not _sweeper_started:
+            session_db.ttl = app.permanent_session_lifetime.total_seconds()
+            app.session_interface.start_sweeper(session_db.delete_expired)
+            atexit.register(app.session_interface.stop_sweeper, 5)
+            _sweeper_started = True
 
 # Initialize database
 init_db()
@@ -62,7 +83,7 @@ def close_db(exception=None):
 # Cards endpoint
 @app.route('/cards', methods=['GET'])
 def get_cards():
-    """Get all cards for the current session."""
+    """Get a page of cards for the current session."""
     try:
         # Get session ID from request
         session_id = request.cookies.get('session')
@@ -71,12 +92,21 @@ def get_cards():
                 "error": "No session cookie found"
             }), 401
         
-        # Get cards from database
-        cards = get_cards_for_session(request.db, session_id)
-        return jsonify({
-            "success": True,
-            "cards": [card_to_model(card) for card in cards]
-        })
+        try:
+            limit, cursor = get_page_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        def build() -> bytes:
+            # Get cards from database
+            cards, next_cursor = get_cards_page(request.db, session_id, limit, cursor)
+            return app.json.dumps({
+                "success": True,
+                "cards": [card_to_model(card) for card in cards],
+                "next_cursor": next_cursor
+            }).encode('utf-8')
+        
+        return cached_json_response(session_id, f"cards:{limit}:{cursor or ''}", build)
             
     except Exception as e:
         return jsonify({
@@ -87,7 +117,7 @@ def get_cards():
 # Timeline endpoint
 @app.route('/timeline', methods=['GET'])
 def get_timeline():
-    """Get timeline items for the current session."""
+    """Get a page of timeline items for the current session."""
     try:
         # Get session ID from request
         session_id = request.cookies.get('session')
@@ -96,12 +126,21 @@ def get_timeline():
                 "error": "No session cookie found"
             }), 401
         
-        # Get timeline from database
-        timeline = get_timeline_for_session(request.db, session_id)
-        return jsonify({
-            "success": True,
-            "timeline": [card_to_model(card) for card in timeline]
-        })
+        try:
+            limit, cursor = get_page_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        def build() -> bytes:
+            # Get timeline from database
+            timeline, next_cursor = get_timeline_page(request.db, session_id, limit, cursor)
+            return app.json.dumps({
+                "success": True,
+                "timeline": [card_to_model(card) for card in timeline],
+                "next_cursor": next_cursor
+            }).encode('utf-8')
+        
+        return cached_json_response(session_id, f"api-timeline:{limit}:{cursor or ''}", build)
             
     except Exception as e:
         return jsonify({
@@ -3,7 +3,7 @@ import os
 from ui_components.styles import add_custom_styles
 from ui_components.timeline import create_timeline_ui
 from ui_components.interview import render as create_interview_ui
-import requests
+from ui_components import api_client
 import json
 from datetime import datetime
 import uuid
@@ -149,20 +149,15 @@ if 'interview_data' not in st.session_state:
     st.session_state.interview_data = None
 
 # API configuration
-API_BASE_URL = "http://localhost:5001"
+API_BASE_URL = api_client.API_BASE_URL
 
 def get_interview():
     """Get the current interview state."""
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/interview",
-            cookies={'session_id': st.session_state.session_id}
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"Error getting interview: {response.text}")
-            return None
+        return api_client.get_interview(st.session_state.session_id, API_BASE_URL)
+    except api_client.APIError as e:
+        st.error(f"Error getting interview: {e.text}")
+        return None
     except Exception as e:
         st.error(f"Error connecting to API: {str(e)}")
         return None
@@ -170,16 +165,10 @@ def get_interview():
 def submit_answer(answer):
     """Submit an answer to the current interview question."""
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/interview",
-            json={'answer': answer},
-            cookies={'session_id': st.session_state.session_id}
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"Error submitting answer: {response.text}")
-            return None
+        return api_client.submit_answer(answer, st.session_state.session_id, API_BASE_URL)
+    except api_client.APIError as e:
+        st.error(f"Error submitting answer: {e.text}")
+        return None
     except Exception as e:
         st.error(f"Error connecting to API: {str(e)}")
         return None
@@ -202,6 +191,7 @@ def main():
         with col2:
             if st.button("View Timeline", key="timeline_btn"):
                 st.session_state.page = "timeline"
+                st.session_state.pop('timeline_events', None)
                 st.rerun()
         with col3:
             if st.button("Browse Cards", key="cards_btn"):
@@ -251,23 +241,35 @@ def main():
     elif st.session_state.page == "timeline":
         st.header("Timeline")
         
-        # Get timeline data
-        try:
-            response = requests.get(
-                f"{API_BASE_URL}/timeline",
-                cookies={'session_id': st.session_state.session_id}
-            )
-            if response.status_code == 200:
-                timeline_data = response.json()
-                
-                # Display timeline
-                for event in timeline_data.get('timeline', []):
-                    with st.expander(f"{event['title']} - {event['date']}"):
-                        st.write(event['description'])
-            else:
-                st.error(f"Error getting timeline: {response.text}")
-        except Exception as e:
-            st.error(f"Error connecting to API: {str(e)}")
+        if 'timeline_events' not in st.session_state:
+            st.session_state.timeline_events = []
+            st.session_state.timeline_cursor = None
+            st.session_state.timeline_loaded = False
+        
+        # Get the next page of timeline data
+        if not st.session_state.timeline_loaded:
+            try:
+                timeline_data = api_client.get_timeline_page(
+                    st.session_state.session_id,
+                    st.session_state.timeline_cursor,
+                    API_BASE_URL
+                )
+                st.session_state.timeline_events.extend(timeline_data.get('timeline', []))
+                st.session_state.timeline_cursor = timeline_data.get('next_cursor')
+                st.session_state.timeline_loaded = True
+            except api_client.APIError as e:
+                st.error(f"Error getting timeline: {e.text}")
+            except Exception as e:
+                st.error(f"Error connecting to API: {str(e)}")
+        
+        # Display timeline
+        for event in st.session_state.timeline_events:
+            with st.expander(f"{event['title']} - {event['date']}"):
+                st.write(event['description'])
+        
+        if st.session_state.timeline_cursor and st.button("Load more"):
+            st.session_state.timeline_loaded = False
+            st.rerun()
         
         # Back button
         if st.button("Back to Home"):
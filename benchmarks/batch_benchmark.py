@@ -0,0 +1,65 @@
+"""Compare throughput of the batch card APIs with a loop over the single-card ones.
+
+Usage:
+    python -m benchmarks.batch_benchmark [--cards N] [--backend files|segments] [--no-fsync]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from typing import Callable, Dict, List
+from benchmarks.codec_benchmark import sample_cards
+from cards.memory_card import MemoryCard
+from core.droe_core import STORAGE_BACKENDS
+
+def _cards_per_second(func: Callable[[], None], count: int) -> float:
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+def _measure(backend: str, count: int, fsync: bool, batch: bool) -> Dict[str, float]:
+    temp_dir = tempfile.mkdtemp()
+    # The card cache is off so loads measure storage I/O
+    manager = STORAGE_BACKENDS[backend](temp_dir, fsync=fsync, cache_size=0)
+    try:
+        cards = [MemoryCard.from_dict(data) for data in sample_cards(count)]
+        keys = [(card.id, 'memory') for card in cards]
+        if batch:
+            operations = {
+                'save': lambda: manager.save_cards(cards),
+                'load': lambda: manager.load_cards(keys),
+                'delete': lambda: manager.delete_cards(keys)
+            }
+        else:
+            operations = {
+                'save': lambda: [manager.save_card(card) for card in cards],
+                'load': lambda: [manager.load_card(*key) for key in keys],
+                'delete': lambda: [manager.delete_card(*key) for key in keys]
+            }
+        return {name: _cards_per_second(operation, count) for name, operation in operations.items()}
+    finally:
+        manager.close()
+        shutil.rmtree(temp_dir)
+
+def run(count: int, backend: str, fsync: bool) -> List[Dict]:
+    """
+    Save, load and delete the same cards one at a time and as batches.
+
+    Returns:
+        List[Dict]: Cards per second of every operation, per API
+    """
+    return [
+        dict(api=api, **_measure(backend, count, fsync, batch=api == 'batch'))
+        for api in ('single', 'batch')
+    ]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=1000, help="Cards per operation")
+    parser.add_argument('--backend', choices=sorted(STORAGE_BACKENDS), default='files')
+    parser.add_argument('--no-fsync', action='store_true', help="Don't flush writes to disk")
+    args = parser.parse_args()
+
+    print(f"{'api':<8}{'save/s':>10}{'load/s':>10}{'delete/s':>10}")
+    for row in run(args.cards, args.backend, not args.no_fsync):
+        print(f"{row['api']:<8}{row['save']:>10.0f}{row['load']:>10.0f}{row['delete']:>10.0f}")
@@ -0,0 +1,83 @@
+"""Compare on-disk size and decode time per card of the card codecs.
+
+Usage:
+    python -m benchmarks.codec_benchmark [--cards N] [--repeat R]
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+from cards.media import Media, MediaType
+from cards.memory_card import MemoryCard
+from storage.codecs import CODECS, decode_card, encode_card, msgpack
+
+def sample_cards(count: int) -> List[Dict]:
+    """Build card dictionaries shaped like real interview memories."""
+    cards = []
+    for i in range(count):
+        card = MemoryCard(
+            title=f"Summer at the lake {i}",
+            description="We rented a cabin by the water and spent every evening "
+                        "on the dock watching the sun go down. " * 3,
+            people=["Mom", "Dad", "Aunt Rosa"],
+            emotions=["joy", "nostalgia"],
+            location="Lake Tahoe",
+            intensity=i % 10,
+            metadata={'source': 'interview', 'stage': 'childhood'},
+            media=[Media(id=j, file_path=f"media/{i}-{j}.jpg", type=MediaType.IMAGE,
+                         description="Photo from the trip") for j in range(2)]
+        )
+        cards.append(card.to_dict())
+    return cards
+
+def _per_card_us(func: Callable[[], None], count: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+def run(count: int, repeat: int) -> List[Dict]:
+    """
+    Measure every codec against the legacy indented JSON format.
+
+    Returns:
+        List[Dict]: Per format: bytes, encode, decode and decode + from_dict
+        time per card, in microseconds
+    """
+    cards = sample_cards(count)
+    formats = {'legacy json (indent=2)': (
+        lambda data: json.dumps(data, indent=2).encode('utf-8'),
+        lambda blob: json.loads(blob)
+    )}
+    for name, codec in CODECS.items():
+        formats[name] = (
+            lambda data, codec=codec: encode_card(data, codec),
+            decode_card
+        )
+
+    results = []
+    for name, (encode, decode) in formats.items():
+        blobs = [encode(card) for card in cards]
+        results.append({
+            'format': name,
+            'bytes': sum(len(blob) for blob in blobs) / count,
+            'encode_us': _per_card_us(lambda: [encode(card) for card in cards], count, repeat),
+            'decode_us': _per_card_us(lambda: [decode(blob) for blob in blobs], count, repeat),
+            'load_us': _per_card_us(lambda: [MemoryCard.from_dict(decode(blob)) for blob in blobs],
+                                    count, repeat)
+        })
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=2000, help="Cards per run")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is kept")
+    args = parser.parse_args()
+
+    print(f"msgpack: {'C extension' if msgpack is not None else 'pure-Python fallback'}")
+    print(f"{'format':<24}{'bytes/card':>12}{'encode µs':>12}{'decode µs':>12}{'+from_dict µs':>15}")
+    for row in run(args.cards, args.repeat):
+        print(f"{row['format']:<24}{row['bytes']:>12.0f}{row['encode_us']:>12.1f}"
+              f"{row['decode_us']:>12.1f}{row['load_us']:>15.1f}")
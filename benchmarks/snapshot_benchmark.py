@@ -0,0 +1,62 @@
+"""Compare load_card time per card from card files, the card cache and a mapped snapshot.
+
+Usage:
+    python -m benchmarks.snapshot_benchmark [--cards N] [--repeat R] [--codec NAME]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from typing import Dict
+from benchmarks.codec_benchmark import sample_cards
+from cards.memory_card import MemoryCard
+from storage.card_cache import CardCache
+from storage.storage_manager import StorageManager
+
+def _per_card_us(manager: StorageManager, ids, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for card_id in ids:
+            manager.load_card(card_id, 'memory')
+        best = min(best, time.perf_counter() - start)
+    return best / len(ids) * 1e6
+
+def run(count: int, repeat: int, codec: str) -> Dict[str, float]:
+    """
+    Load every card of a fresh store through each read path.
+
+    Returns:
+        Dict[str, float]: load_card time per card in microseconds, per read path
+    """
+    temp_dir = tempfile.mkdtemp()
+    manager = StorageManager(temp_dir, codec=codec, fsync=False, cache_size=0)
+    try:
+        ids = []
+        for data in sample_cards(count):
+            card = MemoryCard.from_dict(data)
+            manager.save_card(card)
+            ids.append(card.id)
+
+        results = {'files': _per_card_us(manager, ids, repeat)}
+        # The first run fills the cache; the best run is all hits
+        manager.cache = CardCache(max_entries=count)
+        results['cache'] = _per_card_us(manager, ids, max(repeat, 2))
+        manager.cache = CardCache(max_entries=0)
+        manager.write_snapshot()
+        manager.open_snapshot()
+        results['snapshot'] = _per_card_us(manager, ids, repeat)
+        return results
+    finally:
+        manager.close()
+        shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=2000, help="Cards in the store")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is kept")
+    parser.add_argument('--codec', default='msgpack', help="Codec the cards are written with")
+    args = parser.parse_args()
+
+    for path, us in run(args.cards, args.repeat, args.codec).items():
+        print(f"{path:<10}{us:>10.1f} µs/card")
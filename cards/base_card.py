@@ -2,9 +2,14 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 from utils.image_generator import ImageGenerator
+from utils.logger import get_logger
 from .media import Media
 import uuid
 
+logger = get_logger(__name__)
+
+DEFAULT_IMAGE_PATH = "/static/images/default_card.png"
+
 @dataclass
 class BaseCard:
     """Base class for all card types in the DROE Core system."""
@@ -33,8 +38,8 @@ class BaseCard:
         # Set default values
         if not self.id:
             self.id = str(uuid.uuid4())
-        if not self.image_path:
-            self.generate_default_image()
+        # An empty image_path means the image is pending; it is generated on
+        # demand by resolve_image() rather than during construction
         if self.created_at is None:
             self.created_at = datetime.now()
         if self.metadata is None:
@@ -42,17 +47,39 @@ class BaseCard:
         if self.media is None:
             self.media = []
     
-    def generate_default_image(self):
-        """Generate a default image for the card using DALL-E"""
+    @property
+    def image_pending(self) -> bool:
+        """Whether the card is still waiting for its default image."""
+        return not self.image_path
+    
+    def image_prompt(self) -> str:
+        """Prompt used to generate the card's default image."""
+        return f"Create an abstract image representing {self.title}"
+    
+    def resolve_image(self, image_generator: Optional[ImageGenerator] = None) -> str:
+        """
+        Generate the card's default image if it is still pending.
+        
+        Args:
+            image_generator (Optional[ImageGenerator]): Generator to reuse across cards
+            
+        Returns:
+            str: The card's image path
+        """
+        if not self.image_pending:
+            return self.image_path
         try:
-            image_generator = ImageGenerator()
-            prompt = f"Create an abstract image representing {self.title}"
-            image_url = image_generator.generate_image(prompt)
-            if image_url:
-                self.image_path = image_url
+            image_generator = image_generator or ImageGenerator()
+            image_url = image_generator.generate_image(self.image_prompt())
+            self.image_path = image_url or DEFAULT_IMAGE_PATH
         except Exception as e:
-            print(f"Error generating default image: {str(e)}")
-            self.image_path = "/static/images/default_card.png"
+            logger.error(f"Error generating default image for card {self.id}: {str(e)}")
+            self.image_path = DEFAULT_IMAGE_PATH
+        return self.image_path
+    
+    def generate_default_image(self):
+        """Generate a default image for the card using DALL-E"""
+        self.resolve_image()
     
     def add_media(self, media: Media) -> None:
         """Add media to the card."""
@@ -95,7 +122,7 @@ class BaseCard:
             
         media_list = [Media.from_dict(m) for m in data.get('media', [])]
         created_at = datetime.fromisoformat(data['created_at']) if 'created_at' in data else datetime.now()
-        updated_at = datetime.fromisoformat(data['updated_at']) if 'updated_at' in data else None
+        updated_at = datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None
         
         return cls(
             title=data['title'],
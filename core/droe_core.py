@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 from cards.base_card import BaseCard
 from cards.event_card import EventCard
@@ -7,21 +7,40 @@ from cards.place_card import PlaceCard
 from cards.memory_card import MemoryCard
 from cards.time_period_card import TimePeriodCard
 from storage.storage_manager import StorageManager
+from storage.segment_store import SegmentStorageManager
+from utils.image_resolver import ImageResolver
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+STORAGE_BACKENDS = {
+    'files': StorageManager,
+    'segments': SegmentStorageManager
+}
+
 class DROECore:
     """Main system class for managing life stories."""
     
-    def __init__(self, storage_path: str = "data"):
+    def __init__(self, storage_path: str = "data", image_resolver: Optional[ImageResolver] = None,
+                 codec: str = 'json', storage_backend: str = 'files'):
         """
         Initialize the DROE Core system.
         
         Args:
             storage_path (str): Path to the storage directory
+            image_resolver (Optional[ImageResolver]): Resolver used to generate pending
+                card images in the background after they are saved
+            codec (str): Codec used to write card files, 'json' or 'msgpack'
+            storage_backend (str): 'files' for one file per card, 'segments' for
+                an append-only log of segment files
+
+        Raises:
+            ValueError: If the storage backend is unknown
         """
-        self.storage_manager = StorageManager(storage_path)
+        if storage_backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: {storage_backend}")
+        self.storage_manager = STORAGE_BACKENDS[storage_backend](storage_path, codec=codec)
+        self.image_resolver = image_resolver
         self._card_types = {
             'event': EventCard,
             'person': PersonCard,
@@ -43,6 +62,51 @@ class DROECore:
         except Exception as e:
             logger.error(f"Error saving card: {str(e)}")
             raise
+            
+        if self.image_resolver and card.image_pending:
+            self.image_resolver.submit(card, callback=self._save_resolved_image)
+    
+    def save_cards(self, cards: Iterable[BaseCard]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Save several cards at once; see StorageManager.save_cards.
+        
+        Args:
+            cards (Iterable[BaseCard]): The cards to save
+            
+        Returns:
+            Tuple[List[str], List[Dict[str, Any]]]: The ids of the saved cards, and
+            an {"index", "id", "error"} entry for every card that wasn't saved
+        """
+        cards = list(cards)
+        saved_ids, errors = self.storage_manager.save_cards(cards)
+        logger.info(f"Saved {len(saved_ids)} of {len(cards)} card(s)")
+        
+        if self.image_resolver:
+            failed = {error['index'] for error in errors}
+            for index, card in enumerate(cards):
+                if index not in failed and card.image_pending:
+                    self.image_resolver.submit(card, callback=self._save_resolved_image)
+        return saved_ids, errors
+    
+    def _save_resolved_image(self, card: BaseCard) -> None:
+        """
+        Store the image resolved for a card snapshot on the stored card.
+
+        Only image_path is written, onto the card as it is stored now, so
+        edits saved while the image was generating are kept. Nothing is
+        written if the card was deleted meanwhile, or if the stored card is
+        newer than the snapshot; a newer card that is still pending is
+        queued again the next time it is loaded.
+        """
+        card_type = self.storage_manager.get_card_type(card)
+        stored = self.storage_manager.load_card(card.id, card_type)
+        if stored is None:
+            return
+        if stored.updated_at and (card.updated_at is None or stored.updated_at > card.updated_at):
+            logger.info(f"Not storing image for card {card.id}: it changed while the image was generated")
+            return
+        stored.image_path = card.image_path
+        self.storage_manager.save_card(stored)
     
     def load_card(self, card_id: str, card_type: str) -> Optional[BaseCard]:
         """
@@ -56,10 +120,38 @@ class DROECore:
             Optional[BaseCard]: The loaded card, or None if not found
         """
         try:
-            return self.storage_manager.load_card(card_id, card_type)
+            card = self.storage_manager.load_card(card_id, card_type)
         except Exception as e:
             logger.error(f"Error loading card: {str(e)}")
             return None
+        self._resolve_pending_image(card)
+        return card
+    
+    def _resolve_pending_image(self, card: Optional[BaseCard]) -> None:
+        """Queue the image of a card saved before it could be generated, e.g. by a core without a resolver."""
+        if card is not None and self.image_resolver and card.image_pending:
+            self.image_resolver.submit(card, callback=self._save_resolved_image)
+    
+    def load_cards(self, keys: Iterable[Tuple[str, str]]) -> List[Optional[BaseCard]]:
+        """
+        Load several cards at once.
+        
+        Args:
+            keys (Iterable[Tuple[str, str]]): ``(card_id, card_type)`` pairs
+            
+        Returns:
+            List[Optional[BaseCard]]: The card for each key, None where it
+            is missing or can't be read
+        """
+        keys = list(keys)
+        try:
+            cards = self.storage_manager.load_cards(keys)
+        except Exception as e:
+            logger.error(f"Error loading cards: {str(e)}")
+            return [None] * len(keys)
+        for card in cards:
+            self._resolve_pending_image(card)
+        return cards
     
     def delete_card(self, card_id: str, card_type: str) -> bool:
         """
@@ -78,6 +170,23 @@ class DROECore:
             logger.error(f"Error deleting card: {str(e)}")
             return False
     
+    def delete_cards(self, keys: Iterable[Tuple[str, str]]) -> List[bool]:
+        """
+        Delete several cards at once.
+        
+        Args:
+            keys (Iterable[Tuple[str, str]]): ``(card_id, card_type)`` pairs
+            
+        Returns:
+            List[bool]: For each key, True if the card was deleted
+        """
+        keys = list(keys)
+        try:
+            return self.storage_manager.delete_cards(keys)
+        except Exception as e:
+            logger.error(f"Error deleting cards: {str(e)}")
+            return [False] * len(keys)
+    
     def list_cards(self, card_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all cards of a specific type.
@@ -94,19 +203,34 @@ class DROECore:
             logger.error(f"Error listing cards: {str(e)}")
             return []
     
-    def search_cards(self, query: str, card_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the card metadata and search indexes from the files on disk.
+        
+        Returns:
+            int: Number of indexed cards
+        """
+        try:
+            return self.storage_manager.rebuild_index()
+        except Exception as e:
+            logger.error(f"Error rebuilding card index: {str(e)}")
+            return 0
+    
+    def search_cards(self, query: str, card_type: Optional[str] = None,
+                     limit: int = 20) -> List[Dict[str, Any]]:
         """
         Search for cards matching a query.
         
         Args:
             query (str): The search query
             card_type (Optional[str]): The type of cards to search
+            limit (int): Maximum number of results
             
         Returns:
-            List[Dict[str, Any]]: List of matching card metadata
+            List[Dict[str, Any]]: List of matching card metadata, best match first
         """
         try:
-            return self.storage_manager.search_cards(query, card_type)
+            return self.storage_manager.search_cards(query, card_type, limit=limit)
         except Exception as e:
             logger.error(f"Error searching cards: {str(e)}")
             return []
@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .models import Base
+from .migrations import run_migrations
 import os
 
 # Create database engine
@@ -14,4 +15,5 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 def init_db():
     """Initialize database connection and create tables"""
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     return SessionLocal
@@ -0,0 +1,148 @@
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+# Card type -> table holding the type-specific columns of the relational schema
+CARD_TYPE_TABLES = {
+    'event': 'events',
+    'memory': 'memories',
+    'person': 'people',
+    'place': 'places',
+    'time_period': 'time_periods',
+    'day': 'days',
+    'year': 'years'
+}
+
+# Relative bm25 weight of the title and description columns
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def ensure_card_search(conn: sqlite3.Connection) -> None:
+    """
+    Create the cards_fts index and its sync triggers if they don't exist.
+
+    cards_fts is an external-content FTS5 table over cards(title, description);
+    triggers keep it in step with every insert, update and delete. When the
+    index is created on an existing database it is backfilled from cards.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a database created by init_db
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cards_fts'"
+    ).fetchone()
+
+    conn.executescript('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+            title,
+            description,
+            content='cards',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN
+            INSERT INTO cards_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN
+            INSERT INTO cards_fts (cards_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF title, description ON cards BEGIN
+            INSERT INTO cards_fts (cards_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO cards_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END;
+    ''')
+
+    if not exists:
+        conn.execute("INSERT INTO cards_fts (cards_fts) VALUES ('rebuild')")
+    conn.commit()
+
+def to_match_query(text: str, any_term: bool = False, prefix: bool = False) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted, so user input can never be parsed as FTS5 syntax.
+
+    Args:
+        text (str): The user's search text
+        any_term (bool): Match cards containing any word instead of all of them
+        prefix (bool): Also match words starting with each term, e.g. feel -> feeling
+
+    Returns:
+        Optional[str]: The MATCH expression, or None if the text has no words
+    """
+    terms = [f'"{token}"' + ('*' if prefix else '') for token in _TOKEN_RE.findall(text)]
+    if not terms:
+        return None
+    return (' OR ' if any_term else ' ').join(terms)
+
+def search_cards(conn: sqlite3.Connection, query: str, card_type: Optional[str] = None,
+                 limit: int = 20, any_term: bool = False, prefix: bool = False) -> List[Dict[str, Any]]:
+    """
+    Search card titles and descriptions, best matches first.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a database prepared by ensure_card_search
+        query (str): The search text
+        card_type (Optional[str]): Only return cards of this type (a CARD_TYPE_TABLES key)
+        limit (int): Maximum number of results
+        any_term (bool): Match cards containing any word instead of all of them
+        prefix (bool): Also match words starting with each term
+
+    Returns:
+        List[Dict[str, Any]]: Matching cards with their type, bm25 score (lower is
+        better), highlighted title and a highlighted description snippet
+
+    Raises:
+        ValueError: If card_type is unknown
+    """
+    match = to_match_query(query, any_term=any_term, prefix=prefix)
+    if match is None:
+        return []
+
+    type_filter = ''
+    if card_type is not None:
+        if card_type not in CARD_TYPE_TABLES:
+            raise ValueError(f"Unknown card type: {card_type}")
+        type_filter = f'AND c.id IN (SELECT id FROM {CARD_TYPE_TABLES[card_type]})'
+
+    type_case = ' '.join(
+        f"WHEN c.id IN (SELECT id FROM {table}) THEN '{name}'"
+        for name, table in CARD_TYPE_TABLES.items()
+    )
+
+    cursor = conn.execute(f'''
+        SELECT
+            c.id,
+            c.title,
+            c.description,
+            c.created_at,
+            CASE {type_case} END AS type,
+            bm25(cards_fts, ?, ?) AS score,
+            highlight(cards_fts, 0, ?, ?) AS title_highlight,
+            snippet(cards_fts, 1, ?, ?, '…', 16) AS snippet
+        FROM cards_fts
+        JOIN cards c ON c.id = cards_fts.rowid
+        WHERE cards_fts MATCH ? {type_filter}
+        ORDER BY score
+        LIMIT ?
+    ''', (
+        TITLE_WEIGHT, DESCRIPTION_WEIGHT,
+        HIGHLIGHT_START, HIGHLIGHT_END,
+        HIGHLIGHT_START, HIGHLIGHT_END,
+        match, limit
+    ))
+
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
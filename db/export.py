@@ -0,0 +1,58 @@
+import json
+import zlib
+from typing import Iterable, Iterator
+from sqlalchemy.orm import Session
+from .models import Card
+from .utils import card_to_model
+
+# Cards fetched from the database per round trip
+EXPORT_BATCH_SIZE = 500
+
+def iter_ndjson(db: Session, session_id: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Stream a session's cards as newline-delimited JSON, oldest date first.
+
+    Rows are read batch_size at a time and every batch is emitted as one
+    chunk, so memory use depends on the batch size only, never on how many
+    cards the session has.
+
+    Args:
+        db (Session): Database session; must stay open until the iterator is exhausted
+        session_id (str): The session whose cards to export
+        batch_size (int): Cards fetched and emitted per chunk
+
+    Returns:
+        Iterator[bytes]: Chunks of one JSON object per line
+    """
+    query = db.query(Card).filter(
+        Card.session_id == session_id
+    ).order_by(Card.date, Card.id).yield_per(batch_size)
+
+    lines = []
+    for card in query:
+        lines.append(json.dumps(card_to_model(card)))
+        if len(lines) >= batch_size:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+        # Drop loaded cards so the session's identity map doesn't grow
+        db.expunge(card)
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a stream of chunks incrementally.
+
+    Args:
+        chunks (Iterable[bytes]): The uncompressed stream
+        level (int): zlib compression level
+
+    Returns:
+        Iterator[bytes]: A gzip stream readable by gunzip and gzip.open
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .models import Base
+from .migrations import run_migrations
 import os
 
 # Create database engine
@@ -10,6 +11,7 @@ engine = create_engine(DATABASE_URL)
 # Create tables
 def init_db():
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
 
 if __name__ == '__main__':
     init_db()
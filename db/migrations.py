@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Connection, Engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String, nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+# The cards columns as of migration 1, so later edits to the Card model
+# never change what an applied migration does
+_cards_v1 = Table(
+    'cards', _metadata,
+    Column('id', String, primary_key=True),
+    Column('session_id', String),
+    Column('type', String),
+    Column('date', DateTime)
+)
+_card_indexes_v1 = (
+    Index('ix_cards_session_date', _cards_v1.c.session_id, _cards_v1.c.date, _cards_v1.c.id),
+    Index('ix_cards_session_type', _cards_v1.c.session_id, _cards_v1.c.type),
+)
+
+def _create_card_indexes(conn: Connection) -> None:
+    """Add the (session_id, date) and (session_id, type) indexes to databases created before them."""
+    for index in _card_indexes_v1:
+        index.create(bind=conn, checkfirst=True)
+
+# Ordered (version, description, upgrade) steps; append new ones, never edit applied ones
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Add (session_id, date) and (session_id, type) indexes to cards", _create_card_indexes),
+]
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Get the latest migration version applied to a database.
+
+    Args:
+        engine (Engine): The database engine
+
+    Returns:
+        int: The schema version, 0 if no migration has run
+    """
+    with engine.begin() as conn:
+        schema_migrations.create(bind=conn, checkfirst=True)
+        versions = conn.execute(select(schema_migrations.c.version)).scalars().all()
+    return max(versions, default=0)
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Apply pending migrations in order, each in its own transaction.
+
+    Args:
+        engine (Engine): The database engine
+
+    Returns:
+        List[int]: The versions that were applied
+    """
+    current = get_schema_version(engine)
+    applied = []
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version,
+                description=description,
+                applied_at=datetime.now()
+            ))
+        logger.info(f"Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
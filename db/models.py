@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Dict
-from sqlalchemy import Column, String, Integer, JSON, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, Integer, JSON, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -23,6 +23,12 @@ class Card(Base):
     location = Column(JSON)  # For place cards
     people = Column(JSON)  # For person cards
     emotions = Column(JSON)  # For emotion cards
+    
+    # Serve the per-session listings; id breaks ties in the (date, id) keyset order
+    __table_args__ = (
+        Index('ix_cards_session_date', 'session_id', 'date', 'id'),
+        Index('ix_cards_session_type', 'session_id', 'type'),
+    )
 
 class BaseModel(Base):
     """Base database model with common fields"""
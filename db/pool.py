@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Generator, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = 'droecore.db'
+
+class SavepointConnection:
+    """A nested checkout of a connection whose outer checkout has a transaction open.
+
+    The checkout runs inside a savepoint of the outer transaction, so its
+    commit() and rollback() only settle its own work; the outer caller still
+    decides whether the whole transaction is committed. Everything else is
+    passed through to the connection.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, name: str):
+        object.__setattr__(self, 'connection', conn)
+        object.__setattr__(self, 'savepoint', name)
+        conn.execute(f"SAVEPOINT {name}")
+
+    def commit(self) -> None:
+        """Keep this checkout's work in the outer transaction."""
+        self.connection.execute(f"RELEASE {self.savepoint}")
+        self.connection.execute(f"SAVEPOINT {self.savepoint}")
+
+    def rollback(self) -> None:
+        """Discard this checkout's work since its last commit."""
+        self.connection.execute(f"ROLLBACK TO {self.savepoint}")
+
+    def close_savepoint(self) -> None:
+        """Drop uncommitted work and end the savepoint."""
+        if self.connection.in_transaction:
+            self.rollback()
+            self.connection.execute(f"RELEASE {self.savepoint}")
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.connection, name, value)
+
+class SQLitePool:
+    """Per-thread pool of tuned SQLite connections to one database file.
+
+    Each thread keeps a single long-lived connection, so repeated calls skip
+    connection setup and keep a warm page and statement cache. Connections
+    run in WAL mode, which lets readers in other threads and processes
+    proceed while one writer commits.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0, cached_statements: int = 256,
+                 cache_size_kb: int = 16 * 1024, mmap_size: int = 256 * 1024 * 1024,
+                 synchronous: str = 'NORMAL'):
+        """
+        Initialize the pool.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+            timeout (float): Seconds to wait for a lock held by another writer
+            cached_statements (int): Size of each connection's prepared statement cache
+            cache_size_kb (int): Page cache size per connection in KiB
+            mmap_size (int): Bytes of the database file to memory-map
+            synchronous (str): PRAGMA synchronous level; NORMAL is durable with WAL
+                except for the last transactions before a power loss
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.synchronous = synchronous
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections never cross threads; check_same_thread is off only so
+        # close_all() can close connections of threads that have exited
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        if self.db_path != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={-self.cache_size_kb}")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        with self._lock:
+            self._prune()
+            self._connections[threading.get_ident()] = (threading.current_thread(), conn)
+        return conn
+
+    def _prune(self) -> None:
+        """Close connections left behind by threads that have exited."""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                conn.close()
+
+    def acquire(self, row_factory: Optional[Callable] = None) -> sqlite3.Connection:
+        """
+        Check out the calling thread's connection.
+
+        Every acquire must be paired with a release from the same thread.
+        Nested checkouts may ask for a different row factory; the outer
+        checkout's factory is restored when the inner one is released.
+
+        A nested checkout made while the outer one has a transaction open
+        gets a SavepointConnection. Its commit() and rollback() only act
+        on its own savepoint, so they can't commit or discard the outer
+        caller's half-finished work. What it commits becomes durable only
+        when the outer caller commits.
+
+        Args:
+            row_factory (Optional[Callable]): Row factory to use, e.g. sqlite3.Row
+
+        Returns:
+            sqlite3.Connection: The thread's connection, or a SavepointConnection
+            wrapping it
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            # Row factory of each enclosing checkout, outermost first
+            self._local.outer_factories = []
+        depth = len(self._local.outer_factories)
+        self._local.outer_factories.append(conn.row_factory)
+        conn.row_factory = row_factory
+        if depth and conn.in_transaction:
+            return SavepointConnection(conn, f"pool_checkout_{depth}")
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Return a connection checked out with acquire.
+
+        When the outermost checkout is released, any transaction the caller
+        left open is rolled back, as closing a connection would have done.
+        Releasing a SavepointConnection likewise drops its uncommitted work.
+        """
+        if isinstance(conn, SavepointConnection):
+            conn.close_savepoint()
+            conn = conn.connection
+        conn.row_factory = self._local.outer_factories.pop()
+        if not self._local.outer_factories and conn.in_transaction:
+            logger.warning(f"Rolling back uncommitted transaction on {self.db_path}")
+            conn.rollback()
+
+    @contextmanager
+    def connection(self, row_factory: Optional[Callable] = None) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager around acquire and release."""
+        conn = self.acquire(row_factory)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        """Close every pooled connection, e.g. before deleting the database file."""
+        with self._lock:
+            for thread, conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+            self._local = threading.local()
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path: str = DEFAULT_DB_PATH) -> SQLitePool:
+    """
+    Get the shared pool for a database file, creating it on first use.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        SQLitePool: The pool shared by every caller using this file
+    """
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SQLitePool(db_path)
+        return pool
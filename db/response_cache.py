@@ -0,0 +1,222 @@
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import logging
+from db.pool import get_pool
+from utils.paths import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Cache of serialized per-session API responses, invalidated by version.
+
+    Every session has a version counter that is bumped whenever one of its
+    cards is written. Cached bodies are keyed by (session, version, request),
+    so a bump makes all older bodies of the session unreachable at once and
+    no stale response is ever served. Bodies live in an in-process LRU; with
+    db_path set, versions and bodies are also kept in a SQLite file shared by
+    every worker process, so a write in one worker invalidates all of them.
+
+    Deployments with several worker processes must give them all the same
+    db_path. A process-local cache only sees its own writes, so other
+    workers would keep serving their old bodies and ETags. The shared
+    response_cache instance uses $RESPONSE_CACHE_DB, or response_cache.db
+    in the data directory.
+
+    The same versions give cheap ETags: a tag can be checked against the
+    current version without reading a single card.
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Bodies kept in the in-process LRU, 0 to disable caching
+            db_path (Optional[str]): Path to the shared SQLite cache, None for a
+                process-local cache
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries: "OrderedDict[Tuple[str, int, str], bytes]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Versions restart at 0 with a new process or cache file, so tags
+        # carry an epoch to never match a tag issued before the restart
+        self._epoch = secrets.token_hex(4)
+        # The shared file is created on first use rather than at construction
+        self._db_ready = False
+
+    @property
+    def _pool(self):
+        pool = get_pool(self.db_path)
+        if not self._db_ready:
+            with self._lock:
+                if not self._db_ready:
+                    self._init_db(pool)
+                    self._db_ready = True
+        return pool
+
+    def _init_db(self, pool) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with pool.connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS response_versions (
+                    session_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS response_bodies (
+                    session_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    PRIMARY KEY (session_id, version, key)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS response_epoch (
+                    epoch TEXT NOT NULL
+                );
+            """)
+            conn.execute(
+                "INSERT INTO response_epoch (epoch) SELECT ? WHERE NOT EXISTS (SELECT 1 FROM response_epoch)",
+                (self._epoch,)
+            )
+            conn.commit()
+            self._epoch = conn.execute("SELECT epoch FROM response_epoch").fetchone()[0]
+
+    def version(self, session_id: str) -> int:
+        """Get the current version of a session's cards."""
+        if not self.db_path:
+            with self._lock:
+                return self._versions.get(session_id, 0)
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM response_versions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def etag(self, session_id: str, key: str) -> str:
+        """
+        Get the entity tag of a response at the session's current version.
+
+        Args:
+            session_id (str): The session the response belongs to
+            key (str): Identifies the request within the session
+
+        Returns:
+            str: A tag that changes whenever the session's cards change
+        """
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        # Read the version first: it loads the shared epoch on first use
+        version = self.version(session_id)
+        return f"{self._epoch}-{version}-{digest}"
+
+    def bump(self, session_id: str) -> None:
+        """
+        Invalidate every cached response of a session.
+
+        Call after the write has been committed, so no response built from
+        the old data can be cached under the new version.
+
+        Args:
+            session_id (str): The session whose cards changed
+        """
+        with self._lock:
+            self._versions[session_id] = self._versions.get(session_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == session_id]:
+                del self._entries[key]
+
+        if self.db_path:
+            try:
+                with self._pool.connection() as conn:
+                    conn.execute("""
+                        INSERT INTO response_versions (session_id, version) VALUES (?, 1)
+                        ON CONFLICT (session_id) DO UPDATE SET version = version + 1
+                    """, (session_id,))
+                    conn.execute("DELETE FROM response_bodies WHERE session_id = ?", (session_id,))
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error invalidating cached responses of session {session_id}: {str(e)}")
+                raise
+
+    def _get_shared(self, entry: Tuple[str, int, str]) -> Optional[bytes]:
+        try:
+            with self._pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT body FROM response_bodies WHERE session_id = ? AND version = ? AND key = ?",
+                    entry
+                ).fetchone()
+            return bytes(row[0]) if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Shared response cache lookup failed: {str(e)}")
+            return None
+
+    def _put_shared(self, entry: Tuple[str, int, str], body: bytes) -> None:
+        try:
+            with self._pool.connection() as conn:
+                # Skip bodies whose version was bumped while they were built
+                conn.execute("""
+                    INSERT OR IGNORE INTO response_bodies (session_id, version, key, body)
+                    SELECT ?, ?, ?, ?
+                    WHERE ? = COALESCE((SELECT version FROM response_versions WHERE session_id = ?), 0)
+                """, entry + (body, entry[1], entry[0]))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared response cache store failed: {str(e)}")
+
+    def _remember(self, entry: Tuple[str, int, str], body: bytes) -> None:
+        with self._lock:
+            self._entries[entry] = body
+            self._entries.move_to_end(entry)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, session_id: str, key: str, build: Callable[[], bytes]) -> bytes:
+        """
+        Get a cached response body, building and caching it on a miss.
+
+        Args:
+            session_id (str): The session the response belongs to
+            key (str): Identifies the request within the session, e.g. path and page args
+            build (Callable[[], bytes]): Builds the serialized body from the database
+
+        Returns:
+            bytes: The response body
+        """
+        if self.max_entries <= 0:
+            return build()
+
+        entry = (session_id, self.version(session_id), key)
+        with self._lock:
+            body = self._entries.get(entry)
+            if body is not None:
+                self._entries.move_to_end(entry)
+                return body
+
+        if self.db_path:
+            body = self._get_shared(entry)
+            if body is not None:
+                self._remember(entry, body)
+                return body
+
+        body = build()
+        self._remember(entry, body)
+        if self.db_path:
+            self._put_shared(entry, body)
+        return body
+
+    def clear(self) -> None:
+        """Drop every body from the in-process LRU."""
+        with self._lock:
+            self._entries.clear()
+
+# Create a global instance; its versions are shared by every worker process
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', 1024)),
+    db_path=os.getenv('RESPONSE_CACHE_DB') or os.path.join(DATA_DIR, 'response_cache.db')
+)
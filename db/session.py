@@ -2,6 +2,7 @@ import sqlite3
 from contextlib import contextmanager
 from typing import Generator, Any
 import logging
+from db.pool import get_pool
 from cards.memory_card import MemoryCard
 from cards.person_card import PersonCard
 from cards.place_card import PlaceCard
@@ -22,11 +23,11 @@ class DatabaseOperationError(DatabaseError):
 
 @contextmanager
 def get_db_session() -> Generator[sqlite3.Connection, None, None]:
-    """Get a database session with automatic connection management."""
+    """Get a database session on this thread's pooled connection."""
+    pool = get_pool()
     conn = None
     try:
-        conn = sqlite3.connect('droecore.db')
-        conn.row_factory = sqlite3.Row
+        conn = pool.acquire(row_factory=sqlite3.Row)
         yield conn
     except sqlite3.Error as e:
         logger.error(f"Database connection error: {str(e)}")
@@ -34,9 +35,9 @@ def get_db_session() -> Generator[sqlite3.Connection, None, None]:
     finally:
         if conn:
             try:
-                conn.close()
+                pool.release(conn)
             except sqlite3.Error as e:
-                logger.error(f"Error closing database connection: {str(e)}")
+                logger.error(f"Error releasing database connection: {str(e)}")
 
 def save_card(card: Any) -> int:
     """Save a card to the database.
@@ -1,83 +1,190 @@
-import sqlite3
-from datetime import datetime
+import atexit
 import json
-from typing import Optional, Dict
 import os
+import random
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple
 import logging
+from db.pool import get_pool
+from utils.paths import data_path
 
 logger = logging.getLogger(__name__)
 
 class SessionDB:
-    def __init__(self, db_path: str = "sessions.db"):
-        self.db_path = db_path
-        self.conn = None
+    """SQLite store for interview session state.
+
+    Every thread uses its own pooled WAL connection, and saves are single
+    upserts. With write_behind set, saves are buffered for that many seconds
+    and rapid successive saves of the same session are coalesced into one
+    row write; buffered sessions are still visible to get_session.
+    """
+
+    def __init__(self, db_path: Optional[str] = None,
+                 write_behind: Optional[float] = None,
+                 max_pending: int = 1000,
+                 payload_log_rate: Optional[float] = None,
+                 ttl: Optional[float] = None):
+        """
+        Initialize the session store.
+
+        Args:
+            db_path (Optional[str]): Path to the SQLite database file, by default
+                sessions.db in the data directory
+            write_behind (Optional[float]): Seconds to buffer saves before writing them,
+                0 to write through; defaults to $SESSION_WRITE_BEHIND or 0
+            max_pending (int): Buffered sessions that trigger an early flush
+            payload_log_rate (Optional[float]): Fraction of saves and reads whose payload
+                is logged at DEBUG, 0 to never log payloads; defaults to
+                $SESSION_LOG_PAYLOADS or 0
+            ttl (Optional[float]): Seconds after their last save that sessions expire,
+                None to keep them forever
+        """
+        self.db_path = db_path or data_path('sessions.db')
+        if write_behind is None:
+            write_behind = float(os.getenv('SESSION_WRITE_BEHIND', 0))
+        if payload_log_rate is None:
+            payload_log_rate = float(os.getenv('SESSION_LOG_PAYLOADS', 0))
+        self.write_behind = write_behind
+        self.max_pending = max_pending
+        self.payload_log_rate = payload_log_rate
+        self.ttl = ttl
+        self._pending: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        # Serializes flushes with deletes so a flush can't resurrect a deleted session
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_at_exit = False
         self._init_db()
 
-    def _get_connection(self):
-        """Get a database connection, creating one if necessary"""
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        return self.conn
+    @property
+    def _pool(self):
+        return get_pool(self.db_path)
 
     def _init_db(self):
         """Initialize the database and create tables if they don't exist"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    session_id TEXT PRIMARY KEY,
-                    data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.commit()
+            with self._pool.connection() as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        session_id TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+                    
+                    CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+                """)
         except sqlite3.Error as e:
             logger.error(f"Error initializing database: {str(e)}")
             raise
 
+    def _log_payload(self, action: str, session_id: str, data: Dict) -> None:
+        """Log a session payload for a sample of calls, if enabled."""
+        if self.payload_log_rate and random.random() < self.payload_log_rate:
+            logger.debug(f"{action} session {session_id}: {data}")
+
+    def _write(self, rows: List[Tuple[str, str]]) -> None:
+        """Upsert (session_id, json) rows in one transaction."""
+        now = datetime.now().isoformat()
+        with self._pool.connection() as conn:
+            conn.executemany("""
+                INSERT INTO sessions (session_id, data, created_at, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (session_id) DO UPDATE SET
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+            """, [(session_id, payload, now, now) for session_id, payload in rows])
+            conn.commit()
+
     def save_session(self, session_id: str, data: Dict) -> None:
         """Save session data to the database"""
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            # First check if session exists
-            cursor.execute("SELECT session_id FROM sessions WHERE session_id = ?", (session_id,))
-            exists = cursor.fetchone() is not None
-            
-            if exists:
-                # Update existing session
-                cursor.execute("""
-                    UPDATE sessions 
-                    SET data = ?, updated_at = ?
-                    WHERE session_id = ?
-                """, (json.dumps(data), datetime.now().isoformat(), session_id))
-            else:
-                # Insert new session
-                cursor.execute("""
-                    INSERT INTO sessions (session_id, data, created_at, updated_at)
-                    VALUES (?, ?, ?, ?)
-                """, (session_id, json.dumps(data), datetime.now().isoformat(), datetime.now().isoformat()))
-            conn.commit()
-            logger.info(f"Saved session {session_id}: {data}")
-        except sqlite3.Error as e:
-            logger.error(f"Error saving session {session_id}: {str(e)}")
-            raise
+        # Serialize now so later changes to data can't leak into a buffered save
+        payload = json.dumps(data)
+        self._log_payload("Saving", session_id, data)
+
+        if self.write_behind <= 0:
+            try:
+                self._write([(session_id, payload)])
+            except sqlite3.Error as e:
+                logger.error(f"Error saving session {session_id}: {str(e)}")
+                raise
+            return
+
+        with self._pending_lock:
+            self._pending[session_id] = payload
+            pending = len(self._pending)
+            self._ensure_flusher()
+        if pending >= self.max_pending:
+            self.flush()
+        else:
+            self._wake.set()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or not self._flusher.is_alive():
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="session-write-behind", daemon=True)
+            self._flusher.start()
+            if not self._flush_at_exit:
+                atexit.register(self.flush)
+                self._flush_at_exit = True
+
+    def _flush_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.is_set():
+                break
+            # Let further saves of the same sessions coalesce before writing
+            self._stop.wait(self.write_behind)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Already logged; the saves stay buffered for the next round
+                self._wake.set()
+
+    def flush(self) -> None:
+        """Write all buffered saves in a single transaction."""
+        with self._write_lock:
+            with self._pending_lock:
+                rows = list(self._pending.items())
+            if not rows:
+                return
+
+            # Rows stay buffered, and readable by get_session, until committed
+            try:
+                self._write(rows)
+            except sqlite3.Error as e:
+                logger.error(f"Error flushing {len(rows)} session(s): {str(e)}")
+                raise
+            with self._pending_lock:
+                for session_id, payload in rows:
+                    # Keep saves made while the flush was writing
+                    if self._pending.get(session_id) is payload:
+                        del self._pending[session_id]
+            logger.debug(f"Flushed {len(rows)} buffered session(s)")
 
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Retrieve session data from the database"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,))
-            result = cursor.fetchone()
-            if result:
-                data = json.loads(result[0])
-                logger.info(f"Retrieved session {session_id}: {data}")
-                return data
-            logger.info(f"No session found for ID: {session_id}")
-            return None
+            with self._pending_lock:
+                payload = self._pending.get(session_id)
+            if payload is None:
+                with self._pool.connection() as conn:
+                    result = conn.execute(
+                        "SELECT data FROM sessions WHERE session_id = ? AND updated_at > ?",
+                        (session_id, self._expiry_cutoff())
+                    ).fetchone()
+                if not result:
+                    logger.debug(f"No session found for ID: {session_id}")
+                    return None
+                payload = result[0]
+            data = json.loads(payload)
+            self._log_payload("Retrieved", session_id, data)
+            return data
         except sqlite3.Error as e:
             logger.error(f"Error retrieving session {session_id}: {str(e)}")
             raise
@@ -85,27 +192,64 @@ class SessionDB:
             logger.error(f"Error decoding session data for {session_id}: {str(e)}")
             return None
 
+    def _expiry_cutoff(self) -> str:
+        """updated_at value at or below which sessions have expired."""
+        if self.ttl is None:
+            return ''
+        return (datetime.now() - timedelta(seconds=self.ttl)).isoformat()
+
+    def delete_expired(self, batch_size: int = 1000) -> int:
+        """
+        Delete sessions not saved within the TTL, in small batches.
+
+        Args:
+            batch_size (int): Rows deleted per transaction
+
+        Returns:
+            int: Number of sessions deleted
+        """
+        if self.ttl is None:
+            return 0
+        cutoff = self._expiry_cutoff()
+        deleted = 0
+        with self._pool.connection() as conn:
+            while True:
+                count = conn.execute("""
+                    DELETE FROM sessions WHERE rowid IN (
+                        SELECT rowid FROM sessions WHERE updated_at <= ? LIMIT ?
+                    )
+                """, (cutoff, batch_size)).rowcount
+                conn.commit()
+                deleted += count
+                if count < batch_size:
+                    break
+        if deleted:
+            logger.info(f"Deleted {deleted} expired session(s)")
+        return deleted
+
     def delete_session(self, session_id: str) -> None:
         """Delete a session from the database"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
-            conn.commit()
+            with self._write_lock:
+                with self._pending_lock:
+                    self._pending.pop(session_id, None)
+                with self._pool.connection() as conn:
+                    conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                    conn.commit()
             logger.info(f"Deleted session {session_id}")
         except sqlite3.Error as e:
             logger.error(f"Error deleting session {session_id}: {str(e)}")
             raise
 
     def close(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-
-    def __del__(self):
-        """Close database connection when object is destroyed"""
-        self.close()
+        """Flush buffered saves, stop the write-behind thread and close connections"""
+        self._stop.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        self._pool.close_all()
 
 # Create a global instance
-session_db = SessionDB() 
\ No newline at end of file
+session_db = SessionDB()
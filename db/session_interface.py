@@ -0,0 +1,255 @@
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from flask import Flask, Request, Response, jsonify, session as current_session
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+import logging
+from db.pool import get_pool
+from utils.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+class SessionTooLargeError(ValueError):
+    """A session payload exceeds the configured size cap."""
+    pass
+
+class SQLiteSession(CallbackDict, SessionMixin):
+    """Server-side session whose cookie only carries the session ID."""
+
+    def __init__(self, initial=None, sid: str = None, new: bool = False, expires_at: float = 0.0):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+class SQLiteSessionInterface(SessionInterface):
+    """Flask session interface storing sessions in SQLite with TTL expiry.
+
+    Rows expire after the app's PERMANENT_SESSION_LIFETIME; expired rows are
+    ignored on lookup and deleted by a background sweeper. Lookups are
+    primary key searches and sweeps use the expiry index, so both stay
+    logarithmic however many sessions churn through the table.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    # Longest session ID accepted from a cookie
+    max_sid_length = 128
+
+    def __init__(self, db_path: Optional[str] = None, max_size: int = 64 * 1024,
+                 sweep_interval: float = 300.0, sweep_batch: int = 1000):
+        """
+        Initialize the session interface.
+
+        Args:
+            db_path (Optional[str]): Path to the SQLite database file, by default
+                flask_sessions.db in the data directory
+            max_size (int): Largest serialized session in bytes
+            sweep_interval (float): Seconds between background sweeps
+            sweep_batch (int): Expired rows deleted per sweep transaction
+        """
+        self.db_path = db_path or data_path('flask_sessions.db')
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        self._init_db()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Install the interface on an app.
+
+        Oversized sessions are caught in an after_request hook, while the
+        response can still be replaced, and answered with a 413 by the
+        SessionTooLargeError handler instead of failing once the response
+        has been built.
+
+        Args:
+            app (Flask): The application
+        """
+        app.session_interface = self
+        app.register_error_handler(SessionTooLargeError, self._handle_too_large)
+        app.after_request(self._check_size)
+
+    @staticmethod
+    def _handle_too_large(e: SessionTooLargeError) -> Response:
+        response = jsonify({"error": str(e)})
+        response.status_code = 413
+        return response
+
+    def _check_size(self, response: Response) -> Response:
+        if isinstance(current_session, SQLiteSession) and current_session and current_session.modified:
+            try:
+                self._serialize(current_session)
+            except SessionTooLargeError as e:
+                return self._handle_too_large(e)
+        return response
+
+    def _serialize(self, session: SQLiteSession) -> str:
+        """Serialize a session, raising SessionTooLargeError if it is over the size cap."""
+        payload = self.serializer.dumps(dict(session))
+        if len(payload.encode('utf-8')) > self.max_size:
+            raise SessionTooLargeError(
+                f"Session {session.sid} is larger than {self.max_size} bytes"
+            )
+        return payload
+
+    @property
+    def _pool(self):
+        return get_pool(self.db_path)
+
+    def _init_db(self) -> None:
+        with self._pool.connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS flask_sessions (
+                    sid TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_flask_sessions_expires_at ON flask_sessions (expires_at);
+            """)
+
+    def _new_session(self, sid: Optional[str] = None) -> SQLiteSession:
+        return SQLiteSession(sid=sid or secrets.token_urlsafe(32), new=True)
+
+    def open_session(self, app: Flask, request: Request) -> SQLiteSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid or len(sid) > self.max_sid_length:
+            return self._new_session()
+
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT data, expires_at FROM flask_sessions WHERE sid = ? AND expires_at > ?",
+                (sid, time.time())
+            ).fetchone()
+        if row is None:
+            # Keep the client's ID, as Flask-Session did; routes use it as their session key
+            return self._new_session(sid)
+
+        try:
+            data = self.serializer.loads(row[0])
+        except ValueError as e:
+            logger.error(f"Discarding unreadable session {sid}: {str(e)}")
+            return self._new_session(sid)
+        return SQLiteSession(data, sid=sid, expires_at=row[1])
+
+    def _needs_refresh(self, app: Flask, session: SQLiteSession, now: float) -> bool:
+        """Whether the stored expiry should be pushed back.
+
+        Unmodified sessions are only rewritten once a tenth of their lifetime
+        has passed, instead of on every request.
+        """
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        return session.expires_at - now < lifetime * 0.9
+
+    def save_session(self, app: Flask, session: SQLiteSession, response: Response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified:
+                self.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        if session.modified or self._needs_refresh(app, session, now):
+            try:
+                payload = self._serialize(session)
+            except SessionTooLargeError as e:
+                # Too late to fail the request; keep the stored session as it was
+                logger.error(f"Not saving session: {str(e)}")
+                return
+            expires_at = now + app.permanent_session_lifetime.total_seconds()
+            with self._pool.connection() as conn:
+                conn.execute("""
+                    INSERT INTO flask_sessions (sid, data, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT (sid) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+                """, (session.sid, payload, expires_at))
+                conn.commit()
+            session.expires_at = expires_at
+
+        if self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
+    def delete(self, sid: str) -> None:
+        """Delete a stored session."""
+        with self._pool.connection() as conn:
+            conn.execute("DELETE FROM flask_sessions WHERE sid = ?", (sid,))
+            conn.commit()
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Delete expired sessions in small batches.
+
+        Args:
+            now (Optional[float]): Current time as a Unix timestamp
+
+        Returns:
+            int: Number of sessions deleted
+        """
+        now = time.time() if now is None else now
+        deleted = 0
+        with self._pool.connection() as conn:
+            while True:
+                count = conn.execute("""
+                    DELETE FROM flask_sessions WHERE sid IN (
+                        SELECT sid FROM flask_sessions WHERE expires_at <= ? LIMIT ?
+                    )
+                """, (now, self.sweep_batch)).rowcount
+                conn.commit()
+                deleted += count
+                if count < self.sweep_batch:
+                    break
+        if deleted:
+            logger.info(f"Swept {deleted} expired session(s)")
+        return deleted
+
+    def start_sweeper(self, *extra_sweeps: Callable[[], object]) -> None:
+        """
+        Sweep expired sessions every sweep_interval seconds in a daemon thread.
+
+        Args:
+            *extra_sweeps: Further cleanup callables to run on each sweep,
+                e.g. SessionDB.delete_expired
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.sweep_interval):
+                for sweep in (self.sweep,) + extra_sweeps:
+                    try:
+                        sweep()
+                    except sqlite3.Error as e:
+                        logger.error(f"Session sweep failed: {str(e)}")
+
+        self._sweeper = threading.Thread(target=run, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self, timeout: Optional[float] = None) -> None:
+        """Stop the background sweeper."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout)
+            self._sweeper = None
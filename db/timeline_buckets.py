@@ -0,0 +1,197 @@
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+# Card type -> (table, date column) of the dated cards in the relational schema
+DATED_CARD_TABLES = {
+    'event': ('events', 'start_date'),
+    'memory': ('memories', 'date'),
+    'day': ('days', 'date')
+}
+
+def _bucket_triggers(card_type: str, table: str, column: str) -> str:
+    """Triggers mirroring one dated table into card_dates."""
+    # REPLACE would not fire the card_dates delete trigger, so delete explicitly
+    insert = f'''
+        DELETE FROM card_dates WHERE card_id = new.id;
+        INSERT INTO card_dates (card_id, card_type, date, year, month, day)
+        SELECT new.id, '{card_type}', new.{column},
+               CAST(strftime('%Y', new.{column}) AS INTEGER),
+               CAST(strftime('%m', new.{column}) AS INTEGER),
+               CAST(strftime('%d', new.{column}) AS INTEGER)
+        WHERE strftime('%Y', new.{column}) IS NOT NULL;
+    '''
+    return f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_buckets_insert AFTER INSERT ON {table} BEGIN
+            {insert}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS {table}_buckets_update AFTER UPDATE OF {column} ON {table} BEGIN
+            DELETE FROM card_dates WHERE card_id = old.id;
+            {insert}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS {table}_buckets_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM card_dates WHERE card_id = old.id;
+        END;
+    '''
+
+def ensure_timeline_buckets(conn: sqlite3.Connection) -> None:
+    """
+    Create the timeline bucket tables and their sync triggers if they don't exist.
+
+    card_dates holds the date of every dated card split into indexed year,
+    month and day columns, so period lookups are index range scans.
+    bucket_counts keeps a running count per (year, month, day, card_type),
+    so per-bucket counts never touch the cards. Both are maintained by
+    triggers on write and backfilled when first created.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a database created by init_db
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'card_dates'"
+    ).fetchone()
+
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS card_dates (
+            card_id INTEGER PRIMARY KEY,
+            card_type TEXT NOT NULL,
+            date TIMESTAMP NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            FOREIGN KEY (card_id) REFERENCES cards(id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_card_dates_period ON card_dates (year, month, day, date);
+
+        CREATE TABLE IF NOT EXISTS bucket_counts (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            card_type TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (year, month, day, card_type)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS card_dates_count_insert AFTER INSERT ON card_dates BEGIN
+            INSERT INTO bucket_counts (year, month, day, card_type, count)
+            VALUES (new.year, new.month, new.day, new.card_type, 1)
+            ON CONFLICT (year, month, day, card_type) DO UPDATE SET count = count + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS card_dates_count_delete AFTER DELETE ON card_dates BEGIN
+            UPDATE bucket_counts SET count = count - 1
+            WHERE year = old.year AND month = old.month AND day = old.day AND card_type = old.card_type;
+            DELETE FROM bucket_counts
+            WHERE year = old.year AND month = old.month AND day = old.day AND card_type = old.card_type
+              AND count <= 0;
+        END;
+    ''' + ''.join(
+        _bucket_triggers(card_type, table, column)
+        for card_type, (table, column) in DATED_CARD_TABLES.items()
+    ))
+
+    if not exists:
+        # Backfill through the card_dates triggers so counts are built too
+        for card_type, (table, column) in DATED_CARD_TABLES.items():
+            conn.execute(f'''
+                INSERT OR IGNORE INTO card_dates (card_id, card_type, date, year, month, day)
+                SELECT id, ?, {column},
+                       CAST(strftime('%Y', {column}) AS INTEGER),
+                       CAST(strftime('%m', {column}) AS INTEGER),
+                       CAST(strftime('%d', {column}) AS INTEGER)
+                FROM {table}
+                WHERE strftime('%Y', {column}) IS NOT NULL
+            ''', (card_type,))
+    conn.commit()
+
+def _rows(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def get_cards_for_period(conn: sqlite3.Connection, start_year: int, end_year: Optional[int] = None,
+                         month: Optional[int] = None, day: Optional[int] = None,
+                         card_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get dated cards of a year range, month or day in chronological order.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a database prepared by ensure_timeline_buckets
+        start_year (int): First year
+        end_year (Optional[int]): Last year, inclusive; defaults to start_year
+        month (Optional[int]): Only this month (single year only)
+        day (Optional[int]): Only this day of the month (requires month)
+        card_type (Optional[str]): Only cards of this type (a DATED_CARD_TABLES key)
+
+    Returns:
+        List[Dict[str, Any]]: The cards with their type and date
+
+    Raises:
+        ValueError: If month spans several years or day is given without month
+    """
+    end_year = start_year if end_year is None else end_year
+    if month is not None and end_year != start_year:
+        raise ValueError("month requires a single year")
+    if day is not None and month is None:
+        raise ValueError("day requires a month")
+
+    conditions = ['d.year BETWEEN ? AND ?']
+    params: List[Any] = [start_year, end_year]
+    for column, value in (('month', month), ('day', day), ('card_type', card_type)):
+        if value is not None:
+            conditions.append(f'd.{column} = ?')
+            params.append(value)
+
+    return _rows(conn.execute(f'''
+        SELECT c.id, c.title, c.description, c.image_path, d.card_type AS type, d.date
+        FROM card_dates d
+        JOIN cards c ON c.id = d.card_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY d.year, d.month, d.day, d.date
+    ''', params))
+
+def get_bucket_counts(conn: sqlite3.Connection, year: Optional[int] = None, month: Optional[int] = None,
+                      decades: bool = False, card_type: Optional[str] = None) -> Dict[int, int]:
+    """
+    Count dated cards per bucket one level below the given period.
+
+    Without a year the buckets are years (or decades with decades=True); with a
+    year they are months, and with a month they are days.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a database prepared by ensure_timeline_buckets
+        year (Optional[int]): Count the months of this year
+        month (Optional[int]): Count the days of this month (requires year)
+        decades (bool): Group years into decades, keyed by their first year
+        card_type (Optional[str]): Only count cards of this type
+
+    Returns:
+        Dict[int, int]: Bucket (year, decade, month or day) -> number of cards
+
+    Raises:
+        ValueError: If month is given without year
+    """
+    if month is not None and year is None:
+        raise ValueError("month requires a year")
+
+    if year is None:
+        bucket = '(year / 10) * 10' if decades else 'year'
+    else:
+        bucket = 'month' if month is None else 'day'
+
+    conditions, params = [], []
+    for column, value in (('year', year), ('month', month), ('card_type', card_type)):
+        if value is not None:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    rows = conn.execute(f'''
+        SELECT {bucket} AS bucket, SUM(count)
+        FROM bucket_counts
+        {where}
+        GROUP BY bucket
+        ORDER BY bucket
+    ''', params).fetchall()
+    return {bucket: count for bucket, count in rows}
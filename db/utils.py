@@ -1,4 +1,7 @@
-from typing import Union, List
+import base64
+import json
+import uuid
+from typing import Union, List, Optional, Tuple
 from .models import (
     BaseModel,
     EventModel,
@@ -8,13 +11,14 @@ from .models import (
     Card
 )
 from . import SessionLocal
+from .response_cache import response_cache
 from cards.base_card import BaseCard
 from cards.event_card import EventCard
 from cards.location_card import LocationCard
 from cards.person_card import PersonCard
 from cards.emotion_card import EmotionCard
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, and_, or_
 from datetime import datetime
 
 def card_to_model(card: Union[BaseCard, EventCard, LocationCard, PersonCard, EmotionCard]) -> BaseModel:
@@ -99,18 +103,27 @@ def model_to_card(model: BaseModel) -> Union[BaseCard, EventCard, LocationCard,
     else:
         raise ValueError(f"Unsupported model type: {type(model)}")
 
+def parse_card_date(value: str) -> datetime:
+    """
+    Parse a card date given as ISO 8601 or an RFC 1123 HTTP date.
+
+    Raises:
+        ValueError: If the date is in neither format
+    """
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return datetime.strptime(value, '%a, %d %b %Y %H:%M:%S %Z')
+
 def save_card(db: Session, card: dict, session_id: str) -> Card:
     """Save a card to the database."""
     # Convert date string to datetime if provided
     date = None
     if card.get('date'):
         try:
-            date = datetime.fromisoformat(card['date'].replace('Z', '+00:00'))
+            date = parse_card_date(card['date'])
         except ValueError:
-            try:
-                date = datetime.strptime(card['date'], '%a, %d %b %Y %H:%M:%S %Z')
-            except ValueError:
-                date = None
+            date = None
     
     db_card = Card(
         id=card.get('id'),
@@ -128,9 +141,134 @@ def save_card(db: Session, card: dict, session_id: str) -> Card:
     
     db.add(db_card)
     db.commit()
+    response_cache.bump(session_id)
     db.refresh(db_card)
     return db_card
 
+# Largest number of cards accepted by save_cards
+MAX_BULK_CARDS = 5000
+
+# Ids per IN (...) lookup, below SQLite's bound parameter limit
+_ID_LOOKUP_CHUNK = 500
+
+def _card_mapping(card: dict, session_id: str, now: datetime) -> dict:
+    """
+    Validate one card of a bulk save and turn it into a cards row.
+
+    Raises:
+        ValueError: If the card is invalid
+    """
+    if not isinstance(card, dict):
+        raise ValueError("card must be an object")
+    for field in ('type', 'title'):
+        if not isinstance(card.get(field), str) or not card[field].strip():
+            raise ValueError(f"{field} is required")
+    card_id = card.get('id') or str(uuid.uuid4())
+    if not isinstance(card_id, str):
+        raise ValueError("id must be a string")
+    
+    date = None
+    if card.get('date'):
+        if not isinstance(card['date'], str):
+            raise ValueError("date must be a string")
+        try:
+            date = parse_card_date(card['date'])
+        except ValueError:
+            raise ValueError(f"Invalid date: {card['date']}")
+    
+    return {
+        'id': card_id,
+        'type': card['type'],
+        'title': card['title'],
+        'description': card.get('description'),
+        'date': date,
+        'image_url': card.get('image_url'),
+        'session_id': session_id,
+        'created_at': now,
+        'location': card.get('location'),
+        'people': card.get('people'),
+        'emotions': card.get('emotions')
+    }
+
+def save_cards(db: Session, cards: List[dict], session_id: str) -> Tuple[List[str], List[dict]]:
+    """
+    Save a batch of cards in a single transaction.
+
+    Every card is validated on its own; invalid cards and cards whose id
+    already exists are reported and skipped without aborting the batch.
+    The valid cards are written with one bulk insert and one commit.
+
+    Args:
+        db (Session): Database session
+        cards (List[dict]): The cards, in the format accepted by save_card
+        session_id (str): The session the cards belong to
+
+    Returns:
+        Tuple[List[str], List[dict]]: The ids of the saved cards, and an
+        {"index", "id", "error"} entry for every rejected card
+
+    Raises:
+        ValueError: If the batch has more than MAX_BULK_CARDS cards
+    """
+    if len(cards) > MAX_BULK_CARDS:
+        raise ValueError(f"At most {MAX_BULK_CARDS} cards can be saved at once")
+    
+    now = datetime.now()
+    mappings, indexes, errors = [], [], []
+    seen = set()
+    for index, card in enumerate(cards):
+        try:
+            mapping = _card_mapping(card, session_id, now)
+        except ValueError as e:
+            errors.append({'index': index, 'id': card.get('id') if isinstance(card, dict) else None,
+                           'error': str(e)})
+            continue
+        if mapping['id'] in seen:
+            errors.append({'index': index, 'id': mapping['id'], 'error': "Duplicate id in batch"})
+            continue
+        seen.add(mapping['id'])
+        mappings.append(mapping)
+        indexes.append(index)
+    
+    # Reject ids that are already stored, looked up in chunks
+    ids = [mapping['id'] for mapping in mappings]
+    existing = set()
+    for start in range(0, len(ids), _ID_LOOKUP_CHUNK):
+        chunk = ids[start:start + _ID_LOOKUP_CHUNK]
+        existing.update(row[0] for row in db.query(Card.id).filter(Card.id.in_(chunk)))
+    if existing:
+        kept = []
+        for index, mapping in zip(indexes, mappings):
+            if mapping['id'] in existing:
+                errors.append({'index': index, 'id': mapping['id'], 'error': "Card already exists"})
+            else:
+                kept.append(mapping)
+        mappings = kept
+    
+    if mappings:
+        try:
+            db.bulk_insert_mappings(Card, mappings)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        response_cache.bump(session_id)
+    
+    errors.sort(key=lambda error: error['index'])
+    return [mapping['id'] for mapping in mappings], errors
+
+def set_card_image(db: Session, card_id: str, image_url: str) -> bool:
+    """Set the image URL of a saved card. Returns False if the card no longer exists."""
+    updated = db.query(Card).filter(Card.id == card_id).update(
+        {Card.image_url: image_url}, synchronize_session=False
+    )
+    db.commit()
+    if updated:
+        session_id = db.query(Card.session_id).filter(Card.id == card_id).scalar()
+        if session_id is not None:
+            response_cache.bump(session_id)
+    return updated > 0
+
 def card_to_model(card: Card) -> dict:
     """Convert a database card to a dictionary."""
     return {
@@ -157,3 +295,97 @@ def get_timeline_for_session(db: Session, session_id: str) -> List[Card]:
         Card.session_id == session_id,
         Card.date.isnot(None)
     ).order_by(desc(Card.date)).all()
+
+def encode_cursor(card: Card) -> str:
+    """Encode the (date, id) position of a card as an opaque page cursor."""
+    key = [card.date.isoformat() if card.date else None, card.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """
+    Decode a page cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        date, card_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return (datetime.fromisoformat(date) if date else None), str(card_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _after_cursor(query, date: datetime, card_id: str):
+    """Restrict a (date DESC, id DESC) ordered query to rows after the given key."""
+    return query.filter(or_(
+        Card.date < date,
+        and_(Card.date == date, Card.id < card_id)
+    ))
+
+def _page(rows: List[Card], limit: int) -> Tuple[List[Card], Optional[str]]:
+    """Trim a limit + 1 row fetch to a page and compute its next cursor."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+def get_cards_page(db: Session, session_id: str, limit: int,
+                   cursor: Optional[str] = None) -> Tuple[List[Card], Optional[str]]:
+    """
+    Get one page of cards for a session, newest date first.
+
+    Cards are ordered by (date, id) descending with undated cards last, and
+    each page is a keyset seek, so its cost depends on the page size only.
+
+    Args:
+        db (Session): Database session
+        session_id (str): The session ID
+        limit (int): Maximum number of cards to return
+        cursor (Optional[str]): next_cursor of the previous page
+
+    Returns:
+        Tuple[List[Card], Optional[str]]: The cards and the cursor of the next page, or None
+    """
+    date, card_id = decode_cursor(cursor) if cursor else (None, None)
+    base = db.query(Card).filter(Card.session_id == session_id)
+    rows = []
+    
+    # Dated cards come first; a cursor without a date points into the undated tail
+    if cursor is None or date is not None:
+        dated = base.filter(Card.date.isnot(None))
+        if cursor:
+            dated = _after_cursor(dated, date, card_id)
+        rows = dated.order_by(desc(Card.date), desc(Card.id)).limit(limit + 1).all()
+    
+    if len(rows) <= limit:
+        undated = base.filter(Card.date.is_(None))
+        if cursor and date is None:
+            undated = undated.filter(Card.id < card_id)
+        rows += undated.order_by(desc(Card.id)).limit(limit + 1 - len(rows)).all()
+    
+    return _page(rows, limit)
+
+def get_timeline_page(db: Session, session_id: str, limit: int,
+                      cursor: Optional[str] = None) -> Tuple[List[Card], Optional[str]]:
+    """
+    Get one page of dated timeline items for a session, newest first.
+
+    Args:
+        db (Session): Database session
+        session_id (str): The session ID
+        limit (int): Maximum number of items to return
+        cursor (Optional[str]): next_cursor of the previous page
+
+    Returns:
+        Tuple[List[Card], Optional[str]]: The items and the cursor of the next page, or None
+    """
+    query = db.query(Card).filter(
+        Card.session_id == session_id,
+        Card.date.isnot(None)
+    )
+    if cursor:
+        date, card_id = decode_cursor(cursor)
+        if date is None:
+            return [], None
+        query = _after_cursor(query, date, card_id)
+    rows = query.order_by(desc(Card.date), desc(Card.id)).limit(limit + 1).all()
+    return _page(rows, limit)
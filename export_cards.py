@@ -0,0 +1,39 @@
+import argparse
+import sys
+from db import SessionLocal
+from db.export import iter_ndjson, gzip_chunks
+
+def export_cards(session_id: str, output: str, compress: bool = False) -> None:
+    """
+    Write every card of a session to a file as NDJSON.
+
+    Produces the same stream as GET /cards/export.
+
+    Args:
+        session_id (str): The session whose cards to export
+        output (str): Path of the output file, or - for stdout
+        compress (bool): Gzip the output
+    """
+    db = SessionLocal()
+    try:
+        chunks = iter_ndjson(db, session_id)
+        if compress:
+            chunks = gzip_chunks(chunks)
+        
+        out = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export a session's cards as NDJSON.")
+    parser.add_argument('session_id', help="Session whose cards to export")
+    parser.add_argument('output', nargs='?', default='-', help="Output file, - for stdout (default)")
+    parser.add_argument('--gzip', action='store_true', help="Gzip the output")
+    args = parser.parse_args()
+    export_cards(args.session_id, args.output, compress=args.gzip or args.output.endswith('.gz'))
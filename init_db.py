@@ -1,9 +1,11 @@
 import sqlite3
 from datetime import datetime
+from db.card_search import ensure_card_search
+from db.timeline_buckets import ensure_timeline_buckets
 
-def init_db():
+def init_db(db_path: str = 'droecore.db'):
     """Initialize the database with required tables."""
-    conn = sqlite3.connect('droecore.db')
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     # Create base cards table
@@ -191,6 +193,13 @@ def init_db():
     ''')
     
     conn.commit()
+    
+    # Full-text index over card titles and descriptions
+    ensure_card_search(conn)
+    
+    # Year/month/day buckets of dated cards
+    ensure_timeline_buckets(conn)
+    
     conn.close()
     print("Database initialized successfully!")
 
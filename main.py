@@ -30,6 +30,7 @@ from routes.card_viewer import card_viewer_bp
 from routes.timeline import timeline_bp
 from routes.interview import interview_bp
 from routes.media import bp as media_bp
+from utils.db_utils import close_db
 
 # Register blueprints
 app.register_blueprint(timeline_bp, url_prefix='/timeline')
@@ -37,6 +38,9 @@ app.register_blueprint(card_viewer_bp, url_prefix='/cards')
 app.register_blueprint(interview_bp, url_prefix='/interview')
 app.register_blueprint(media_bp, url_prefix='/media')
 
+# Hand pooled SQLite connections back at the end of each request
+app.teardown_appcontext(close_db)
+
 @app.route('/')
 def index():
     return "DroeCore API is running!"
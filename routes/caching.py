@@ -0,0 +1,29 @@
+from typing import Callable
+from flask import Response, current_app, request
+from db.response_cache import response_cache
+
+def cached_json_response(session_id: str, key: str, build: Callable[[], bytes]) -> Response:
+    """
+    Serve a per-session JSON response from the response cache, with an ETag.
+
+    Requests whose If-None-Match holds the current tag get an empty 304
+    without the body being built or read from the cache.
+
+    Args:
+        session_id (str): The session the response belongs to
+        key (str): Identifies the request within the session, e.g. path and page args
+        build (Callable[[], bytes]): Builds the serialized body from the database
+
+    Returns:
+        Response: A 200 JSON response or a 304
+    """
+    etag = response_cache.etag(session_id, key)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        body = response_cache.get_or_build(session_id, key, build)
+        response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Clients may store the body but must revalidate it before every use
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
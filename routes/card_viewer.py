@@ -3,6 +3,15 @@ from datetime import datetime
 import uuid
 from typing import Dict, List
 from utils.db_utils import get_db
+from db.card_search import search_cards
+from db.timeline_buckets import get_bucket_counts, get_cards_for_period
+
+# Emotional memories shown on the emotions page
+EMOTIONS_LIMIT = 200
+
+# Results returned by /search, by default and at most
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
 
 # Create the blueprint
 card_viewer_bp = Blueprint('card_viewer_bp', __name__, url_prefix='/cards')
@@ -34,16 +43,43 @@ def view_event(id):
         abort(404)
     return render_template('event_view.html', event=event)
 
-@card_viewer_bp.route('/time/<year>')
-def view_time(year):
-    """View events from a specific year"""
+@card_viewer_bp.route('/time/<int:year>')
+@card_viewer_bp.route('/time/<int:year>/<int:month>')
+@card_viewer_bp.route('/time/<int:year>/<int:month>/<int:day>')
+def view_time(year, month=None, day=None):
+    """View events from a specific year, month or day"""
     db = get_db()
-    events = db.execute('''
-        SELECT * FROM events 
-        WHERE strftime('%Y', date) = ?
-        ORDER BY date
-    ''', (year,)).fetchall()
-    return render_template('time.html', year=year, events=events)
+    events = get_cards_for_period(db, year, month=month, day=day, card_type='event')
+    return render_template('time.html', year=year, month=month, day=day, events=events)
+
+@card_viewer_bp.route('/time/decade/<int:decade>')
+def view_decade(decade):
+    """View events from a decade, e.g. /time/decade/1990"""
+    db = get_db()
+    start = decade - decade % 10
+    events = get_cards_for_period(db, start, start + 9, card_type='event')
+    return render_template('time.html', year=start, decade=start, events=events)
+
+@card_viewer_bp.route('/time/counts')
+def time_counts():
+    """Number of dated cards per decade, year, month or day"""
+    try:
+        year = request.args.get('year', type=int)
+        month = request.args.get('month', type=int)
+        counts = get_bucket_counts(
+            get_db(),
+            year=year,
+            month=month,
+            decades=request.args.get('by') == 'decade',
+            card_type=request.args.get('type')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        "success": True,
+        "counts": [{"bucket": bucket, "count": count} for bucket, count in counts.items()]
+    })
 
 @card_viewer_bp.route('/people')
 def people():
@@ -70,14 +106,38 @@ def events():
 def emotions():
     """List all emotions"""
     db = get_db()
-    emotions = db.execute('''
-        SELECT DISTINCT m.id, m.title, m.description, m.created_at
-        FROM memories m
-        WHERE m.description LIKE '%feel%' OR m.description LIKE '%emotion%'
-        ORDER BY m.created_at DESC
-    ''').fetchall()
+    emotions = search_cards(
+        db, 'feel emotion', card_type='memory', limit=EMOTIONS_LIMIT, any_term=True, prefix=True
+    )
     return render_template('emotions_list.html', emotions=emotions)
 
+@card_viewer_bp.route('/search')
+def search():
+    """Full-text search over card titles and descriptions"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Missing search query"}), 400
+    
+    try:
+        limit = int(request.args.get('limit', SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1:
+        # SQLite treats a negative LIMIT as no limit at all
+        return jsonify({"error": "limit must be positive"}), 400
+    limit = min(limit, MAX_SEARCH_LIMIT)
+    
+    try:
+        results = search_cards(get_db(), query, card_type=request.args.get('type'), limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        "success": True,
+        "query": query,
+        "results": results
+    })
+
 @card_viewer_bp.route('/person/add', methods=['GET', 'POST'])
 def add_person():
     """Add a new person"""
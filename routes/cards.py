@@ -1,7 +1,12 @@
-from flask import Blueprint, jsonify, request, session
+from flask import Blueprint, Response, current_app, jsonify, request, session
 from flask_cors import cross_origin
 from db import SessionLocal
-from db.utils import get_cards_for_session, card_to_model
+from db.models import Card
+from db.utils import get_cards_page, card_to_model, save_cards, MAX_BULK_CARDS
+from db.export import iter_ndjson, gzip_chunks
+from routes.caching import cached_json_response
+from routes.pagination import get_page_args
+from services.image_jobs import get_image_job_queue, JOB_DONE
 import logging
 
 # Set up logging
@@ -13,7 +18,7 @@ cards_bp = Blueprint('cards', __name__)
 @cards_bp.route('/cards', methods=['GET'])
 @cross_origin(supports_credentials=True)
 def get_cards():
-    """Get all cards for the current session."""
+    """Get a page of cards for the current session."""
     try:
         # Get session ID from cookie
         session_id = request.cookies.get('session')
@@ -22,27 +27,152 @@ def get_cards():
                 "error": "No session cookie found"
             }), 401
         
-        # Get database session
+        try:
+            limit, cursor = get_page_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        def build() -> bytes:
+            # Get database session
+            db = SessionLocal()
+            
+            try:
+                # Get cards
+                cards, next_cursor = get_cards_page(db, session_id, limit, cursor)
+                
+                # Format cards
+                formatted_cards = [card_to_model(card) for card in cards]
+                
+                return current_app.json.dumps({
+                    "success": True,
+                    "cards": formatted_cards,
+                    "next_cursor": next_cursor
+                }).encode('utf-8')
+                
+            finally:
+                db.close()
+        
+        # Serve the serialized page from cache, or a 304, until a card of the session changes
+        return cached_json_response(session_id, f"cards:{limit}:{cursor or ''}", build)
+            
+    except Exception as e:
+        logger.error(f"Error in get_cards: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "details": str(e)
+        }), 500 
+
+@cards_bp.route('/cards/bulk', methods=['POST'])
+@cross_origin(supports_credentials=True)
+def bulk_save_cards():
+    """Save a batch of cards for the current session in one transaction."""
+    try:
+        session_id = request.cookies.get('session')
+        if not session_id:
+            return jsonify({
+                "error": "No session cookie found"
+            }), 401
+        
+        # Accept a bare array or {"cards": [...]}
+        data = request.get_json(silent=True)
+        cards = data.get('cards') if isinstance(data, dict) else data
+        if not isinstance(cards, list):
+            return jsonify({"error": "Expected a JSON array of cards"}), 400
+        if len(cards) > MAX_BULK_CARDS:
+            return jsonify({"error": f"At most {MAX_BULK_CARDS} cards can be saved at once"}), 413
+        
+        db = SessionLocal()
+        
+        try:
+            saved, errors = save_cards(db, cards, session_id)
+            return jsonify({
+                "success": not errors,
+                "saved": saved,
+                "errors": errors
+            })
+            
+        finally:
+            db.close()
+            
+    except Exception as e:
+        logger.error(f"Error in bulk_save_cards: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "details": str(e)
+        }), 500
+
+@cards_bp.route('/cards/export', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def export_cards():
+    """Stream every card of the current session as NDJSON, gzipped with ?gzip=1."""
+    session_id = request.cookies.get('session')
+    if not session_id:
+        return jsonify({
+            "error": "No session cookie found"
+        }), 401
+    
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    
+    def generate():
+        # The database session lives as long as the stream, not the request
+        db = SessionLocal()
+        try:
+            chunks = iter_ndjson(db, session_id)
+            yield from gzip_chunks(chunks) if compress else chunks
+        except Exception as e:
+            # Headers are already sent, so the stream can only be cut short
+            logger.error(f"Error in export_cards: {str(e)}")
+            raise
+        finally:
+            db.close()
+    
+    filename = 'cards.ndjson.gz' if compress else 'cards.ndjson'
+    return Response(
+        generate(),
+        mimetype='application/gzip' if compress else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@cards_bp.route('/cards/<string:card_id>/image', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def get_card_image(card_id: str):
+    """Poll the image generation status of one of the current session's cards."""
+    try:
+        session_id = request.cookies.get('session')
+        if not session_id:
+            return jsonify({
+                "error": "No session cookie found"
+            }), 401
+        
         db = SessionLocal()
         
         try:
-            # Get cards
-            cards = get_cards_for_session(db, session_id)
+            card = db.query(Card).filter(
+                Card.id == card_id,
+                Card.session_id == session_id
+            ).first()
+            if not card:
+                return jsonify({"error": "Card not found"}), 404
             
-            # Format cards
-            formatted_cards = [card_to_model(card) for card in cards]
+            if card.image_url:
+                status = JOB_DONE
+            else:
+                job = get_image_job_queue().get_job_for_card(card_id)
+                status = job['status'] if job else None
             
             return jsonify({
                 "success": True,
-                "cards": formatted_cards
+                "card_id": card_id,
+                "status": status,
+                "image_url": card.image_url
             })
             
         finally:
             db.close()
             
     except Exception as e:
-        logger.error(f"Error in get_cards: {str(e)}")
+        logger.error(f"Error in get_card_image: {str(e)}")
         return jsonify({
             "error": "Internal server error",
             "details": str(e)
-        }), 500 
\ No newline at end of file
+        }), 500
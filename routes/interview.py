@@ -7,25 +7,23 @@ from cards.memory_card import MemoryCard
 from cards.person_card import PersonCard
 from cards.place_card import PlaceCard
 from cards.base_card import BaseCard
-from db.utils import save_card
+from db.utils import save_card, set_card_image
 from db import SessionLocal
 from db.session_db import session_db
 import re
 import logging
 import uuid
-from core import DROECore
 from utils.logger import get_logger
-from services.openai_service import OpenAIService
+from services.openai_service import openai_service
 from models.interview_stage import InterviewStage
 from services.event_card_service import create_event_card
+from services.image_jobs import get_image_job_queue
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 interview_bp = Blueprint('interview', __name__)
-core = DROECore()
-openai_service = OpenAIService()
 
 @interview_bp.route('/interview', methods=['GET'])
 @cross_origin(supports_credentials=True)
@@ -65,6 +63,20 @@ def get_interview():
             'details': str(e)
         }), 500
 
+def store_card_image(card_id: str, image_url: str) -> None:
+    """Store a generated image URL on a saved card."""
+    db = SessionLocal()
+    try:
+        set_card_image(db, card_id, image_url)
+    finally:
+        db.close()
+
+def queue_card_image(card_id: str, prompt: str) -> int:
+    """Queue image generation for a saved card and make sure the worker is running."""
+    queue = get_image_job_queue()
+    queue.start_worker(openai_service.generate_image, store_card_image)
+    return queue.enqueue(card_id, prompt)
+
 def extract_location(answer: str) -> str:
     """Extract location from answer text."""
     # Look for common location patterns
@@ -135,14 +147,12 @@ def submit_answer():
                     'location': location
                 }
                 
-                # Generate image
-                image_url = openai_service.generate_image(f"A place called {location}: {answer}")
-                if image_url:
-                    card['image_url'] = image_url
-                
                 # Save card to database
                 save_card(db, card, session_id)
                 
+                # Generate image in the background
+                image_job_id = queue_card_image(card['id'], f"A place called {location}: {answer}")
+                
                 # Update context
                 session['context'] = {
                     'place': location,
@@ -166,14 +176,12 @@ def submit_answer():
                     'people': people
                 }
                 
-                # Generate image
-                image_url = openai_service.generate_image(f"A family portrait with {', '.join(people)}")
-                if image_url:
-                    card['image_url'] = image_url
-                
                 # Save card to database
                 save_card(db, card, session_id)
                 
+                # Generate image in the background
+                image_job_id = queue_card_image(card['id'], f"A family portrait with {', '.join(people)}")
+                
                 # Update context
                 session['context'].update({
                     'family': people,
@@ -196,14 +204,12 @@ def submit_answer():
                     'session_id': session_id
                 }
                 
-                # Generate image
-                image_url = openai_service.generate_image(answer)
-                if image_url:
-                    card['image_url'] = image_url
-                
                 # Save card to database
                 save_card(db, card, session_id)
                 
+                # Generate image in the background
+                image_job_id = queue_card_image(card['id'], answer)
+                
                 # Update context
                 session['context'].update({
                     'events': answer,
@@ -223,14 +229,12 @@ def submit_answer():
                     'session_id': session_id
                 }
                 
-                # Generate image
-                image_url = openai_service.generate_image(answer)
-                if image_url:
-                    card['image_url'] = image_url
-                
                 # Save card to database
                 save_card(db, card, session_id)
                 
+                # Generate image in the background
+                image_job_id = queue_card_image(card['id'], answer)
+                
                 # Update context
                 session['context'].update({
                     'memories': answer,
@@ -247,7 +251,9 @@ def submit_answer():
             response = jsonify({
                 'success': True,
                 'question': question,
-                'stage': session['stage']
+                'stage': session['stage'],
+                'card_id': card['id'],
+                'image_job_id': image_job_id
             })
             
             # Set session cookie
@@ -0,0 +1,28 @@
+from typing import Optional, Tuple
+from flask import request
+from db.utils import decode_cursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def get_page_args() -> Tuple[int, Optional[str]]:
+    """
+    Read the ``limit`` and ``cursor`` query parameters of a paginated request.
+
+    Returns:
+        Tuple[int, Optional[str]]: The page size and the cursor, if any
+
+    Raises:
+        ValueError: If limit is not a positive integer or the cursor is malformed
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    
+    cursor = request.args.get('cursor') or None
+    if cursor:
+        decode_cursor(cursor)
+    return min(limit, MAX_PAGE_SIZE), cursor
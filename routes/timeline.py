@@ -1,11 +1,13 @@
-from flask import Blueprint, render_template, jsonify, request, session
+from flask import Blueprint, current_app, render_template, jsonify, request, session
 from flask_cors import cross_origin
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from db import SessionLocal
 from db.models import Card
 from sqlalchemy import desc
-from db.utils import get_timeline_for_session, card_to_model
+from db.utils import get_timeline_page, card_to_model
+from routes.caching import cached_json_response
+from routes.pagination import get_page_args
 import logging
 
 # Set up logging
@@ -50,7 +52,7 @@ def parse_date(date_str: str) -> str:
 @timeline_bp.route('/timeline', methods=['GET'])
 @cross_origin(supports_credentials=True)
 def get_timeline():
-    """Get the timeline for the current session."""
+    """Get a page of the timeline for the current session."""
     try:
         # Get session ID from cookie
         session_id = request.cookies.get('session')
@@ -59,33 +61,40 @@ def get_timeline():
                 "error": "No session cookie found"
             }), 401
         
-        # Get database session
-        db = SessionLocal()
-        
         try:
-            # Get timeline items
-            timeline_items = get_timeline_for_session(db, session_id)
-            
-            # Format timeline items
-            formatted_items = []
-            for item in timeline_items:
-                formatted_item = card_to_model(item)
-                if formatted_item.get('date'):
-                    formatted_item['date'] = parse_date(formatted_item['date'])
-                formatted_items.append(formatted_item)
-            
-            # Sort items by date
-            formatted_items.sort(key=lambda x: x.get('date', ''), reverse=True)
-            
-            # Return empty timeline if no items found
-            return jsonify({
-                "success": True,
-                "timeline": formatted_items
-            })
+            limit, cursor = get_page_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        def build() -> bytes:
+            # Get database session
+            db = SessionLocal()
             
-        finally:
-            # Close database session
-            db.close()
+            try:
+                # Get timeline items, already ordered by date
+                timeline_items, next_cursor = get_timeline_page(db, session_id, limit, cursor)
+                
+                # Format timeline items
+                formatted_items = []
+                for item in timeline_items:
+                    formatted_item = card_to_model(item)
+                    if formatted_item.get('date'):
+                        formatted_item['date'] = parse_date(formatted_item['date'])
+                    formatted_items.append(formatted_item)
+                
+                # Return empty timeline if no items found
+                return current_app.json.dumps({
+                    "success": True,
+                    "timeline": formatted_items,
+                    "next_cursor": next_cursor
+                }).encode('utf-8')
+                
+            finally:
+                # Close database session
+                db.close()
+        
+        # Serve the serialized page from cache, or a 304, until a card of the session changes
+        return cached_json_response(session_id, f"timeline:{limit}:{cursor or ''}", build)
             
     except Exception as e:
         logger.error(f"Error in get_timeline: {str(e)}")
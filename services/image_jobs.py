@@ -0,0 +1,238 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+import logging
+import os
+from utils.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+class ImageJobQueue:
+    """SQLite-backed queue of card image generation jobs.
+
+    Jobs survive restarts and can be claimed safely by workers in several
+    processes sharing the same database file.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3,
+                 poll_interval: float = 5.0, stale_after: float = 600.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        # Running jobs not updated for this many seconds belong to a dead worker
+        self.stale_after = stale_after
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._init_db()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's database connection, creating one if necessary"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """Initialize the database and create tables if they don't exist"""
+        try:
+            conn = self._get_connection()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS image_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    card_id TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    image_url TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_image_jobs_status ON image_jobs (status, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_image_jobs_card ON image_jobs (card_id)")
+        except sqlite3.Error as e:
+            logger.error(f"Error initializing image job queue: {str(e)}")
+            raise
+
+    def enqueue(self, card_id: str, prompt: str) -> int:
+        """
+        Queue an image generation job for a card.
+
+        Args:
+            card_id (str): The card that should receive the image
+            prompt (str): The image prompt
+
+        Returns:
+            int: The job ID
+        """
+        now = datetime.now().isoformat()
+        cursor = self._get_connection().execute("""
+            INSERT INTO image_jobs (card_id, prompt, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (card_id, prompt, JOB_PENDING, now, now))
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Atomically take the oldest pending job.
+
+        Jobs left running by a worker that died are picked up again once stale.
+
+        Returns:
+            Optional[Dict]: The claimed job, or None if the queue is empty
+        """
+        now = datetime.now()
+        stale_before = (now - timedelta(seconds=self.stale_after)).isoformat()
+        conn = self._get_connection()
+        # BEGIN IMMEDIATE takes the write lock up front, so no other process can
+        # claim the same job between the SELECT and the UPDATE
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("""
+                SELECT id, card_id, prompt, attempts FROM image_jobs
+                WHERE status = ? OR (status = ? AND updated_at < ?)
+                ORDER BY id LIMIT 1
+            """, (JOB_PENDING, JOB_RUNNING, stale_before)).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE image_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (JOB_RUNNING, now.isoformat(), row['id'])
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        job = dict(row)
+        job['attempts'] += 1
+        return job
+
+    def complete(self, job_id: int, image_url: str) -> None:
+        """Mark a job as finished with its image URL"""
+        self._get_connection().execute("""
+            UPDATE image_jobs SET status = ?, image_url = ?, error = NULL, updated_at = ?
+            WHERE id = ?
+        """, (JOB_DONE, image_url, datetime.now().isoformat(), job_id))
+
+    def fail(self, job_id: int, attempts: int, error: str) -> None:
+        """Record a failed attempt, requeueing the job until it runs out of attempts"""
+        status = JOB_PENDING if attempts < self.max_attempts else JOB_FAILED
+        self._get_connection().execute("""
+            UPDATE image_jobs SET status = ?, error = ?, updated_at = ?
+            WHERE id = ?
+        """, (status, error, datetime.now().isoformat(), job_id))
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """Get a job by ID"""
+        row = self._get_connection().execute(
+            "SELECT * FROM image_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_job_for_card(self, card_id: str) -> Optional[Dict]:
+        """Get the most recent job for a card"""
+        row = self._get_connection().execute(
+            "SELECT * FROM image_jobs WHERE card_id = ? ORDER BY id DESC LIMIT 1", (card_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def run_pending(self, generate: Callable[[str], Optional[str]],
+                    on_complete: Callable[[str, str], None]) -> int:
+        """
+        Process queued jobs until the queue is empty.
+
+        Args:
+            generate (Callable): Turns a prompt into an image URL
+            on_complete (Callable): Called with ``(card_id, image_url)`` for each finished job
+
+        Returns:
+            int: Number of jobs processed
+        """
+        processed = 0
+        while not self._stop.is_set():
+            job = self.claim()
+            if job is None:
+                break
+            processed += 1
+            try:
+                image_url = generate(job['prompt'])
+                if not image_url:
+                    raise ValueError("No image was generated")
+                on_complete(job['card_id'], image_url)
+                self.complete(job['id'], image_url)
+            except Exception as e:
+                logger.error(f"Error running image job {job['id']}: {str(e)}")
+                self.fail(job['id'], job['attempts'], str(e))
+        return processed
+
+    def start_worker(self, generate: Callable[[str], Optional[str]],
+                     on_complete: Callable[[str, str], None]) -> None:
+        """
+        Start the background worker thread if it isn't already running.
+
+        Args:
+            generate (Callable): Turns a prompt into an image URL
+            on_complete (Callable): Called with ``(card_id, image_url)`` for each finished job
+        """
+        with self._worker_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(
+                target=self._work,
+                args=(generate, on_complete),
+                name="image-job-worker",
+                daemon=True
+            )
+            self._worker.start()
+
+    def _work(self, generate, on_complete) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.run_pending(generate, on_complete)
+            except Exception as e:
+                logger.error(f"Image job worker error: {str(e)}")
+            # Sleep until new work is enqueued here, or poll for jobs from other processes
+            self._wakeup.wait(self.poll_interval)
+
+    def stop_worker(self, timeout: Optional[float] = None) -> None:
+        """Stop the background worker thread"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+_queue: Optional[ImageJobQueue] = None
+_queue_lock = threading.Lock()
+
+def get_image_job_queue() -> ImageJobQueue:
+    """
+    Get the shared job queue, creating its database on first use.
+
+    The database is $IMAGE_JOBS_DB, or image_jobs.db in the data directory.
+
+    Returns:
+        ImageJobQueue: The shared queue
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ImageJobQueue(os.getenv('IMAGE_JOBS_DB') or data_path('image_jobs.db'))
+        return _queue
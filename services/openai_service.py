@@ -3,39 +3,72 @@ import os
 from typing import Dict, Optional, List
 import logging
 import json
+import threading
 from openai import OpenAI
 from datetime import datetime
 import re
+from utils.assistant_cache import AssistantIdCache, assistant_id_cache
+from utils.run_waiter import wait_for_run
 
 logger = logging.getLogger(__name__)
 
 class OpenAIService:
-    def __init__(self):
+    # Seconds to wait for an assistant run before giving up
+    run_timeout = 60.0
+    assistant_name = "Life Story Interviewer"
+
+    def __init__(self, assistant_cache: Optional[AssistantIdCache] = None):
+        # Nothing here touches the network; the client and assistant are set up on first use
         self.api_key = os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-        openai.api_key = self.api_key
-        
-        # Create or retrieve the interview assistant
-        self.assistant_id = self._get_or_create_assistant()
-        logger.info(f"Using assistant ID: {self.assistant_id}")
+        self.assistant_cache = assistant_cache or assistant_id_cache
+        self._client = None
+        self._assistant_id = os.getenv('OPENAI_ASSISTANT_ID')
+        self._lock = threading.RLock()
+
+    @property
+    def client(self) -> OpenAI:
+        """OpenAI client, created on first use"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self.api_key:
+                        raise ValueError("OPENAI_API_KEY environment variable not set")
+                    openai.api_key = self.api_key
+                    self._client = OpenAI(api_key=self.api_key)
+        return self._client
 
-        self.client = OpenAI(api_key=self.api_key)
+    @property
+    def assistant_id(self) -> str:
+        """ID of the interview assistant, resolved on first use and cached on disk"""
+        if self._assistant_id is None:
+            with self._lock:
+                if self._assistant_id is None:
+                    self._assistant_id = self.assistant_cache.get_or_resolve(
+                        self.assistant_name, self._get_or_create_assistant
+                    )
+                    logger.info(f"Using assistant ID: {self._assistant_id}")
+        return self._assistant_id
+
+    def reset_assistant(self) -> None:
+        """Forget the resolved assistant ID so it is looked up again on next use"""
+        with self._lock:
+            self._assistant_id = None
+            self.assistant_cache.invalidate(self.assistant_name)
 
     def _get_or_create_assistant(self) -> str:
         """Get or create the interview assistant"""
         try:
             # List existing assistants
-            assistants = openai.beta.assistants.list()
+            assistants = self.client.beta.assistants.list()
             
             # Look for our interview assistant
             for assistant in assistants.data:
-                if assistant.name == "Life Story Interviewer":
+                if assistant.name == self.assistant_name:
                     return assistant.id
             
             # If not found, create a new one
-            assistant = openai.beta.assistants.create(
-                name="Life Story Interviewer",
+            assistant = self.client.beta.assistants.create(
+                name=self.assistant_name,
                 instructions="""You are an expert interviewer conducting a life story interview to create a visual timeline.
                 Your role is to:
                 1. Ask ONE question at a time to build a chronological timeline
@@ -97,7 +130,7 @@ class OpenAIService:
     def _create_thread(self) -> str:
         """Create a new conversation thread"""
         try:
-            thread = openai.beta.threads.create()
+            thread = self.client.beta.threads.create()
             return thread.id
         except Exception as e:
             logger.error(f"Error creating thread: {str(e)}")
@@ -106,7 +139,7 @@ class OpenAIService:
     def _add_message(self, thread_id: str, content: str) -> None:
         """Add a message to the thread"""
         try:
-            openai.beta.threads.messages.create(
+            self.client.beta.threads.messages.create(
                 thread_id=thread_id,
                 role="user",
                 content=content
@@ -115,27 +148,24 @@ class OpenAIService:
             logger.error(f"Error adding message: {str(e)}")
             raise
 
-    def _run_assistant(self, thread_id: str) -> str:
+    def _run_assistant(self, thread_id: str, cancel_event: Optional[threading.Event] = None) -> str:
         """Run the assistant on the thread and get the response"""
         try:
-            run = openai.beta.threads.runs.create(
-                thread_id=thread_id,
-                assistant_id=self.assistant_id
-            )
-            
-            # Wait for the run to complete
-            while True:
-                run_status = openai.beta.threads.runs.retrieve(
+            try:
+                run = self.client.beta.threads.runs.create(
                     thread_id=thread_id,
-                    run_id=run.id
+                    assistant_id=self.assistant_id
                 )
-                if run_status.status == 'completed':
-                    break
-                elif run_status.status in ['failed', 'cancelled', 'expired']:
-                    raise Exception(f"Run failed with status: {run_status.status}")
+            except openai.NotFoundError:
+                # The cached assistant was deleted; resolve it again next time
+                self.reset_assistant()
+                raise
+            
+            # Wait for the run to complete
+            wait_for_run(self.client, thread_id, run.id, timeout=self.run_timeout, cancel_event=cancel_event)
             
             # Get the messages
-            messages = openai.beta.threads.messages.list(thread_id=thread_id)
+            messages = self.client.beta.threads.messages.list(thread_id=thread_id)
             return messages.data[0].content[0].text.value
             
         except Exception as e:
@@ -0,0 +1,194 @@
+from typing import Dict, Any, List, Optional, Iterable
+import sqlite3
+import threading
+import os
+from utils.logger import get_logger
+
+INDEX_FILENAME = ".index.db"
+
+class CardIndex:
+    """Persistent metadata index for the JSON card store.
+
+    Keeps one row per stored card with the fields returned by
+    ``StorageManager.list_cards`` so listing never has to open card files.
+    """
+
+    def __init__(self, storage_path: str):
+        """
+        Initialize the card index.
+
+        Args:
+            storage_path (str): Path to the storage directory the index belongs to
+        """
+        self.storage_path = storage_path
+        self.db_path = os.path.join(storage_path, INDEX_FILENAME)
+        self.logger = get_logger(__name__)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the index tables if they don't exist."""
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS card_index (
+                    id TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    title TEXT,
+                    description TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    PRIMARY KEY (type, id)
+                );
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            self._conn.commit()
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index has been populated from disk at least once."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'built'"
+            ).fetchone()
+        return row is not None and row['value'] == '1'
+
+    def upsert(self, card_type: str, card_dict: Dict[str, Any]) -> None:
+        """
+        Add or replace the index entry for a card.
+
+        Args:
+            card_type (str): The type of the card
+            card_dict (Dict[str, Any]): The serialized card
+        """
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO card_index (id, type, title, description, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, self._row(card_type, card_dict))
+            self._conn.commit()
+
+    def remove(self, card_id: str, card_type: str) -> None:
+        """
+        Remove a card from the index.
+
+        Args:
+            card_id (str): The ID of the card
+            card_type (str): The type of the card
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM card_index WHERE type = ? AND id = ?", (card_type, card_id)
+            )
+            self._conn.commit()
+
+    def upsert_many(self, entries: Iterable[tuple]) -> None:
+        """
+        Add or replace the index entries for several cards in one transaction.
+
+        Args:
+            entries (Iterable[tuple]): ``(card_type, card_dict)`` pairs
+        """
+        rows = [self._row(card_type, card_dict) for card_type, card_dict in entries]
+        with self._lock:
+            try:
+                self._conn.executemany("""
+                    INSERT OR REPLACE INTO card_index (id, type, title, description, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def remove_many(self, keys: Iterable[tuple]) -> None:
+        """
+        Remove several cards from the index in one transaction.
+
+        Args:
+            keys (Iterable[tuple]): ``(card_id, card_type)`` pairs
+        """
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "DELETE FROM card_index WHERE type = ? AND id = ?",
+                    [(card_type, card_id) for card_id, card_type in keys]
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def list(self, card_types: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        List indexed card metadata for the given types.
+
+        Args:
+            card_types (Iterable[str]): The card types to include
+
+        Returns:
+            List[Dict[str, Any]]: List of card metadata
+        """
+        card_types = list(card_types)
+        if not card_types:
+            return []
+        placeholders = ", ".join("?" for _ in card_types)
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT id, title, description, type, created_at, updated_at
+                FROM card_index
+                WHERE type IN ({placeholders})
+                ORDER BY type, created_at, id
+            """, card_types).fetchall()
+        return [dict(row) for row in rows]
+
+    def rebuild(self, entries: Iterable[tuple]) -> int:
+        """
+        Replace the whole index with the given entries.
+
+        Args:
+            entries (Iterable[tuple]): ``(card_type, card_dict)`` pairs read from disk
+
+        Returns:
+            int: Number of indexed cards
+        """
+        rows = [self._row(card_type, card_dict) for card_type, card_dict in entries]
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM card_index")
+                self._conn.executemany("""
+                    INSERT OR REPLACE INTO card_index (id, type, title, description, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('built', '1')"
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+        self.logger.info(f"Rebuilt card index with {len(rows)} cards")
+        return len(rows)
+
+    def close(self) -> None:
+        """Close the index database connection."""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _row(card_type: str, card_dict: Dict[str, Any]) -> tuple:
+        """Build the index row for a serialized card."""
+        return (
+            card_dict.get('id'),
+            card_type,
+            card_dict.get('title'),
+            card_dict.get('description'),
+            card_dict.get('created_at'),
+            card_dict.get('updated_at')
+        )
@@ -0,0 +1,269 @@
+import json
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional speedup
+    msgpack = None
+
+# Every encoded card starts with MAGIC and the id of the codec that wrote it,
+# so stores holding cards written by different codecs keep loading
+MAGIC = b'DRC'
+HEADER_SIZE = len(MAGIC) + 1
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+class CardCodec(ABC):
+    """Serializes card dictionaries to bytes and back."""
+
+    name = ''
+    codec_id = 0
+
+    @abstractmethod
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        """Encode a card dictionary, without the header."""
+
+    @abstractmethod
+    def decode(self, payload: Buffer) -> Dict[str, Any]:
+        """Decode a payload produced by encode."""
+
+class JSONCodec(CardCodec):
+    """Compact UTF-8 JSON without indentation or separator padding."""
+
+    name = 'json'
+    codec_id = 1
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def decode(self, payload: Buffer) -> Dict[str, Any]:
+        return json.loads(bytes(payload))
+
+class MsgpackCodec(CardCodec):
+    """MessagePack encoding.
+
+    Uses the msgpack package when it is installed and a pure-Python
+    implementation of the same format otherwise, so either can read cards
+    written by the other.
+    """
+
+    name = 'msgpack'
+    codec_id = 2
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        if msgpack is not None:
+            return msgpack.packb(data, use_bin_type=True)
+        return packb(data)
+
+    def decode(self, payload: Buffer) -> Dict[str, Any]:
+        if msgpack is not None:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        return unpackb(payload)
+
+CODECS = {codec.name: codec for codec in (JSONCodec(), MsgpackCodec())}
+_CODECS_BY_ID = {codec.codec_id: codec for codec in CODECS.values()}
+
+def get_codec(name: str) -> CardCodec:
+    """
+    Get a registered codec by name.
+
+    Raises:
+        ValueError: If no codec has that name
+    """
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown card codec: {name}")
+
+def register_codec(codec: CardCodec) -> None:
+    """
+    Register an additional codec.
+
+    Raises:
+        ValueError: If its name or id is already taken
+    """
+    if codec.name in CODECS or codec.codec_id in _CODECS_BY_ID:
+        raise ValueError(f"Codec {codec.name} ({codec.codec_id}) is already registered")
+    if not 0 < codec.codec_id < 256:
+        raise ValueError("codec_id must fit in one byte")
+    CODECS[codec.name] = codec
+    _CODECS_BY_ID[codec.codec_id] = codec
+
+def encode_card(data: Dict[str, Any], codec: CardCodec) -> bytes:
+    """Encode a card dictionary with a format header."""
+    return MAGIC + bytes((codec.codec_id,)) + codec.encode(data)
+
+def decode_card(data: Buffer) -> Dict[str, Any]:
+    """
+    Decode a card written by encode_card, or a header-less legacy JSON card.
+
+    Raises:
+        ValueError: If the data is corrupt or its codec is unknown
+    """
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        # Cards written before codecs existed are plain (indented) JSON
+        return json.loads(bytes(data))
+    codec = _CODECS_BY_ID.get(data[len(MAGIC)])
+    if codec is None:
+        raise ValueError(f"Unknown card codec id: {data[len(MAGIC)]}")
+    try:
+        return codec.decode(memoryview(data)[HEADER_SIZE:])
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt {codec.name} card: {str(e)}") from e
+
+# Pure-Python MessagePack, limited to the types JSON can hold plus bytes
+
+_pack_uint8 = struct.Struct('>B').pack
+_pack_uint16 = struct.Struct('>H').pack
+_pack_uint32 = struct.Struct('>I').pack
+_pack_uint64 = struct.Struct('>Q').pack
+_pack_int8 = struct.Struct('>b').pack
+_pack_int16 = struct.Struct('>h').pack
+_pack_int32 = struct.Struct('>i').pack
+_pack_int64 = struct.Struct('>q').pack
+_pack_double = struct.Struct('>d').pack
+
+def _pack_length(out: bytearray, n: int, fix_tag: int, fix_max: int, tag8: int, tag16: int, tag32: int) -> None:
+    if n <= fix_max and fix_tag is not None:
+        out.append(fix_tag | n)
+    elif n < 0x100 and tag8 is not None:
+        out.append(tag8)
+        out += _pack_uint8(n)
+    elif n < 0x10000:
+        out.append(tag16)
+        out += _pack_uint16(n)
+    else:
+        out.append(tag32)
+        out += _pack_uint32(n)
+
+def _pack(obj: Any, out: bytearray) -> None:
+    if obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -0x20 <= obj < 0:
+            out.append(obj & 0xff)
+        elif obj >= 0:
+            for tag, limit, pack in ((0xcc, 0x100, _pack_uint8), (0xcd, 0x10000, _pack_uint16),
+                                     (0xce, 0x100000000, _pack_uint32), (0xcf, 1 << 64, _pack_uint64)):
+                if obj < limit:
+                    out.append(tag)
+                    out += pack(obj)
+                    return
+            raise OverflowError(f"Integer too large for msgpack: {obj}")
+        else:
+            for tag, limit, pack in ((0xd0, 0x80, _pack_int8), (0xd1, 0x8000, _pack_int16),
+                                     (0xd2, 0x80000000, _pack_int32), (0xd3, 1 << 63, _pack_int64)):
+                if obj >= -limit:
+                    out.append(tag)
+                    out += pack(obj)
+                    return
+            raise OverflowError(f"Integer too small for msgpack: {obj}")
+    elif isinstance(obj, float):
+        out.append(0xcb)
+        out += _pack_double(obj)
+    elif isinstance(obj, str):
+        encoded = obj.encode('utf-8')
+        _pack_length(out, len(encoded), 0xa0, 31, 0xd9, 0xda, 0xdb)
+        out += encoded
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        _pack_length(out, len(obj), None, -1, 0xc4, 0xc5, 0xc6)
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        _pack_length(out, len(obj), 0x90, 15, None, 0xdc, 0xdd)
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        _pack_length(out, len(obj), 0x80, 15, None, 0xde, 0xdf)
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise TypeError(f"Cannot msgpack {type(obj).__name__}")
+
+def packb(obj: Any) -> bytes:
+    """Encode an object as MessagePack."""
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+_unpack_from = struct.unpack_from
+
+# Fixed-size types: tag -> (struct format, size)
+_FIXED = {
+    0xcc: ('>B', 1), 0xcd: ('>H', 2), 0xce: ('>I', 4), 0xcf: ('>Q', 8),
+    0xd0: ('>b', 1), 0xd1: ('>h', 2), 0xd2: ('>i', 4), 0xd3: ('>q', 8),
+    0xca: ('>f', 4), 0xcb: ('>d', 8)
+}
+# Length-prefixed types: tag -> (length format, length size, kind)
+_SIZED = {
+    0xd9: ('>B', 1, 'str'), 0xda: ('>H', 2, 'str'), 0xdb: ('>I', 4, 'str'),
+    0xc4: ('>B', 1, 'bin'), 0xc5: ('>H', 2, 'bin'), 0xc6: ('>I', 4, 'bin'),
+    0xdc: ('>H', 2, 'array'), 0xdd: ('>I', 4, 'array'),
+    0xde: ('>H', 2, 'map'), 0xdf: ('>I', 4, 'map')
+}
+
+def _unpack(data: Buffer, pos: int):
+    tag = data[pos]
+    pos += 1
+    if tag < 0x80:
+        return tag, pos
+    if tag >= 0xe0:
+        return tag - 0x100, pos
+    if 0xa0 <= tag <= 0xbf:
+        end = pos + (tag & 0x1f)
+        return str(data[pos:end], 'utf-8'), end
+    if 0x90 <= tag <= 0x9f:
+        kind, n = 'array', tag & 0x0f
+    elif 0x80 <= tag <= 0x8f:
+        kind, n = 'map', tag & 0x0f
+    elif tag == 0xc0:
+        return None, pos
+    elif tag == 0xc2:
+        return False, pos
+    elif tag == 0xc3:
+        return True, pos
+    elif tag in _FIXED:
+        fmt, size = _FIXED[tag]
+        return _unpack_from(fmt, data, pos)[0], pos + size
+    elif tag in _SIZED:
+        fmt, size, kind = _SIZED[tag]
+        n = _unpack_from(fmt, data, pos)[0]
+        pos += size
+        if kind == 'str':
+            return str(data[pos:pos + n], 'utf-8'), pos + n
+        if kind == 'bin':
+            return bytes(data[pos:pos + n]), pos + n
+    else:
+        raise ValueError(f"Unsupported msgpack type 0x{tag:02x}")
+
+    if kind == 'array':
+        items = []
+        for _ in range(n):
+            item, pos = _unpack(data, pos)
+            items.append(item)
+        return items, pos
+    result = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
+
+def unpackb(data: Buffer) -> Any:
+    """
+    Decode a single MessagePack object.
+
+    Raises:
+        ValueError: If the data holds anything after the object or an unsupported type
+    """
+    obj, end = _unpack(data, 0)
+    if end != len(data):
+        raise ValueError("Extra data after msgpack object")
+    return obj
@@ -0,0 +1,337 @@
+from typing import Dict, Any, List, Optional, Iterable
+from collections import Counter
+import math
+import re
+import sqlite3
+import threading
+import os
+from utils.logger import get_logger
+
+SEARCH_INDEX_FILENAME = ".search.db"
+
+# BM25 tuning parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Title terms count more than description or metadata terms
+TITLE_WEIGHT = 2
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'with'
+])
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Args:
+        text (str): The text to tokenize
+
+    Returns:
+        List[str]: Terms with stop words removed
+    """
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+def _flatten(value: Any) -> List[str]:
+    """Collect all string-like leaves of a metadata value."""
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _flatten(v)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in _flatten(v)]
+    return [str(value)]
+
+class SearchIndex:
+    """Persistent inverted index with BM25 ranking for the JSON card store."""
+
+    def __init__(self, storage_path: str):
+        """
+        Initialize the search index.
+
+        Args:
+            storage_path (str): Path to the storage directory the index belongs to
+        """
+        self.storage_path = storage_path
+        self.db_path = os.path.join(storage_path, SEARCH_INDEX_FILENAME)
+        self.logger = get_logger(__name__)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the index tables if they don't exist."""
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc_key INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    title TEXT,
+                    description TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    length INTEGER NOT NULL,
+                    UNIQUE (type, id)
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc_key INTEGER NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, doc_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_key);
+                CREATE TABLE IF NOT EXISTS search_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO search_meta (key, value) VALUES ('doc_count', '0')"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO search_meta (key, value) VALUES ('total_length', '0')"
+            )
+            self._conn.commit()
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index has been populated from disk at least once."""
+        return self._get_meta('built') == '1'
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM search_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row['value'] if row else None
+
+    def _adjust_stats(self, doc_delta: int, length_delta: int) -> None:
+        """Keep corpus statistics up to date so queries never need a full count."""
+        self._conn.execute(
+            "UPDATE search_meta SET value = CAST(value AS INTEGER) + ? WHERE key = 'doc_count'",
+            (doc_delta,)
+        )
+        self._conn.execute(
+            "UPDATE search_meta SET value = CAST(value AS INTEGER) + ? WHERE key = 'total_length'",
+            (length_delta,)
+        )
+
+    @staticmethod
+    def _terms(card_dict: Dict[str, Any]) -> Counter:
+        """Build the term frequencies for a serialized card."""
+        terms = Counter()
+        for term in tokenize(card_dict.get('title') or ''):
+            terms[term] += TITLE_WEIGHT
+        terms.update(tokenize(card_dict.get('description') or ''))
+        for text in _flatten(card_dict.get('metadata')):
+            terms.update(tokenize(text))
+        return terms
+
+    def _delete_document(self, card_id: str, card_type: str) -> None:
+        """Remove a document and its postings; caller holds the lock."""
+        row = self._conn.execute(
+            "SELECT doc_key, length FROM documents WHERE type = ? AND id = ?",
+            (card_type, card_id)
+        ).fetchone()
+        if not row:
+            return
+        self._conn.execute("DELETE FROM postings WHERE doc_key = ?", (row['doc_key'],))
+        self._conn.execute("DELETE FROM documents WHERE doc_key = ?", (row['doc_key'],))
+        self._adjust_stats(-1, -row['length'])
+
+    def _insert_document(self, card_type: str, card_dict: Dict[str, Any]) -> int:
+        """Insert a document and its postings; caller holds the lock and updates stats."""
+        terms = self._terms(card_dict)
+        length = sum(terms.values())
+        cursor = self._conn.execute("""
+            INSERT INTO documents (id, type, title, description, created_at, updated_at, length)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            card_dict.get('id'),
+            card_type,
+            card_dict.get('title'),
+            card_dict.get('description'),
+            card_dict.get('created_at'),
+            card_dict.get('updated_at'),
+            length
+        ))
+        doc_key = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO postings (term, doc_key, tf) VALUES (?, ?, ?)",
+            [(term, doc_key, tf) for term, tf in terms.items()]
+        )
+        return length
+
+    def upsert(self, card_type: str, card_dict: Dict[str, Any]) -> None:
+        """
+        Add or replace the indexed terms for a card.
+
+        Args:
+            card_type (str): The type of the card
+            card_dict (Dict[str, Any]): The serialized card
+        """
+        with self._lock:
+            try:
+                self._delete_document(card_dict.get('id'), card_type)
+                self._adjust_stats(1, self._insert_document(card_type, card_dict))
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def remove(self, card_id: str, card_type: str) -> None:
+        """
+        Remove a card from the index.
+
+        Args:
+            card_id (str): The ID of the card
+            card_type (str): The type of the card
+        """
+        with self._lock:
+            try:
+                self._delete_document(card_id, card_type)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def upsert_many(self, entries: Iterable[tuple]) -> None:
+        """
+        Add or replace the indexed terms for several cards in one transaction.
+
+        Args:
+            entries (Iterable[tuple]): ``(card_type, card_dict)`` pairs
+        """
+        with self._lock:
+            try:
+                for card_type, card_dict in entries:
+                    self._delete_document(card_dict.get('id'), card_type)
+                    self._adjust_stats(1, self._insert_document(card_type, card_dict))
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def remove_many(self, keys: Iterable[tuple]) -> None:
+        """
+        Remove several cards from the index in one transaction.
+
+        Args:
+            keys (Iterable[tuple]): ``(card_id, card_type)`` pairs
+        """
+        with self._lock:
+            try:
+                for card_id, card_type in keys:
+                    self._delete_document(card_id, card_type)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def rebuild(self, entries: Iterable[tuple]) -> int:
+        """
+        Replace the whole index with the given entries.
+
+        Args:
+            entries (Iterable[tuple]): ``(card_type, card_dict)`` pairs read from disk
+
+        Returns:
+            int: Number of indexed cards
+        """
+        count = 0
+        total_length = 0
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM postings")
+                self._conn.execute("DELETE FROM documents")
+                self._conn.execute(
+                    "UPDATE search_meta SET value = '0' WHERE key IN ('doc_count', 'total_length')"
+                )
+                for card_type, card_dict in entries:
+                    total_length += self._insert_document(card_type, card_dict)
+                    count += 1
+                self._adjust_stats(count, total_length)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO search_meta (key, value) VALUES ('built', '1')"
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+        self.logger.info(f"Rebuilt search index with {count} cards")
+        return count
+
+    def search(self, query: str, card_types: Iterable[str], limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Rank cards against a query with BM25.
+
+        Args:
+            query (str): The search query
+            card_types (Iterable[str]): The card types to include
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Card metadata with a ``score``, best match first
+        """
+        terms = sorted(set(tokenize(query)))
+        card_types = list(card_types)
+        if not terms or not card_types:
+            return []
+
+        with self._lock:
+            doc_count = int(self._get_meta('doc_count') or 0)
+            total_length = int(self._get_meta('total_length') or 0)
+            if doc_count == 0:
+                return []
+            avg_length = total_length / doc_count
+
+            term_placeholders = ", ".join("?" for _ in terms)
+            doc_freqs = {
+                row['term']: row['df'] for row in self._conn.execute(f"""
+                    SELECT term, COUNT(*) AS df FROM postings
+                    WHERE term IN ({term_placeholders})
+                    GROUP BY term
+                """, terms)
+            }
+            if not doc_freqs:
+                return []
+
+            # Per-term IDF is passed in as a constant table so the ranking runs in SQLite
+            weights = [
+                (term, math.log(1 + (doc_count - df + 0.5) / (df + 0.5)))
+                for term, df in doc_freqs.items()
+            ]
+            values = ", ".join("(?, ?)" for _ in weights)
+            type_placeholders = ", ".join("?" for _ in card_types)
+            params = [value for weight in weights for value in weight]
+            params += [BM25_K1 + 1, BM25_K1, 1 - BM25_B, BM25_B / avg_length]
+            params += card_types
+            params.append(limit)
+
+            rows = self._conn.execute(f"""
+                WITH query_terms (term, idf) AS (VALUES {values})
+                SELECT d.id, d.title, d.description, d.type, d.created_at, d.updated_at,
+                       SUM(q.idf * (p.tf * ?) / (p.tf + ? * (? + ? * d.length))) AS score
+                FROM query_terms q
+                JOIN postings p ON p.term = q.term
+                JOIN documents d ON d.doc_key = p.doc_key
+                WHERE d.type IN ({type_placeholders})
+                GROUP BY d.doc_key
+                ORDER BY score DESC, d.created_at DESC
+                LIMIT ?
+            """, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the index database connection."""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
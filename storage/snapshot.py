@@ -0,0 +1,148 @@
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from storage.codecs import decode_card
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = b'DRSNAP01'
+
+# magic, card count, offset of the offset table
+_HEADER = struct.Struct('>8sIQ')
+# value offset, value length, type length, id length
+_ENTRY = struct.Struct('>QIHH')
+
+def write_snapshot(path: str, cards: Iterable[Tuple[str, str, bytes]], fsync: bool = True) -> int:
+    """
+    Pack encoded cards into a read-only snapshot file.
+
+    The file holds a header, the encoded cards back to back and an offset
+    table locating each card. It is written to a temporary file and moved
+    into place, so readers never see a partial snapshot.
+
+    Args:
+        path (str): Where to write the snapshot
+        cards (Iterable[Tuple[str, str, bytes]]): ``(card_type, card_id, encoded card)``
+        fsync (bool): Flush the snapshot to disk before it replaces the previous one
+
+    Returns:
+        int: Number of cards written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\0' * _HEADER.size)
+            offset = _HEADER.size
+            table = []
+            for card_type, card_id, data in cards:
+                f.write(data)
+                table.append((card_type.encode('utf-8'), card_id.encode('utf-8'), offset, len(data)))
+                offset += len(data)
+
+            for type_bytes, id_bytes, value_offset, length in table:
+                f.write(_ENTRY.pack(value_offset, length, len(type_bytes), len(id_bytes)))
+                f.write(type_bytes + id_bytes)
+            f.seek(0)
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, len(table), offset))
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(table)
+
+class CardSnapshot:
+    """Read-only, memory-mapped view of a snapshot written by write_snapshot.
+
+    Cards are sliced out of the mapping with memoryview and decoded only
+    when asked for, so a lookup costs no system call, and every process
+    mapping the same snapshot shares its pages in the page cache.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): Path to the snapshot
+
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Not a card snapshot: {path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        try:
+            self._offsets = self._read_table(size)
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise ValueError(f"Corrupt card snapshot {path}: {str(e)}") from e
+
+    def _read_table(self, size: int) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        magic, count, pos = _HEADER.unpack_from(self._buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("bad magic")
+        offsets = {}
+        for _ in range(count):
+            value_offset, length, type_length, id_length = _ENTRY.unpack_from(self._buffer, pos)
+            pos += _ENTRY.size
+            card_type = str(self._buffer[pos:pos + type_length], 'utf-8')
+            pos += type_length
+            card_id = str(self._buffer[pos:pos + id_length], 'utf-8')
+            pos += id_length
+            if value_offset + length > size:
+                raise ValueError(f"card {card_type}/{card_id} runs past the end of the file")
+            offsets[(card_type, card_id)] = (value_offset, length)
+        return offsets
+
+    def get(self, card_type: str, card_id: str) -> Optional[memoryview]:
+        """
+        Get an encoded card without copying it.
+
+        The view is only valid until the snapshot is closed.
+
+        Returns:
+            Optional[memoryview]: The encoded card, or None if it isn't in the snapshot
+        """
+        location = self._offsets.get((card_type, card_id))
+        if location is None:
+            return None
+        return self._buffer[location[0]:location[0] + location[1]]
+
+    def load(self, card_type: str, card_id: str) -> Optional[Dict]:
+        """Decode a card, or return None if it isn't in the snapshot."""
+        data = self.get(card_type, card_id)
+        return decode_card(data) if data is not None else None
+
+    def items(self, card_type: Optional[str] = None) -> Iterator[Tuple[str, str, memoryview]]:
+        """Yield ``(card_type, card_id, encoded card)`` in file order."""
+        for (ctype, card_id), (offset, length) in self._offsets.items():
+            if card_type is None or ctype == card_type:
+                yield ctype, card_id, self._buffer[offset:offset + length]
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def close(self) -> None:
+        """Unmap the snapshot."""
+        try:
+            self._buffer.release()
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view from get(); the mapping is freed
+            # once the last one is gone
+            logger.warning(f"Card snapshot {self.path} closed with views still in use")
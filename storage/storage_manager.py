@@ -1,27 +1,68 @@
-from typing import Dict, Any, List, Optional, Type
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Type, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+import hashlib
 import os
+import tempfile
 from cards.base_card import BaseCard
 from cards.event_card import EventCard
 from cards.person_card import PersonCard
 from cards.place_card import PlaceCard
 from cards.memory_card import MemoryCard
 from cards.time_period_card import TimePeriodCard
+from storage.card_index import CardIndex
+from storage.search_index import SearchIndex
+from storage.codecs import CardCodec, get_codec, encode_card, decode_card
+from storage.snapshot import CardSnapshot, write_snapshot
+from storage.card_cache import CardCache
 from utils.logger import get_logger
 import uuid
 
+# Extension of cards written through a codec, and of header-less JSON cards
+CARD_EXTENSION = '.card'
+LEGACY_EXTENSION = '.json'
+
+# Cards live in <type>/<ab>/<cd>/<id>.card, ab and cd being the first hex
+# digits of a hash of the id, so no directory grows beyond a few hundred files
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+
+# Default name of the packed read-only snapshot within the storage directory
+SNAPSHOT_FILENAME = 'cards.snapshot'
+
+# Threads doing file I/O for save_cards, load_cards and delete_cards
+BATCH_WORKERS = 8
+
 class StorageManager:
     """Manages storage of cards in the DROE Core system."""
     
-    def __init__(self, storage_path: str):
+    def __init__(self, storage_path: str, codec: Union[str, CardCodec] = 'json', fsync: bool = True,
+                 cache_size: int = 1024, cache_bytes: int = 32 * 1024 * 1024,
+                 batch_workers: int = BATCH_WORKERS):
         """
         Initialize the storage manager.
         
         Args:
             storage_path (str): Path to the storage directory
+            codec (Union[str, CardCodec]): Codec used to write cards, e.g. 'json'
+                or 'msgpack'; cards written with any registered codec can be read
+            fsync (bool): Flush every card file to disk before it replaces the
+                previous version, so saves survive power loss as well as crashes
+            cache_size (int): Loaded cards kept in memory, 0 to disable the cache
+            cache_bytes (int): Total encoded size of the cards kept in memory
+            batch_workers (int): Threads doing the file I/O of batch operations
         """
         self.storage_path = storage_path
+        self.codec = get_codec(codec) if isinstance(codec, str) else codec
+        self.fsync = fsync
+        self._shard_dirs = set()
+        self.snapshot: Optional[CardSnapshot] = None
+        # Cards saved or deleted through this manager since the snapshot was opened
+        self._snapshot_stale = set()
+        # Loaded cards, validated against the stored card on every hit
+        self.cache = CardCache(cache_size, cache_bytes)
+        self.batch_workers = batch_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.logger = get_logger(__name__)
         self.card_types = {
             'event': EventCard,
@@ -33,12 +74,147 @@ class StorageManager:
         
         # Create storage directory if it doesn't exist
         os.makedirs(storage_path, exist_ok=True)
+        self._init_storage()
+            
+        # Metadata index used to answer list_cards without opening card files
+        self.index = CardIndex(storage_path)
+        # Inverted index used to answer search_cards
+        self.search_index = SearchIndex(storage_path)
+        
+    def _init_storage(self) -> None:
+        """Prepare the on-disk layout of the card files."""
         for card_type in self.card_types.keys():
-            os.makedirs(os.path.join(storage_path, card_type), exist_ok=True)
+            os.makedirs(os.path.join(self.storage_path, card_type), exist_ok=True)
+        
+    def _get_shard_dir(self, card_id: str, card_type: str) -> str:
+        """Get the sharded directory holding a card's file."""
+        digest = hashlib.md5(card_id.encode('utf-8')).hexdigest()
+        shards = [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_DEPTH)]
+        return os.path.join(self.storage_path, card_type, *shards)
         
     def _get_card_path(self, card_id: str, card_type: str) -> str:
         """Get the path to a card's storage file."""
-        return os.path.join(self.storage_path, card_type, f"{card_id}.json")
+        return os.path.join(self._get_shard_dir(card_id, card_type), f"{card_id}{CARD_EXTENSION}")
+        
+    def _get_flat_card_paths(self, card_id: str, card_type: str) -> List[str]:
+        """Get the unsharded paths a card had before the store was re-sharded."""
+        type_path = os.path.join(self.storage_path, card_type)
+        return [os.path.join(type_path, f"{card_id}{extension}")
+                for extension in (CARD_EXTENSION, LEGACY_EXTENSION)]
+        
+    def _find_card_path(self, card_id: str, card_type: str) -> Optional[str]:
+        """Get the path of a stored card's file, or None if it isn't stored."""
+        # Saves always write the sharded path, so it wins over unmigrated copies
+        for path in [self._get_card_path(card_id, card_type)] + self._get_flat_card_paths(card_id, card_type):
+            if os.path.exists(path):
+                return path
+        return None
+        
+    def _read_card_file(self, card_id: str, card_type: str) -> Optional[bytes]:
+        """
+        Read a stored card's file, or return None if it isn't stored.
+        
+        The sharded path is tried again last: a migration creates it before
+        removing the flat copy, so a card moved between the first attempts is
+        found there.
+        """
+        sharded = self._get_card_path(card_id, card_type)
+        for path in [sharded] + self._get_flat_card_paths(card_id, card_type) + [sharded]:
+            try:
+                with open(path, 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                continue
+        return None
+        
+    def _card_stamp(self, card_id: str, card_type: str) -> Optional[tuple]:
+        """
+        Describe the stored version of a card, or return None if it isn't stored.
+        
+        Any rewrite of the card file, by this process or another one, changes
+        its inode, mtime or size and therefore the stamp.
+        """
+        for path in [self._get_card_path(card_id, card_type)] + self._get_flat_card_paths(card_id, card_type):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            return path, stat.st_ino, stat.st_mtime_ns, stat.st_size
+        return None
+        
+    def _write_card_data(self, card_id: str, card_type: str, data: bytes) -> None:
+        """Store an encoded card, replacing any previous version."""
+        self._atomic_write(self._get_card_path(card_id, card_type), data)
+        
+        # The sharded file supersedes any unmigrated or legacy-format copy
+        self._remove_flat_copies(card_id, card_type)
+        
+    def _delete_card_data(self, card_id: str, card_type: str) -> bool:
+        """Remove a stored card; returns False if it wasn't stored."""
+        if self._find_card_path(card_id, card_type) is None:
+            return False
+        for path in [self._get_card_path(card_id, card_type)] + self._get_flat_card_paths(card_id, card_type):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return True
+        
+    def _remove_flat_copies(self, card_id: str, card_type: str) -> None:
+        for path in self._get_flat_card_paths(card_id, card_type):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        
+    def _write_temp(self, directory: str, data: bytes) -> str:
+        """Write data to a new temporary file in directory and return its path."""
+        if directory not in self._shard_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._shard_dirs.add(directory)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
+        
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        """
+        Replace a file atomically: readers see the old or the new version,
+        never a partial one, even if the process dies mid-write.
+        """
+        tmp_path = self._write_temp(os.path.dirname(path), data)
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        
+    def _prepare_card(self, card: BaseCard) -> Tuple[str, Dict[str, Any], bytes]:
+        """Validate and encode a card; returns its type, dictionary and encoded form."""
+        # Get card type from class name
+        card_type = card.__class__.__name__.lower().replace('card', '')
+        if card_type not in self.card_types:
+            raise ValueError(f"Unsupported card type: {type(card)}")
+            
+        # Ensure card has an ID
+        if not card.id:
+            card.id = str(uuid.uuid4())
+            
+        # Convert card to dictionary
+        card_dict = card.to_dict()
+        return card_type, card_dict, encode_card(card_dict, self.codec)
+        
+    def _written(self, card_id: str, card_type: str) -> None:
+        """Stop serving a card from the snapshot and cache once it changed."""
+        self._snapshot_stale.add((card_type, card_id))
+        self.cache.invalidate((card_type, card_id))
         
     def save_card(self, card: BaseCard) -> None:
         """
@@ -48,27 +224,151 @@ class StorageManager:
             card (BaseCard): The card to save
         """
         try:
-            # Get card type from class name
-            card_type = card.__class__.__name__.lower().replace('card', '')
-            if card_type not in self.card_types:
-                raise ValueError(f"Unsupported card type: {type(card)}")
-                
-            # Ensure card has an ID
-            if not card.id:
-                card.id = str(uuid.uuid4())
-                
-            # Convert card to dictionary
-            card_dict = card.to_dict()
+            card_type, card_dict, data = self._prepare_card(card)
             
             # Save to file
-            card_path = self._get_card_path(card.id, card_type)
-            with open(card_path, 'w') as f:
-                json.dump(card_dict, f, indent=2)
+            self._write_card_data(card.id, card_type, data)
+            self._written(card.id, card_type)
+                
+            self.index.upsert(card_type, card_dict)
+            self.search_index.upsert(card_type, card_dict)
                 
         except Exception as e:
             self.logger.error(f"Error saving card: {str(e)}")
             raise
         
+    @property
+    def _batch_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.batch_workers, thread_name_prefix="storage-batch")
+        return self._executor
+        
+    def _fsync_directory(self, directory: str) -> None:
+        """Make the renames in a directory durable; not supported on every platform."""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+        
+    def _write_card_batch(self, items: List[Tuple[str, str, bytes]]) -> List[Optional[Exception]]:
+        """
+        Store several encoded cards; returns each item's error, or None.
+        
+        Temporary files are written and fsynced in parallel, letting the
+        filesystem commit them together, then moved into place in order, so
+        the last of several versions of a card wins. Every directory that
+        received a card is fsynced once at the end.
+        """
+        def write_temp(item):
+            card_id, card_type, data = item
+            path = self._get_card_path(card_id, card_type)
+            return path, self._write_temp(os.path.dirname(path), data)
+            
+        results: List[Optional[Exception]] = [None] * len(items)
+        futures = [self._batch_executor.submit(write_temp, item) for item in items]
+        directories = set()
+        for index, future in enumerate(futures):
+            card_id, card_type, _ = items[index]
+            try:
+                path, tmp_path = future.result()
+            except Exception as e:
+                results[index] = e
+                continue
+            try:
+                os.replace(tmp_path, path)
+                self._remove_flat_copies(card_id, card_type)
+                directories.add(os.path.dirname(path))
+            except OSError as e:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                results[index] = e
+        if self.fsync:
+            for directory in directories:
+                self._fsync_directory(directory)
+        return results
+        
+    def _delete_card_batch(self, keys: List[Tuple[str, str]]) -> List[Union[bool, Exception]]:
+        """Remove several stored cards; returns whether each was stored, or its error."""
+        def delete(key):
+            try:
+                return self._delete_card_data(*key)
+            except Exception as e:
+                return e
+        return list(self._batch_executor.map(delete, keys))
+        
+    def save_cards(self, cards: Iterable[BaseCard]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Save several cards at once.
+        
+        Card files are written by a pool of batch_workers threads with their
+        fsyncs grouped, and the indexes are updated in one transaction each.
+        A card that fails is reported without aborting the others.
+        
+        Args:
+            cards (Iterable[BaseCard]): The cards to save
+            
+        Returns:
+            Tuple[List[str], List[Dict[str, Any]]]: The ids of the saved cards, and
+            an {"index", "id", "error"} entry for every card that wasn't saved
+        """
+        prepared, errors = [], []
+        for index, card in enumerate(cards):
+            try:
+                prepared.append((index, card) + self._prepare_card(card))
+            except Exception as e:
+                errors.append({'index': index, 'id': getattr(card, 'id', None), 'error': str(e)})
+                
+        results = self._write_card_batch([(card.id, card_type, data) for _, card, card_type, _, data in prepared])
+        saved, entries = [], []
+        for (index, card, card_type, card_dict, _), error in zip(prepared, results):
+            if error is not None:
+                errors.append({'index': index, 'id': card.id, 'error': str(error)})
+                continue
+            self._written(card.id, card_type)
+            saved.append(card.id)
+            entries.append((card_type, card_dict))
+            
+        self.index.upsert_many(entries)
+        self.search_index.upsert_many(entries)
+        errors.sort(key=lambda error: error['index'])
+        if errors:
+            self.logger.error(f"Saved {len(saved)} card(s), {len(errors)} failed: {errors[0]['error']}")
+        return saved, errors
+        
+    def load_cards(self, keys: Iterable[Tuple[str, str]]) -> List[Optional[BaseCard]]:
+        """
+        Load several cards at once, reading their files in parallel.
+        
+        Args:
+            keys (Iterable[Tuple[str, str]]): ``(card_id, card_type)`` pairs
+            
+        Returns:
+            List[Optional[BaseCard]]: The card for each key, None where it is
+            missing or can't be read
+        """
+        def load(chunk):
+            cards = []
+            for card_id, card_type in chunk:
+                try:
+                    cards.append(self.load_card(card_id, card_type))
+                except Exception as e:
+                    self.logger.error(f"Error loading card {card_type}/{card_id}: {str(e)}")
+                    cards.append(None)
+            return cards
+            
+        # One contiguous chunk per worker: handing out single cards costs
+        # more in thread hand-offs than reading a cached file does
+        keys = list(keys)
+        size = max(1, -(-len(keys) // self.batch_workers))
+        chunks = [keys[start:start + size] for start in range(0, len(keys), size)]
+        return [card for cards in self._batch_executor.map(load, chunks) for card in cards]
+        
     def load_card(self, card_id: str, card_type: str) -> Optional[BaseCard]:
         """
         Load a card from storage.
@@ -83,20 +383,48 @@ class StorageManager:
         if card_type not in self.card_types:
             raise ValueError(f"Unsupported card type: {card_type}")
             
-        card_path = self._get_card_path(card_id, card_type)
+        key = (card_type, card_id)
+        card_class = self.card_types[card_type]
+        if self.snapshot is not None and key not in self._snapshot_stale:
+            data = self.snapshot.get(card_type, card_id)
+            if data is not None:
+                return card_class.from_dict(decode_card(data))
+        
+        # The stamp is taken before reading, so a card rewritten in between
+        # is cached under a stamp that no longer matches and gets reloaded
+        stamp = None
+        if self.cache.enabled:
+            stamp = self._card_stamp(card_id, card_type)
+            if stamp is not None:
+                card = self.cache.get(key, stamp)
+                if card is not None:
+                    return card
+        
+        data = self._read_card_file(card_id, card_type)
         
-        if not os.path.exists(card_path):
+        if data is None:
             self.logger.warning(f"Card {card_id} not found in storage")
             return None
             
-        with open(card_path, 'r') as f:
-            card_data = json.load(f)
-            
-        # Get card class
-        card_class = self.card_types[card_type]
+        card = card_class.from_dict(decode_card(data))
+        if stamp is not None:
+            self.cache.put(key, stamp, card, len(data))
+        return card
+        
+    def card_exists(self, card_id: str, card_type: str) -> bool:
+        """
+        Check whether a card is stored.
         
-        # Create card instance
-        return card_class.from_dict(card_data)
+        Args:
+            card_id (str): The ID of the card
+            card_type (str): The type of the card
+            
+        Returns:
+            bool: True if the card is in storage
+        """
+        if card_type not in self.card_types:
+            return False
+        return self._find_card_path(card_id, card_type) is not None
         
     def delete_card(self, card_id: str, card_type: str) -> bool:
         """
@@ -112,56 +440,286 @@ class StorageManager:
         if card_type not in self.card_types:
             raise ValueError(f"Unsupported card type: {card_type}")
             
-        card_path = self._get_card_path(card_id, card_type)
-        
-        if not os.path.exists(card_path):
+        self._snapshot_stale.add((card_type, card_id))
+        deleted = self._delete_card_data(card_id, card_type)
+        self.cache.invalidate((card_type, card_id))
+        if not deleted:
             self.logger.warning(f"Card {card_id} not found in storage")
             return False
             
-        os.remove(card_path)
+        self.index.remove(card_id, card_type)
+        self.search_index.remove(card_id, card_type)
         return True
         
+    def delete_cards(self, keys: Iterable[Tuple[str, str]]) -> List[bool]:
+        """
+        Delete several cards at once.
+        
+        Args:
+            keys (Iterable[Tuple[str, str]]): ``(card_id, card_type)`` pairs
+            
+        Returns:
+            List[bool]: For each key, True if the card was deleted
+        """
+        keys = [tuple(key) for key in keys]
+        valid = list(dict.fromkeys(key for key in keys if key[1] in self.card_types))
+        for card_id, card_type in valid:
+            self._snapshot_stale.add((card_type, card_id))
+        results = dict(zip(valid, self._delete_card_batch(valid)))
+        
+        deleted = []
+        for card_id, card_type in keys:
+            if card_type not in self.card_types:
+                self.logger.error(f"Unsupported card type: {card_type}")
+                continue
+            self.cache.invalidate((card_type, card_id))
+            result = results[(card_id, card_type)]
+            if isinstance(result, Exception):
+                self.logger.error(f"Error deleting card {card_type}/{card_id}: {str(result)}")
+            elif result:
+                deleted.append((card_id, card_type))
+                
+        self.index.remove_many(deleted)
+        self.search_index.remove_many(deleted)
+        deleted = set(deleted)
+        return [key in deleted for key in keys]
+        
     def list_cards(self, card_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all cards of a specific type.
         
+        Answers from the metadata index, building it from disk the first
+        time it is needed.
+        
         Args:
             card_type (Optional[str]): The type of cards to list
             
         Returns:
             List[Dict[str, Any]]: List of card metadata
         """
-        cards = []
+        if not self.index.is_built:
+            self.rebuild_index()
+            
         types_to_list = [card_type] if card_type else self.card_types.keys()
+        return self.index.list(ctype for ctype in types_to_list if ctype in self.card_types)
+        
+    def search_cards(self, query: str, card_type: Optional[str] = None,
+                     limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Search cards by title, description and metadata.
+        
+        Args:
+            query (str): The search query
+            card_type (Optional[str]): The type of cards to search
+            limit (int): Maximum number of results
+            
+        Returns:
+            List[Dict[str, Any]]: Matching card metadata ranked by relevance
+        """
+        if not self.search_index.is_built:
+            self.rebuild_index()
+            
+        types_to_search = [card_type] if card_type else self.card_types.keys()
+        return self.search_index.search(
+            query,
+            [ctype for ctype in types_to_search if ctype in self.card_types],
+            limit=limit
+        )
+        
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the metadata and search indexes by scanning every card file on disk.
+        
+        Returns:
+            int: Number of indexed cards
+        """
+        entries = list(self._iter_stored_cards(self.card_types.keys()))
+        self.search_index.rebuild(entries)
+        return self.index.rebuild(entries)
+        
+    def _iter_card_files(self, card_type: str):
+        """
+        Yield ``(card_id, path)`` for every card file of a type.
+        
+        A card with both a sharded and an unmigrated flat copy is yielded once,
+        from the sharded copy.
+        """
+        type_path = os.path.join(self.storage_path, card_type)
+        if not os.path.exists(type_path):
+            return
+        
+        def card_files(directory):
+            for entry in os.scandir(directory):
+                stem, extension = os.path.splitext(entry.name)
+                if extension in (CARD_EXTENSION, LEGACY_EXTENSION) and entry.is_file():
+                    yield stem, extension, entry.path
+        
+        def shard_dirs(directory, depth):
+            for entry in os.scandir(directory):
+                if entry.is_dir() and len(entry.name) == SHARD_WIDTH:
+                    if depth == 1:
+                        yield entry.path
+                    else:
+                        yield from shard_dirs(entry.path, depth - 1)
         
-        for ctype in types_to_list:
-            if ctype not in self.card_types:
+        # List flat files left from before sharding ahead of the shards: a card
+        # a concurrent migration moves after this listing is then found either
+        # in its shard or by the fallback read, and never slips between the two.
+        # .card copies win over legacy .json ones.
+        flat = sorted(card_files(type_path), key=lambda item: item[1] != CARD_EXTENSION)
+        
+        seen = set()
+        for shard_dir in shard_dirs(type_path, SHARD_DEPTH):
+            for card_id, extension, path in card_files(shard_dir):
+                seen.add(card_id)
+                yield card_id, path
+        
+        for card_id, extension, path in flat:
+            if card_id not in seen:
+                seen.add(card_id)
+                yield card_id, path
+        
+    def _iter_card_data(self, card_types):
+        """Yield ``(card_type, card_id, encoded card)`` for every stored card."""
+        for ctype in card_types:
+            for card_id, path in self._iter_card_files(ctype):
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    # Moved by a concurrent migration after the shards were listed
+                    data = self._read_card_file(card_id, ctype)
+                    if data is None:
+                        continue
+                yield ctype, card_id, data
+        
+    def _iter_stored_cards(self, card_types):
+        """Yield ``(card_type, card_data)`` for every readable stored card."""
+        for ctype, card_id, data in self._iter_card_data(card_types):
+            try:
+                yield ctype, decode_card(data)
+            except Exception as e:
+                self.logger.error(f"Error loading card {ctype}/{card_id}: {str(e)}")
                 continue
-                
-            type_path = os.path.join(self.storage_path, ctype)
+        
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get the hit and miss counters of the card cache.
+        
+        Returns:
+            Dict[str, Any]: hits, misses, hit_rate, entries and bytes
+        """
+        return self.cache.stats()
+        
+    def write_snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Pack every stored card into a read-only snapshot file.
+        
+        Args:
+            path (Optional[str]): Where to write it, by default SNAPSHOT_FILENAME
+                in the storage directory
+            
+        Returns:
+            int: Number of cards in the snapshot
+        """
+        path = path or os.path.join(self.storage_path, SNAPSHOT_FILENAME)
+        count = write_snapshot(path, self._iter_card_data(self.card_types.keys()), fsync=self.fsync)
+        self.logger.info(f"Wrote snapshot of {count} card(s) to {path}")
+        return count
+        
+    def open_snapshot(self, path: Optional[str] = None) -> None:
+        """
+        Serve load_card from a memory-mapped snapshot.
+        
+        Meant for read-heavy workers: cards are decoded straight from the
+        mapping without opening their files. Cards saved or deleted through
+        this manager afterwards bypass the snapshot, and cards missing from
+        it are read from the store, but changes made by other processes are
+        only seen once a new snapshot is written and opened.
+        
+        Args:
+            path (Optional[str]): The snapshot, by default SNAPSHOT_FILENAME in
+                the storage directory
+            
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        snapshot = CardSnapshot(path or os.path.join(self.storage_path, SNAPSHOT_FILENAME))
+        self.close_snapshot()
+        self.snapshot = snapshot
+        self._snapshot_stale = set()
+        
+    def close_snapshot(self) -> None:
+        """Stop serving reads from the snapshot and unmap it."""
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        
+    def migrate_layout(self) -> int:
+        """
+        Move unsharded card files into the sharded layout.
+        
+        Safe to run while the store is in use: each card is copied to its
+        sharded path before its flat file is removed, so it stays readable
+        throughout, and a card saved meanwhile is never overwritten by the
+        older flat copy. Files are moved byte for byte; legacy JSON cards
+        keep their format until they are next saved.
+        
+        Returns:
+            int: Number of cards moved
+        """
+        moved = 0
+        for card_type in self.card_types:
+            type_path = os.path.join(self.storage_path, card_type)
             if not os.path.exists(type_path):
                 continue
-                
-            for filename in os.listdir(type_path):
-                if not filename.endswith('.json'):
+            # A flat .card is newer than a legacy .json of the same card, so it goes first
+            entries = sorted(os.scandir(type_path), key=lambda entry: not entry.name.endswith(CARD_EXTENSION))
+            for entry in entries:
+                card_id, extension = os.path.splitext(entry.name)
+                if extension not in (CARD_EXTENSION, LEGACY_EXTENSION) or not entry.is_file():
                     continue
-                    
-                with open(os.path.join(type_path, filename), 'r') as f:
-                    try:
-                        data = json.load(f)
-                        cards.append({
-                            'id': data.get('id'),
-                            'title': data.get('title'),
-                            'description': data.get('description'),
-                            'type': ctype,
-                            'created_at': data.get('created_at'),
-                            'updated_at': data.get('updated_at')
-                        })
-                    except Exception as e:
-                        self.logger.error(f"Error loading card {filename}: {str(e)}")
-                        continue
-                        
-        return cards
+                try:
+                    with open(entry.path, 'rb') as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    continue
+                
+                target = self._get_card_path(card_id, card_type)
+                tmp_path = self._write_temp(os.path.dirname(target), data)
+                try:
+                    # Create the sharded file only if no save got there first
+                    os.link(tmp_path, target)
+                    moved += 1
+                except FileExistsError:
+                    pass
+                except OSError:
+                    # No hard links on this filesystem; fall back to a check
+                    # that a save racing it could still lose
+                    if not os.path.exists(target):
+                        os.replace(tmp_path, target)
+                        moved += 1
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        
+        if moved:
+            self.logger.info(f"Moved {moved} card(s) into the sharded layout")
+        return moved
+        
+    def close(self) -> None:
+        """Close the index databases and the snapshot, and stop the batch threads."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.close_snapshot()
+        self.index.close()
+        self.search_index.close()
         
     def get_card_type(self, card: BaseCard) -> str:
         """
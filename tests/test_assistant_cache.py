@@ -0,0 +1,75 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from services.openai_service import OpenAIService
+from utils.assistant_cache import AssistantIdCache
+
+class TestAssistantIdCache(unittest.TestCase):
+    """Tests for lazy assistant bootstrap and the on-disk ID cache."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = AssistantIdCache(os.path.join(self.temp_dir, 'assistants.json'), ttl=60)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_resolves_once_and_shares_across_instances(self):
+        """A resolved ID is reused by other cache instances (other processes)."""
+        resolve = MagicMock(return_value='asst_123')
+        self.assertEqual(self.cache.get_or_resolve('Interviewer', resolve), 'asst_123')
+
+        other = AssistantIdCache(self.cache.path, ttl=60)
+        self.assertEqual(other.get_or_resolve('Interviewer', resolve), 'asst_123')
+        resolve.assert_called_once()
+
+    def test_expired_entries_are_resolved_again(self):
+        """Entries older than the TTL are ignored."""
+        self.cache.get_or_resolve('Interviewer', lambda: 'asst_old')
+        self.cache.ttl = -1
+        self.assertIsNone(self.cache.get('Interviewer'))
+        self.assertEqual(self.cache.get_or_resolve('Interviewer', lambda: 'asst_new'), 'asst_new')
+
+    def test_default_path_is_in_data_directory(self):
+        """The default cache lives in the data directory, created on first write."""
+        data_dir = os.path.join(self.temp_dir, 'instance')
+        with patch('utils.assistant_cache.DATA_DIR', data_dir), \
+                patch.dict(os.environ, {'ASSISTANT_ID_CACHE': ''}):
+            cache = AssistantIdCache()
+        self.assertEqual(cache.path, os.path.join(data_dir, '.assistant_cache.json'))
+        self.assertFalse(os.path.exists(data_dir))
+
+        cache.get_or_resolve('Interviewer', lambda: 'asst_123')
+        self.assertTrue(os.path.exists(cache.path))
+
+    def test_invalidate(self):
+        """Invalidated names are looked up again."""
+        self.cache.get_or_resolve('Interviewer', lambda: 'asst_123')
+        self.cache.invalidate('Interviewer')
+        self.assertIsNone(self.cache.get('Interviewer'))
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_service_construction_is_network_free(self):
+        """Creating the service neither needs a key nor touches the network."""
+        with patch('services.openai_service.OpenAI') as client_class:
+            service = OpenAIService(assistant_cache=self.cache)
+        client_class.assert_not_called()
+        with self.assertRaises(ValueError):
+            service.client
+
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'sk-test'}, clear=True)
+    def test_service_uses_cached_assistant_id(self):
+        """A cached assistant ID is used without listing assistants."""
+        self.cache.get_or_resolve(OpenAIService.assistant_name, lambda: 'asst_cached')
+        with patch('services.openai_service.OpenAI') as client_class:
+            service = OpenAIService(assistant_cache=self.cache)
+            self.assertEqual(service.assistant_id, 'asst_cached')
+        client_class.return_value.beta.assistants.list.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from cards.base_card import BaseCard
+from cards.event_card import EventCard
+from cards.memory_card import MemoryCard
+from core.droe_core import DROECore
+
+class UnregisteredCard(BaseCard):
+    """Card type the storage manager doesn't know."""
+
+class TestBatchStorage(unittest.TestCase):
+    """Tests for save_cards, load_cards and delete_cards on both storage backends."""
+
+    backend = 'files'
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.core = DROECore(self.temp_dir, storage_backend=self.backend)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.core.storage_manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _cards(self, count: int):
+        return [MemoryCard(title=f"Memory {i}", description=f"Description {i}") for i in range(count)]
+
+    def test_round_trip(self):
+        """Test saving, loading and deleting a batch of mixed card types."""
+        cards = self._cards(20) + [EventCard(title="Wedding", description="June wedding")]
+        saved_ids, errors = self.core.save_cards(cards)
+        self.assertEqual(saved_ids, [card.id for card in cards])
+        self.assertEqual(errors, [])
+
+        keys = [(card.id, self.core.storage_manager.get_card_type(card)) for card in cards]
+        loaded = self.core.load_cards(keys + [('missing', 'memory')])
+        self.assertEqual([card.title for card in loaded[:-1]], [card.title for card in cards])
+        self.assertIsNone(loaded[-1])
+        self.assertEqual(len(self.core.list_cards()), 21)
+        self.assertEqual(self.core.search_cards("wedding")[0]['id'], cards[-1].id)
+
+        results = self.core.delete_cards(keys[:5] + [('missing', 'memory'), (cards[0].id, 'nope')])
+        self.assertEqual(results, [True] * 5 + [False, False])
+        self.assertEqual(len(self.core.list_cards()), 16)
+        self.assertIsNone(self.core.load_card(cards[0].id, 'memory'))
+        self.assertEqual(self.core.load_card(cards[5].id, 'memory').title, "Memory 5")
+
+    def test_per_item_errors(self):
+        """Test that a bad card is reported without failing the batch."""
+        cards = self._cards(3)
+        bad = UnregisteredCard(title="Odd", description="Unknown type")
+        saved_ids, errors = self.core.save_cards([cards[0], bad, cards[1], cards[2]])
+        self.assertEqual(saved_ids, [card.id for card in cards])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['index'], 1)
+        self.assertEqual(errors[0]['id'], bad.id)
+        self.assertIn("Unsupported card type", errors[0]['error'])
+
+    def test_last_version_wins(self):
+        """Test that the last of several versions of a card in one batch is kept."""
+        card = self._cards(1)[0]
+        self.core.load_card(card.id, 'memory')
+        first = MemoryCard.from_dict(card.to_dict())
+        card.title = "Second"
+        self.core.save_cards([first, card])
+        self.assertEqual(self.core.load_card(card.id, 'memory').title, "Second")
+        self.assertEqual(self.core.list_cards('memory')[0]['title'], "Second")
+
+    def test_storage_errors_are_logged(self):
+        """Test that a failing backend is logged rather than raised, like the single-card methods."""
+        keys = [('a', 'memory'), ('b', 'memory')]
+        manager = self.core.storage_manager
+        with patch.object(manager, 'load_cards', side_effect=OSError("disk gone")), \
+                self.assertLogs(level='ERROR'):
+            self.assertEqual(self.core.load_cards(iter(keys)), [None, None])
+        with patch.object(manager, 'delete_cards', side_effect=OSError("disk gone")), \
+                self.assertLogs(level='ERROR'):
+            self.assertEqual(self.core.delete_cards(iter(keys)), [False, False])
+
+class TestBatchSegmentStorage(TestBatchStorage):
+    """The same batch tests on the segment backend."""
+
+    backend = 'segments'
+
+if __name__ == '__main__':
+    unittest.main()
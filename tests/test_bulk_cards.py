@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from flask import Flask
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, Card
+from db.response_cache import response_cache
+from db.utils import save_cards
+from routes.cards import cards_bp
+
+class TestBulkCards(unittest.TestCase):
+    """Tests for saving batches of cards."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.db = self.Session()
+        self.db.add(Card(id="existing", type='event', title="Existing",
+                         session_id="session", created_at=datetime.now()))
+        self.db.commit()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.db.close()
+
+    def test_saves_valid_cards_and_reports_the_rest(self):
+        """Invalid cards are reported by index without aborting the batch."""
+        cards = [
+            {'id': 'a', 'type': 'event', 'title': 'Trip', 'date': '2020-05-01T10:00:00Z'},
+            {'id': 'b', 'type': 'event'},
+            {'type': 'person', 'title': 'Sam', 'people': ['Sam']},
+            {'id': 'a', 'type': 'event', 'title': 'Again'},
+            {'id': 'existing', 'type': 'event', 'title': 'Existing'},
+            {'id': 'c', 'type': 'event', 'title': 'Bad date', 'date': 'someday'},
+            'not a card'
+        ]
+        saved, errors = save_cards(self.db, cards, "session")
+
+        self.assertEqual(len(saved), 2)
+        self.assertEqual(saved[0], 'a')
+        self.assertEqual([error['index'] for error in errors], [1, 3, 4, 5, 6])
+        self.assertEqual(self.db.query(Card).filter(Card.session_id == "session").count(), 3)
+        self.assertEqual(self.db.get(Card, 'a').date.year, 2020)
+
+    def test_single_commit(self):
+        """A batch is written with one commit."""
+        commits = []
+        event.listen(self.engine, 'commit', lambda conn: commits.append(True))
+        saved, _ = save_cards(self.db, [
+            {'type': 'event', 'title': f"Card {i}"} for i in range(200)
+        ], "session")
+        self.assertEqual(len(saved), 200)
+        self.assertEqual(len(commits), 1)
+
+    def test_invalidates_cached_responses(self):
+        """Saving a batch bumps the session's response version once."""
+        version = response_cache.version("bulk-session")
+        save_cards(self.db, [{'type': 'event', 'title': 'One'}, {'type': 'event', 'title': 'Two'}],
+                   "bulk-session")
+        self.assertEqual(response_cache.version("bulk-session"), version + 1)
+
+    def test_bulk_endpoint(self):
+        """POST /cards/bulk saves the batch and reports errors."""
+        app = Flask(__name__)
+        app.register_blueprint(cards_bp)
+        client = app.test_client()
+        client.set_cookie('session', 'session')
+
+        with patch('routes.cards.SessionLocal', self.Session):
+            response = client.post('/cards/bulk', json={'cards': [
+                {'type': 'event', 'title': 'Trip'},
+                {'type': 'event'}
+            ]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json['saved']), 1)
+            self.assertEqual(response.json['errors'][0]['index'], 1)
+            self.assertFalse(response.json['success'])
+
+            self.assertEqual(client.post('/cards/bulk', json={'cards': 'x'}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
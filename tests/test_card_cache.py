@@ -0,0 +1,121 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from cards.media import Media, MediaType
+from cards.memory_card import MemoryCard
+from storage.card_cache import CardCache
+from storage.codecs import encode_card, get_codec
+from storage.storage_manager import StorageManager
+
+class TestCardCache(unittest.TestCase):
+    """Tests for the LRU card cache."""
+
+    def _card(self, title: str) -> MemoryCard:
+        return MemoryCard(title=title, description=f"{title} description",
+                          media=[Media(id=1, file_path="a.jpg", type=MediaType.IMAGE)])
+
+    def test_stamp_mismatch_is_a_miss(self):
+        """Test that entries are only served at the stamp they were read at."""
+        cache = CardCache(max_entries=10)
+        card = self._card("Lake")
+        cache.put(('memory', card.id), 1, card, 100)
+        self.assertEqual(cache.get(('memory', card.id), 1).title, "Lake")
+        self.assertIsNone(cache.get(('memory', card.id), 2))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_copies_are_independent(self):
+        """Test that modifying a served card leaves the cached one untouched."""
+        cache = CardCache(max_entries=10)
+        card = self._card("Lake")
+        cache.put(('memory', card.id), 1, card, 100)
+        card.title = "Changed after put"
+
+        served = cache.get(('memory', card.id), 1)
+        served.media[0].description = "edited"
+        served.metadata['edited'] = True
+        again = cache.get(('memory', card.id), 1)
+        self.assertEqual(again.title, "Lake")
+        self.assertEqual(again.media[0].description, "")
+        self.assertEqual(again.metadata, {})
+
+    def test_limits(self):
+        """Test eviction by entry count and by bytes, least recently used first."""
+        cache = CardCache(max_entries=2, max_bytes=250)
+        cards = [self._card(f"Card {i}") for i in range(3)]
+        cache.put(('memory', cards[0].id), 1, cards[0], 100)
+        cache.put(('memory', cards[1].id), 1, cards[1], 100)
+        cache.get(('memory', cards[0].id), 1)
+        cache.put(('memory', cards[2].id), 1, cards[2], 100)
+        self.assertIsNone(cache.get(('memory', cards[1].id), 1))
+        self.assertIsNotNone(cache.get(('memory', cards[0].id), 1))
+
+        cache.put(('memory', cards[1].id), 1, cards[1], 200)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], 250)
+
+        cache.put(('memory', 'huge'), 1, cards[0], 1000)
+        self.assertIsNone(cache.get(('memory', 'huge'), 1))
+
+class TestStorageManagerCache(unittest.TestCase):
+    """Tests for the card cache in StorageManager."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage_manager = StorageManager(self.temp_dir, fsync=False)
+        self.card = MemoryCard(title="Lake", description="Summer at the lake")
+        self.storage_manager.save_card(self.card)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.storage_manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_repeated_loads_hit(self):
+        """Test that loading the same card again is served from the cache."""
+        self.storage_manager.load_card(self.card.id, 'memory')
+        loaded = self.storage_manager.load_card(self.card.id, 'memory')
+        self.assertEqual(loaded.title, "Lake")
+        stats = self.storage_manager.cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_save_and_delete_invalidate(self):
+        """Test that writes through the manager are never hidden by the cache."""
+        self.storage_manager.load_card(self.card.id, 'memory')
+        self.card.title = "Edited"
+        self.storage_manager.save_card(self.card)
+        self.assertEqual(self.storage_manager.load_card(self.card.id, 'memory').title, "Edited")
+
+        self.storage_manager.delete_card(self.card.id, 'memory')
+        self.assertIsNone(self.storage_manager.load_card(self.card.id, 'memory'))
+
+    def test_external_change_is_detected(self):
+        """Test that a card file rewritten by another process is reloaded."""
+        self.storage_manager.load_card(self.card.id, 'memory')
+        data = self.card.to_dict()
+        data['title'] = "Rewritten elsewhere"
+        path = self.storage_manager._find_card_path(self.card.id, 'memory')
+        tmp_path = path + '.other'
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_card(data, get_codec('json')))
+        os.replace(tmp_path, path)
+
+        self.assertEqual(self.storage_manager.load_card(self.card.id, 'memory').title, "Rewritten elsewhere")
+
+    def test_disabled(self):
+        """Test that a cache size of 0 reads the store every time."""
+        manager = StorageManager(self.temp_dir, fsync=False, cache_size=0)
+        try:
+            manager.load_card(self.card.id, 'memory')
+            manager.load_card(self.card.id, 'memory')
+            self.assertEqual(manager.cache_stats()['hits'], 0)
+            self.assertEqual(manager.cache_stats()['entries'], 0)
+        finally:
+            manager.close()
+
+if __name__ == '__main__':
+    unittest.main()
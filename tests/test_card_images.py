@@ -0,0 +1,144 @@
+import unittest
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from cards.base_card import DEFAULT_IMAGE_PATH
+from cards.memory_card import MemoryCard
+from core.droe_core import DROECore
+from utils.image_resolver import ImageResolver
+
+class TestCardImages(unittest.TestCase):
+    """Tests for deferred default image generation."""
+
+    def _generator(self, url: str = "https://example.com/image.png") -> MagicMock:
+        generator = MagicMock()
+        generator.generate_image.return_value = url
+        return generator
+
+    @patch('cards.base_card.ImageGenerator')
+    def test_construction_does_not_generate(self, image_generator):
+        """Building or deserializing cards never touches the image API."""
+        memory = MemoryCard(title="Lake", description="Swimming")
+        MemoryCard.from_dict(memory.to_dict())
+
+        image_generator.assert_not_called()
+        self.assertTrue(memory.image_pending)
+
+    def test_resolve_image(self):
+        """Resolving sets the image path once and keeps it."""
+        generator = self._generator()
+        memory = MemoryCard(title="Lake", description="Swimming")
+
+        self.assertEqual(memory.resolve_image(generator), "https://example.com/image.png")
+        self.assertFalse(memory.image_pending)
+        memory.resolve_image(generator)
+        generator.generate_image.assert_called_once_with(memory.image_prompt())
+
+    def test_resolve_image_falls_back_to_default(self):
+        """Generation errors leave the card with the default image."""
+        generator = MagicMock()
+        generator.generate_image.side_effect = RuntimeError("billing limit")
+        memory = MemoryCard(title="Lake", description="Swimming")
+
+        self.assertEqual(memory.resolve_image(generator), DEFAULT_IMAGE_PATH)
+
+    def test_existing_image_is_kept(self):
+        """Cards with an image path are never regenerated."""
+        generator = self._generator()
+        memory = MemoryCard(title="Lake", description="Swimming", image_path="/images/lake.jpg")
+
+        self.assertEqual(memory.resolve_image(generator), "/images/lake.jpg")
+        generator.generate_image.assert_not_called()
+
+    def test_background_resolution_is_saved(self):
+        """DROECore persists images resolved in the background."""
+        temp_dir = tempfile.mkdtemp()
+        resolver = ImageResolver(image_generator=self._generator())
+        core = DROECore(storage_path=temp_dir, image_resolver=resolver)
+        try:
+            memory = core.create_memory("Lake", "Swimming")
+            resolver.shutdown(wait=True)
+
+            loaded = core.load_card(memory.id, 'memory')
+            self.assertEqual(loaded.image_path, "https://example.com/image.png")
+        finally:
+            core.storage_manager.close()
+            shutil.rmtree(temp_dir)
+
+    def test_pending_image_resolved_on_load(self):
+        """Cards saved without a resolver get their image once a core with one loads them."""
+        temp_dir = tempfile.mkdtemp()
+        plain = DROECore(storage_path=temp_dir)
+        memory = plain.create_memory("Lake", "Swimming")
+        plain.storage_manager.close()
+
+        resolver = ImageResolver(image_generator=self._generator())
+        core = DROECore(storage_path=temp_dir, image_resolver=resolver)
+        try:
+            core.load_card(memory.id, 'memory')
+            resolver.shutdown(wait=True)
+
+            self.assertEqual(core.load_card(memory.id, 'memory').image_path, "https://example.com/image.png")
+        finally:
+            core.storage_manager.close()
+            shutil.rmtree(temp_dir)
+
+    def test_edit_during_generation_is_kept(self):
+        """An edit saved while the image is generating isn't overwritten by the stale snapshot."""
+        temp_dir = tempfile.mkdtemp()
+        started, release = threading.Event(), threading.Event()
+
+        def generate_image(prompt):
+            started.set()
+            release.wait(5)
+            return "https://example.com/image.png"
+
+        generator = MagicMock()
+        generator.generate_image.side_effect = generate_image
+        resolver = ImageResolver(image_generator=generator)
+        core = DROECore(storage_path=temp_dir, image_resolver=resolver)
+        try:
+            memory = core.create_memory("Lake", "Swimming")
+            self.assertTrue(started.wait(5))
+
+            edited = core.load_card(memory.id, 'memory')
+            edited.title = "Lake Tahoe"
+            edited.image_path = "/images/tahoe.jpg"
+            edited.updated_at = datetime.now() + timedelta(seconds=1)
+            core.save_card(edited)
+            release.set()
+            resolver.shutdown(wait=True)
+
+            stored = core.load_card(memory.id, 'memory')
+            self.assertEqual(stored.title, "Lake Tahoe")
+            self.assertEqual(stored.image_path, "/images/tahoe.jpg")
+        finally:
+            release.set()
+            core.storage_manager.close()
+            shutil.rmtree(temp_dir)
+
+    def test_resolved_image_keeps_unchanged_fields(self):
+        """Only the image path is written onto the stored card."""
+        temp_dir = tempfile.mkdtemp()
+        core = DROECore(storage_path=temp_dir)
+        try:
+            memory = core.create_memory("Lake", "Swimming")
+            stored = core.load_card(memory.id, 'memory')
+            stored.description = "Swimming at dawn"
+            core.save_card(stored)
+
+            memory.image_path = "https://example.com/image.png"
+            core._save_resolved_image(memory)
+
+            loaded = core.load_card(memory.id, 'memory')
+            self.assertEqual(loaded.description, "Swimming at dawn")
+            self.assertEqual(loaded.image_path, "https://example.com/image.png")
+        finally:
+            core.storage_manager.close()
+            shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
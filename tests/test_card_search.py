@@ -0,0 +1,124 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from flask import Flask
+
+from db.card_search import ensure_card_search, search_cards, to_match_query
+from init_db import init_db
+from routes.card_viewer import card_viewer_bp, MAX_SEARCH_LIMIT
+
+class TestCardSearch(unittest.TestCase):
+    """Tests for FTS5 search over the relational card schema."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, 'droecore.db')
+        with redirect_stdout(StringIO()):
+            init_db(db_path)
+        self.conn = sqlite3.connect(db_path)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _add(self, table: str, title: str, description: str) -> int:
+        card_id = self.conn.execute(
+            "INSERT INTO cards (title, description) VALUES (?, ?)", (title, description)
+        ).lastrowid
+        self.conn.execute(f"INSERT INTO {table} (id) VALUES (?)", (card_id,))
+        self.conn.commit()
+        return card_id
+
+    def _ids(self, query: str, **kwargs):
+        return [result['id'] for result in search_cards(self.conn, query, **kwargs)]
+
+    def test_ranking_and_highlighting(self):
+        """Title matches rank first and matches are highlighted."""
+        body = self._add('memories', "Lake trip", "We went swimming all afternoon")
+        title = self._add('memories', "Swimming lessons", "Learning to swim at the lake")
+
+        results = search_cards(self.conn, "swim")
+
+        self.assertEqual([r['id'] for r in results], [title, body])
+        self.assertEqual(results[0]['type'], 'memory')
+        self.assertEqual(results[0]['title_highlight'], "<mark>Swimming</mark> lessons")
+        self.assertIn("<mark>swimming</mark>", results[1]['snippet'])
+
+    def test_triggers_keep_index_in_sync(self):
+        """Updates and deletes of cards are reflected in the index."""
+        card_id = self._add('memories', "First job", "Nervous but excited")
+        self.assertEqual(self._ids("nervous"), [card_id])
+
+        self.conn.execute("UPDATE cards SET description = 'Calm and ready' WHERE id = ?", (card_id,))
+        self.conn.commit()
+        self.assertEqual(self._ids("nervous"), [])
+        self.assertEqual(self._ids("calm"), [card_id])
+
+        self.conn.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+        self.conn.commit()
+        self.assertEqual(self._ids("calm"), [])
+
+    def test_type_filter_and_any_term_prefix(self):
+        """The emotions query finds memories mentioning feelings or emotions."""
+        feeling = self._add('memories', "Graduation", "I was feeling proud")
+        emotion = self._add('memories', "Wedding", "An emotional day")
+        self._add('memories', "Commute", "Took the bus")
+        self._add('events', "Concert", "Felt the bass; feel good music")
+
+        ids = self._ids("feel emotion", card_type='memory', any_term=True, prefix=True)
+        self.assertEqual(sorted(ids), sorted([feeling, emotion]))
+
+        with self.assertRaises(ValueError):
+            search_cards(self.conn, "feel", card_type='unknown')
+
+    def test_existing_cards_are_backfilled(self):
+        """Creating the index on an existing database indexes its cards."""
+        card_id = self._add('places', "Old house", "Blue shutters")
+        self.conn.executescript("""
+            DROP TRIGGER cards_fts_insert;
+            DROP TRIGGER cards_fts_delete;
+            DROP TRIGGER cards_fts_update;
+            DROP TABLE cards_fts;
+        """)
+
+        ensure_card_search(self.conn)
+        self.assertEqual(self._ids("shutters"), [card_id])
+
+    def test_user_input_is_not_fts_syntax(self):
+        """Operators and quotes in the query are treated as plain words."""
+        card_id = self._add('memories', "Road trip", "Drove north AND south")
+        self.assertEqual(self._ids('north" AND (south'), [card_id])
+        self.assertEqual(search_cards(self.conn, '"*()'), [])
+        self.assertEqual(to_match_query("feel emotion", any_term=True, prefix=True), '"feel"* OR "emotion"*')
+
+    def test_search_endpoint_limit(self):
+        """GET /cards/search rejects non-positive limits and caps large ones."""
+        for i in range(3):
+            self._add('memories', f"Picnic {i}", "Sandwiches in the park")
+        app = Flask(__name__)
+        app.register_blueprint(card_viewer_bp)
+        client = app.test_client()
+
+        with patch('routes.card_viewer.get_db', return_value=self.conn), \
+                patch('routes.card_viewer.search_cards', wraps=search_cards) as search:
+            for limit in ('0', '-1', 'many'):
+                response = client.get(f'/cards/search?q=picnic&limit={limit}')
+                self.assertEqual(response.status_code, 400)
+            search.assert_not_called()
+
+            response = client.get('/cards/search?q=picnic&limit=2')
+            self.assertEqual(len(response.get_json()['results']), 2)
+
+            client.get('/cards/search?q=picnic&limit=100000')
+            self.assertEqual(search.call_args.kwargs['limit'], MAX_SEARCH_LIMIT)
+
+if __name__ == '__main__':
+    unittest.main()
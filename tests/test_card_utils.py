@@ -0,0 +1,133 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import MagicMock
+
+from cards.event_card import EventCard
+from cards.memory_card import MemoryCard
+from cards.base_card import DEFAULT_IMAGE_PATH
+from init_db import init_db
+from utils.card_utils import CardUtils, validate_card
+
+class CountingCardUtils(CardUtils):
+    """CardUtils that records every statement it sends to SQLite."""
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self.statements = []
+
+    def get_db(self):
+        conn = super().get_db()
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+class TestCardUtilsLoading(unittest.TestCase):
+    """Tests for batched relationship loading in CardUtils."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'droecore.db')
+        with redirect_stdout(StringIO()):
+            init_db(self.db_path)
+        self.card_utils = CountingCardUtils(self.db_path)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.card_utils.pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    def _seed(self, memories: int) -> None:
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            def card(title):
+                return conn.execute(
+                    "INSERT INTO cards (title, description, created_at) VALUES (?, ?, '2024-01-01 10:00:00')",
+                    (title, f"{title} description")
+                ).lastrowid
+
+            person = card("Sarah")
+            conn.execute("INSERT INTO people (id, relationship) VALUES (?, 'friend')", (person,))
+            place = card("Home")
+            conn.execute("INSERT INTO places (id, latitude, longitude) VALUES (?, 47.6, -122.3)", (place,))
+            event = card("Graduation")
+            conn.execute("INSERT INTO events (id, start_date) VALUES (?, '2022-06-15 00:00:00')", (event,))
+
+            for i in range(memories):
+                memory = card(f"Memory {i}")
+                conn.execute(
+                    "INSERT INTO memories (id, date, emotion, intensity) VALUES (?, '2022-06-15 00:00:00', 'joy', 8)",
+                    (memory,)
+                )
+                conn.execute("INSERT INTO memory_people VALUES (?, ?)", (memory, person))
+                conn.execute("INSERT INTO memory_places VALUES (?, ?)", (memory, place))
+                conn.execute("INSERT INTO memory_events VALUES (?, ?)", (memory, event))
+                media = conn.execute(
+                    "INSERT INTO media (file_path, type, description) VALUES (?, 'image', 'photo')",
+                    (f"photo-{i}.jpg",)
+                ).lastrowid
+                conn.execute("INSERT INTO card_media VALUES (?, 'MemoryCard', ?)", (memory, media))
+        conn.close()
+
+    def test_relationships_are_stitched(self):
+        """Related cards and media are attached to the right card."""
+        self._seed(3)
+        memories = self.card_utils.get_cards_by_type(MemoryCard)
+
+        self.assertEqual([m.title for m in memories], ["Memory 0", "Memory 1", "Memory 2"])
+        for i, memory in enumerate(memories):
+            self.assertEqual([p.title for p in memory.associated_people], ["Sarah"])
+            self.assertEqual(memory.associated_people[0].relationships, ["friend"])
+            self.assertEqual(memory.associated_place.latitude, 47.6)
+            self.assertIsInstance(memory.associated_event, EventCard)
+            self.assertIsNone(memory.associated_time_period)
+            self.assertEqual([m.file_path for m in memory.media], [f"photo-{i}.jpg"])
+
+    def test_query_count_is_constant_per_page(self):
+        """Loading more cards on one page does not add queries."""
+        self._seed(5)
+        self.card_utils.get_cards_by_type(MemoryCard)
+        few = len(self.card_utils.statements)
+
+        self._seed(45)
+        self.card_utils.statements.clear()
+        self.assertEqual(len(self.card_utils.get_cards_by_type(MemoryCard)), 50)
+        self.assertEqual(len(self.card_utils.statements), few)
+
+    def test_pages_bound_the_batch_size(self):
+        """Cards are loaded in page_size batches."""
+        self._seed(12)
+        self.card_utils.page_size = 5
+        pages = list(self.card_utils.iter_cards_by_type(MemoryCard))
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+
+    def test_get_card(self):
+        """A single card is loaded with its relationships."""
+        self._seed(1)
+        memory_id = self.card_utils.get_cards_by_type(MemoryCard)[0].id
+
+        memory = self.card_utils.get_card(memory_id, MemoryCard)
+        self.assertEqual(memory.title, "Memory 0")
+        self.assertEqual(memory.associated_place.title, "Home")
+        self.assertIsNone(self.card_utils.get_card(memory_id, EventCard))
+
+    def test_cards_have_images(self):
+        """Saved and loaded cards carry an image, so they pass validate_card."""
+        memory = MemoryCard(title="Lake", description="Swimming")
+        memory_id = self.card_utils.save_card(memory)
+        self.assertEqual(memory.image_path, DEFAULT_IMAGE_PATH)
+        self.assertTrue(validate_card(memory))
+        self.assertTrue(validate_card(self.card_utils.get_card(memory_id, MemoryCard)))
+
+        resolver = MagicMock()
+        card_utils = CardUtils(self.db_path, image_resolver=resolver)
+        pending = MemoryCard(title="Snow", description="Sledding")
+        card_utils.save_card(pending)
+        resolver.submit.assert_called_once_with(pending)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+
+from cards.event_card import EventCard
+from cards.memory_card import MemoryCard
+from storage.codecs import MAGIC, CardCodec, decode_card, encode_card, get_codec, packb, unpackb
+from storage.storage_manager import StorageManager
+
+class TestCardCodecs(unittest.TestCase):
+    """Tests for the card codec layer."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def _memory(self, title: str) -> MemoryCard:
+        return MemoryCard(title=title, description=f"{title} description",
+                          people=["Ana", "Léo"], emotions=["joy"], intensity=4)
+
+    def test_round_trip(self):
+        """Every codec decodes what it encodes, with a format header."""
+        data = self._memory("Beach").to_dict()
+        for name in ('json', 'msgpack'):
+            encoded = encode_card(data, get_codec(name))
+            self.assertTrue(encoded.startswith(MAGIC))
+            self.assertEqual(decode_card(encoded), data)
+            self.assertEqual(decode_card(memoryview(encoded)), data)
+
+    def test_msgpack_fallback_matches_format(self):
+        """The pure-Python encoder produces standard MessagePack."""
+        self.assertEqual(packb({'a': 1, 'b': [None, True]}), b'\x82\xa1a\x01\xa1b\x92\xc0\xc3')
+        value = {'n': [-1, -200, 70000, 2 ** 40, 1.5], 's': 'x' * 300, 'u': 'é'}
+        self.assertEqual(unpackb(packb(value)), value)
+
+    def test_binary_is_smaller_than_legacy_json(self):
+        """Compact encodings are smaller than the indented JSON files."""
+        data = self._memory("Beach").to_dict()
+        legacy = len(json.dumps(data, indent=2).encode('utf-8'))
+        self.assertLess(len(encode_card(data, get_codec('json'))), legacy)
+        self.assertLess(len(encode_card(data, get_codec('msgpack'))), legacy)
+
+    def test_mixed_codec_store(self):
+        """A store written with several codecs and legacy files loads completely."""
+        legacy = EventCard(title="Graduation", description="Finished school")
+        os.makedirs(os.path.join(self.temp_dir, 'event'))
+        with open(os.path.join(self.temp_dir, 'event', f"{legacy.id}.json"), 'w') as f:
+            json.dump(legacy.to_dict(), f, indent=2)
+
+        json_store = StorageManager(self.temp_dir, codec='json')
+        first = self._memory("First")
+        json_store.save_card(first)
+        json_store.close()
+
+        msgpack_store = StorageManager(self.temp_dir, codec='msgpack')
+        second = self._memory("Second")
+        msgpack_store.save_card(second)
+        try:
+            self.assertEqual(msgpack_store.load_card(first.id, 'memory').title, "First")
+            self.assertEqual(msgpack_store.load_card(second.id, 'memory').people, ["Ana", "Léo"])
+            self.assertEqual(msgpack_store.load_card(legacy.id, 'event').title, "Graduation")
+            self.assertEqual(msgpack_store.rebuild_index(), 3)
+
+            # Re-saving a legacy card replaces its file
+            msgpack_store.save_card(msgpack_store.load_card(legacy.id, 'event'))
+            self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'event', f"{legacy.id}.json")))
+            self.assertEqual(msgpack_store.rebuild_index(), 3)
+
+            self.assertTrue(msgpack_store.delete_card(legacy.id, 'event'))
+            self.assertFalse(msgpack_store.card_exists(legacy.id, 'event'))
+        finally:
+            msgpack_store.close()
+
+    def test_incomplete_codec_cannot_be_created(self):
+        """A codec missing encode or decode fails when it is instantiated, not when it is used."""
+        class EncodeOnly(CardCodec):
+            def encode(self, data):
+                return b''
+
+        with self.assertRaises(TypeError):
+            EncodeOnly()
+        with self.assertRaises(TypeError):
+            CardCodec()
+
+    def test_unknown_codec(self):
+        """Unknown codec names and ids are rejected."""
+        with self.assertRaises(ValueError):
+            get_codec('xml')
+        with self.assertRaises(ValueError):
+            decode_card(MAGIC + b'\xff{}')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+from db.pool import SavepointConnection, SQLitePool, get_pool
+
+class TestSQLitePool(unittest.TestCase):
+    """Tests for the pooled SQLite connection layer."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pool = SQLitePool(os.path.join(self.temp_dir, 'test.db'))
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.commit()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    def _in_thread(self, func):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_connection_is_reused_within_a_thread(self):
+        """A thread gets the same tuned connection on every checkout."""
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            self.assertIs(first, second)
+            self.assertEqual(second.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+    def test_threads_get_their_own_connection(self):
+        """Connections are never shared between threads."""
+        with self.pool.connection() as conn:
+            other = self._in_thread(lambda: id(self.pool.acquire()))
+        self.assertNotEqual(id(conn), other)
+
+    def test_dead_thread_connections_are_closed(self):
+        """Connections of exited threads are closed on the next connect."""
+        conn = self._in_thread(self.pool.acquire)
+        self._in_thread(self.pool.acquire)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_uncommitted_work_is_rolled_back_on_release(self):
+        """Leaving a transaction open behaves like closing the connection."""
+        with self.pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('lost')")
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 0)
+
+    def test_nested_checkout_keeps_outer_transaction(self):
+        """Only the outermost release ends an open transaction."""
+        with self.pool.connection() as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('kept')")
+            with self.pool.connection():
+                pass
+            self.assertTrue(outer.in_transaction)
+            outer.commit()
+
+    def _names(self, conn):
+        return [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")]
+
+    def test_nested_commit_does_not_commit_outer_work(self):
+        """A nested checkout's commit only settles its savepoint; the outer caller decides."""
+        with self.pool.connection() as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('outer')")
+            with self.pool.connection() as inner:
+                self.assertIsInstance(inner, SavepointConnection)
+                inner.execute("INSERT INTO items (name) VALUES ('inner')")
+                inner.commit()
+            self.assertTrue(outer.in_transaction)
+            outer.rollback()
+        with self.pool.connection() as conn:
+            self.assertEqual(self._names(conn), [])
+
+    def test_nested_rollback_keeps_outer_work(self):
+        """A nested rollback or uncommitted nested work leaves the outer transaction intact."""
+        with self.pool.connection() as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('outer')")
+            with self.pool.connection() as inner:
+                inner.execute("INSERT INTO items (name) VALUES ('rolled back')")
+                inner.rollback()
+                inner.execute("INSERT INTO items (name) VALUES ('committed')")
+                inner.commit()
+                inner.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+            outer.commit()
+        with self.pool.connection() as conn:
+            self.assertEqual(self._names(conn), ['outer', 'committed'])
+
+    def test_nested_checkout_without_outer_transaction(self):
+        """Without an open outer transaction a nested checkout commits on its own."""
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                self.assertIs(inner, outer)
+                inner.execute("INSERT INTO items (name) VALUES ('inner')")
+                inner.commit()
+        with self.pool.connection() as conn:
+            self.assertEqual(self._names(conn), ['inner'])
+
+    def test_row_factory_is_per_checkout(self):
+        """Each outermost checkout chooses its own row factory."""
+        with self.pool.connection(row_factory=sqlite3.Row) as conn:
+            self.assertIsInstance(conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+        with self.pool.connection() as conn:
+            self.assertIsInstance(conn.execute("SELECT 1").fetchone(), tuple)
+
+    def test_nested_checkout_row_factory_is_restored(self):
+        """A nested checkout gets its own row factory and the outer one comes back after."""
+        with self.pool.connection(row_factory=sqlite3.Row) as outer:
+            with self.pool.connection() as inner:
+                self.assertIsInstance(inner.execute("SELECT 1").fetchone(), tuple)
+                with self.pool.connection(row_factory=sqlite3.Row) as innermost:
+                    self.assertIsInstance(innermost.execute("SELECT 1").fetchone(), sqlite3.Row)
+                self.assertIsInstance(inner.execute("SELECT 1").fetchone(), tuple)
+            self.assertIsInstance(outer.execute("SELECT 1").fetchone(), sqlite3.Row)
+
+    def test_concurrent_writers(self):
+        """Writers in several threads all succeed."""
+        def write(n):
+            for i in range(20):
+                with self.pool.connection() as conn:
+                    conn.execute("INSERT INTO items (name) VALUES (?)", (f"{n}-{i}",))
+                    conn.commit()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 80)
+
+    def test_get_pool_is_shared_per_file(self):
+        """Callers using the same file share one pool."""
+        path = os.path.join(self.temp_dir, 'shared.db')
+        self.assertIs(get_pool(path), get_pool(os.path.join(self.temp_dir, '.', 'shared.db')))
+
+if __name__ == '__main__':
+    unittest.main()
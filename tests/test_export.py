@@ -0,0 +1,91 @@
+import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.export import gzip_chunks, iter_ndjson
+from db.models import Base, Card
+from export_cards import export_cards
+from routes.cards import cards_bp
+
+class TestCardExport(unittest.TestCase):
+    """Tests for the streaming NDJSON card export."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        db = self.Session()
+        start = datetime(2020, 1, 1)
+        for i in range(7):
+            db.add(Card(id=f"card-{i}", type='event', title=f"Card {i}",
+                        date=start + timedelta(days=i), session_id="session",
+                        created_at=datetime.now(), people=["Sam"]))
+        db.add(Card(id="other", type='event', title="Other", session_id="other",
+                    created_at=datetime.now()))
+        db.commit()
+        db.close()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def _records(self, data: bytes):
+        return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+    def test_streams_session_cards_in_batches(self):
+        """Every card of the session is emitted once, oldest first, in batch-sized chunks."""
+        db = self.Session()
+        chunks = list(iter_ndjson(db, "session", batch_size=3))
+        db.close()
+
+        self.assertEqual(len(chunks), 3)
+        records = self._records(b''.join(chunks))
+        self.assertEqual([r['id'] for r in records], [f"card-{i}" for i in range(7)])
+        self.assertEqual(records[0]['people'], ["Sam"])
+
+    def test_gzip_round_trip(self):
+        """The gzipped stream decompresses to the plain stream."""
+        db = self.Session()
+        plain = b''.join(iter_ndjson(db, "session"))
+        compressed = b''.join(gzip_chunks(iter_ndjson(db, "session")))
+        db.close()
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_export_endpoint(self):
+        """GET /cards/export streams the session's cards."""
+        app = Flask(__name__)
+        app.register_blueprint(cards_bp)
+        client = app.test_client()
+
+        self.assertEqual(client.get('/cards/export').status_code, 401)
+
+        client.set_cookie('session', 'session')
+        with patch('routes.cards.SessionLocal', self.Session):
+            response = client.get('/cards/export')
+            self.assertEqual(response.mimetype, 'application/x-ndjson')
+            self.assertEqual(len(self._records(response.data)), 7)
+
+            response = client.get('/cards/export?gzip=1')
+            self.assertEqual(len(self._records(gzip.decompress(response.data))), 7)
+
+    def test_cli_writes_file(self):
+        """export_cards writes the same stream to a file."""
+        output = os.path.join(self.temp_dir, 'cards.ndjson.gz')
+        with patch('export_cards.SessionLocal', self.Session):
+            export_cards("session", output, compress=True)
+        with gzip.open(output, 'rb') as f:
+            self.assertEqual(len(self._records(f.read())), 7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from unittest.mock import patch
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, Card
+from routes.cards import cards_bp
+from services import image_jobs
+from services.image_jobs import ImageJobQueue, JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING
+
+class TestImageJobQueue(unittest.TestCase):
+    """Tests for the background image job queue."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.queue = ImageJobQueue(os.path.join(self.temp_dir, 'jobs.db'), max_attempts=2)
+        self.stored = {}
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.queue.stop_worker(timeout=5)
+        shutil.rmtree(self.temp_dir)
+
+    def _store(self, card_id: str, image_url: str) -> None:
+        self.stored[card_id] = image_url
+
+    def test_run_pending_completes_jobs(self):
+        """Queued jobs are generated in order and stored."""
+        first = self.queue.enqueue('card-1', 'a lake')
+        second = self.queue.enqueue('card-2', 'a house')
+
+        processed = self.queue.run_pending(lambda prompt: f"https://img/{prompt}", self._store)
+
+        self.assertEqual(processed, 2)
+        self.assertEqual(self.stored, {'card-1': 'https://img/a lake', 'card-2': 'https://img/a house'})
+        self.assertEqual(self.queue.get_job(first)['status'], JOB_DONE)
+        self.assertEqual(self.queue.get_job_for_card('card-2')['id'], second)
+
+    def test_failed_jobs_are_retried_then_marked_failed(self):
+        """A failing job is retried until max_attempts."""
+        job_id = self.queue.enqueue('card-1', 'a lake')
+
+        def generate(prompt):
+            raise RuntimeError("billing limit")
+
+        self.queue.run_pending(generate, self._store)
+
+        job = self.queue.get_job(job_id)
+        self.assertEqual(job['status'], JOB_FAILED)
+        self.assertEqual(job['attempts'], 2)
+        self.assertIn("billing limit", job['error'])
+        self.assertEqual(self.stored, {})
+
+    def test_claim_is_exclusive(self):
+        """A job is handed to only one worker."""
+        self.queue.enqueue('card-1', 'a lake')
+        other = ImageJobQueue(self.queue.db_path)
+
+        self.assertIsNotNone(self.queue.claim())
+        self.assertIsNone(other.claim())
+
+    def test_stale_running_job_is_reclaimed(self):
+        """Jobs held by a dead worker are picked up again."""
+        job_id = self.queue.enqueue('card-1', 'a lake')
+        self.assertEqual(self.queue.claim()['id'], job_id)
+        self.assertEqual(self.queue.get_job(job_id)['status'], JOB_RUNNING)
+
+        self.queue.stale_after = -1
+        self.assertEqual(self.queue.claim()['id'], job_id)
+
+    def test_worker_thread_processes_new_jobs(self):
+        """The background worker picks up jobs as soon as they are enqueued."""
+        done = threading.Event()
+
+        def store(card_id, image_url):
+            self._store(card_id, image_url)
+            done.set()
+
+        self.queue.start_worker(lambda prompt: "https://img/1", store)
+        job_id = self.queue.enqueue('card-1', 'a lake')
+
+        self.assertTrue(done.wait(5))
+        self.queue.stop_worker(timeout=5)
+        self.assertEqual(self.stored, {'card-1': 'https://img/1'})
+        self.assertNotEqual(self.queue.get_job(job_id)['status'], JOB_PENDING)
+
+    def test_shared_queue_created_on_first_use(self):
+        """The shared queue isn't opened until it is asked for."""
+        db_path = os.path.join(self.temp_dir, 'shared.db')
+        with patch.object(image_jobs, '_queue', None), \
+                patch.dict(os.environ, {'IMAGE_JOBS_DB': db_path}):
+            self.assertFalse(os.path.exists(db_path))
+            queue = image_jobs.get_image_job_queue()
+            self.assertIs(image_jobs.get_image_job_queue(), queue)
+            self.assertEqual(queue.db_path, db_path)
+
+    def test_image_status_is_scoped_to_session(self):
+        """GET /cards/<id>/image only reports cards of the caller's session."""
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        db.add(Card(id='card-1', type='event', title="Lake", session_id='owner',
+                    created_at=datetime.now()))
+        db.commit()
+        db.close()
+        self.queue.enqueue('card-1', 'a lake')
+
+        app = Flask(__name__)
+        app.register_blueprint(cards_bp)
+        client = app.test_client()
+        self.assertEqual(client.get('/cards/card-1/image').status_code, 401)
+
+        with patch('routes.cards.SessionLocal', Session), \
+                patch('routes.cards.get_image_job_queue', return_value=self.queue):
+            client.set_cookie('session', 'intruder')
+            self.assertEqual(client.get('/cards/card-1/image').status_code, 404)
+
+            client.set_cookie('session', 'owner')
+            response = client.get('/cards/card-1/image')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['status'], JOB_PENDING)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import Index, create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from db.migrations import MIGRATIONS, get_schema_version, run_migrations
+from db.models import Base, Card
+from db.utils import get_cards_for_session, get_cards_page, get_timeline_for_session, get_timeline_page
+
+class TestMigrations(unittest.TestCase):
+    """Tests for the schema migration runner."""
+
+    def setUp(self):
+        """Set up a database created before the card indexes existed."""
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as conn:
+            for index in Card.__table__.indexes:
+                conn.execute(text(f"DROP INDEX {index.name}"))
+
+    def _index_names(self):
+        return {index['name'] for index in inspect(self.engine).get_indexes('cards')}
+
+    def test_migrations_add_indexes_to_existing_database(self):
+        """Running migrations adds the missing indexes and records the version."""
+        self.assertEqual(self._index_names(), set())
+
+        applied = run_migrations(self.engine)
+
+        self.assertEqual(applied, [version for version, _, _ in MIGRATIONS])
+        self.assertEqual(self._index_names(), {'ix_cards_session_date', 'ix_cards_session_type'})
+        self.assertEqual(get_schema_version(self.engine), MIGRATIONS[-1][0])
+
+    def test_migration_1_is_independent_of_the_model(self):
+        """Migration 1 creates exactly its own indexes, whatever Card declares today."""
+        extra = Index('ix_cards_title', Card.__table__.c.title)
+        try:
+            run_migrations(self.engine)
+        finally:
+            Card.__table__.indexes.discard(extra)
+
+        indexes = {index['name']: index['column_names'] for index in inspect(self.engine).get_indexes('cards')}
+        self.assertEqual(indexes, {
+            'ix_cards_session_date': ['session_id', 'date', 'id'],
+            'ix_cards_session_type': ['session_id', 'type']
+        })
+
+    def test_migrations_run_once(self):
+        """Applied migrations are skipped on the next start."""
+        run_migrations(self.engine)
+        self.assertEqual(run_migrations(self.engine), [])
+
+class TestQueryPlans(unittest.TestCase):
+    """Hot card queries must be served by an index, not a full table scan."""
+
+    def setUp(self):
+        """Set up a migrated database with some cards."""
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=self.engine)
+        run_migrations(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        for i in range(20):
+            self.db.add(Card(id=f"card-{i}", type='event', title=f"Card {i}",
+                             date=datetime(2020, 1, i + 1), session_id=f"session-{i % 4}",
+                             created_at=datetime.now()))
+        self.db.commit()
+        with self.engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.db.close()
+
+    def _plans(self, run):
+        """Run a query helper and return the query plan of every SELECT it issued."""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, 'before_cursor_execute', capture)
+        try:
+            run()
+        finally:
+            event.remove(self.engine, 'before_cursor_execute', capture)
+
+        self.assertTrue(statements)
+        raw = self.engine.raw_connection()
+        try:
+            return [
+                (statement, [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+                for statement, parameters in statements
+            ]
+        finally:
+            raw.close()
+
+    def assertNoFullScan(self, run):
+        for statement, plan in self._plans(run):
+            for step in plan:
+                self.assertNotEqual(step.strip(), 'SCAN cards', f"Full table scan in:\n{statement}\n{plan}")
+
+    def test_card_listing_uses_index(self):
+        """Listing and paging cards seeks the session index."""
+        self.assertNoFullScan(lambda: get_cards_for_session(self.db, "session-1"))
+        cards, cursor = get_cards_page(self.db, "session-1", 2)
+        self.assertNoFullScan(lambda: get_cards_page(self.db, "session-1", 2, cursor))
+
+    def test_timeline_uses_index(self):
+        """Timeline queries seek the session index."""
+        self.assertNoFullScan(lambda: get_timeline_for_session(self.db, "session-2"))
+        cards, cursor = get_timeline_page(self.db, "session-2", 2)
+        self.assertNoFullScan(lambda: get_timeline_page(self.db, "session-2", 2, cursor))
+
+    def test_type_filter_uses_index(self):
+        """Filtering a session by card type seeks an index."""
+        self.assertNoFullScan(
+            lambda: self.db.query(Card).filter(Card.session_id == "session-3", Card.type == 'event').all()
+        )
+
+    def test_card_lookup_uses_primary_key(self):
+        """The /event/<id> lookup is a primary key search."""
+        self.assertNoFullScan(lambda: self.db.query(Card).filter(Card.id == "card-3").first())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, Card
+from db.utils import decode_cursor, get_cards_page, get_timeline_page
+
+class TestKeysetPagination(unittest.TestCase):
+    """Tests for cursor pagination of cards and timeline items."""
+
+    def setUp(self):
+        """Set up test environment."""
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        start = datetime(2020, 1, 1)
+        for i in range(7):
+            # Pairs of cards share a date to exercise the id tie-breaker
+            self._add(f"card-{i}", start + timedelta(days=i // 2))
+        self._add("undated-a", None)
+        self._add("undated-b", None)
+        self._add("other-session", start, session_id="other")
+        self.db.commit()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.db.close()
+
+    def _add(self, card_id: str, date, session_id: str = "session") -> None:
+        self.db.add(Card(id=card_id, type='event', title=card_id, date=date,
+                         session_id=session_id, created_at=datetime.now()))
+
+    def _walk(self, fetch, limit: int):
+        ids, cursor, pages = [], None, 0
+        while True:
+            cards, cursor = fetch(self.db, "session", limit, cursor)
+            ids.extend(card.id for card in cards)
+            pages += 1
+            if cursor is None:
+                return ids, pages
+
+    def test_cards_pages_cover_every_card_once(self):
+        """Walking the cursors returns each card once, dated first, newest first."""
+        ids, pages = self._walk(get_cards_page, 3)
+        self.assertEqual(ids, [
+            "card-6", "card-5", "card-4", "card-3", "card-2", "card-1", "card-0",
+            "undated-b", "undated-a"
+        ])
+        self.assertEqual(pages, 3)
+
+    def test_timeline_skips_undated_cards(self):
+        """The timeline only pages through dated cards."""
+        ids, _ = self._walk(get_timeline_page, 2)
+        self.assertEqual(ids, [f"card-{i}" for i in range(6, -1, -1)])
+
+    def test_last_page_has_no_cursor(self):
+        """A page that reaches the end has no next cursor."""
+        cards, cursor = get_timeline_page(self.db, "session", 10)
+        self.assertEqual(len(cards), 7)
+        self.assertIsNone(cursor)
+
+    def test_invalid_cursor(self):
+        """Malformed cursors are rejected."""
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+if __name__ == '__main__':
+    unittest.main()
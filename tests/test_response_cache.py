@@ -0,0 +1,165 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, Card
+from db.response_cache import ResponseCache, response_cache
+from db.utils import save_card, set_card_image
+from routes.caching import cached_json_response
+
+class TestResponseCache(unittest.TestCase):
+    """Tests for the versioned response cache."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'responses.db')
+        self.builds = 0
+
+    def tearDown(self):
+        """Clean up test environment."""
+        ResponseCache(db_path=self.db_path)._pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    def _build(self) -> bytes:
+        self.builds += 1
+        return f'{{"build": {self.builds}}}'.encode('utf-8')
+
+    def test_hits_until_bumped(self):
+        """Bodies are reused until the session's version is bumped."""
+        cache = ResponseCache()
+        first = cache.get_or_build('s1', 'cards', self._build)
+        self.assertEqual(cache.get_or_build('s1', 'cards', self._build), first)
+        self.assertEqual(self.builds, 1)
+
+        cache.bump('s1')
+        self.assertNotEqual(cache.get_or_build('s1', 'cards', self._build), first)
+        self.assertEqual(self.builds, 2)
+
+    def test_bump_only_affects_its_session(self):
+        """Other sessions keep their cached bodies."""
+        cache = ResponseCache()
+        cache.get_or_build('s1', 'cards', self._build)
+        cache.get_or_build('s2', 'cards', self._build)
+        cache.bump('s1')
+        cache.get_or_build('s2', 'cards', self._build)
+        self.assertEqual(self.builds, 2)
+
+    def test_lru_eviction(self):
+        """The least recently used body is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.get_or_build('s', 'a', self._build)
+        cache.get_or_build('s', 'b', self._build)
+        cache.get_or_build('s', 'a', self._build)
+        cache.get_or_build('s', 'c', self._build)
+        cache.get_or_build('s', 'a', self._build)
+        self.assertEqual(self.builds, 3)
+        cache.get_or_build('s', 'b', self._build)
+        self.assertEqual(self.builds, 4)
+
+    def test_shared_tier_across_workers(self):
+        """Workers sharing a cache file share bodies and invalidations."""
+        worker_a = ResponseCache(db_path=self.db_path)
+        worker_b = ResponseCache(db_path=self.db_path)
+
+        body = worker_a.get_or_build('s1', 'timeline', self._build)
+        self.assertEqual(worker_b.get_or_build('s1', 'timeline', self._build), body)
+        self.assertEqual(self.builds, 1)
+
+        worker_a.bump('s1')
+        self.assertNotEqual(worker_b.get_or_build('s1', 'timeline', self._build), body)
+        self.assertEqual(self.builds, 2)
+
+    def test_shared_file_created_on_first_use(self):
+        """Workers agree on tags, and the cache file only appears once it is used."""
+        db_path = os.path.join(self.temp_dir, 'instance', 'responses.db')
+        worker_a = ResponseCache(db_path=db_path)
+        worker_b = ResponseCache(db_path=db_path)
+        self.assertFalse(os.path.exists(db_path))
+
+        self.assertEqual(worker_a.etag('s1', 'cards'), worker_b.etag('s1', 'cards'))
+        worker_b.bump('s1')
+        self.assertEqual(worker_a.etag('s1', 'cards'), worker_b.etag('s1', 'cards'))
+        self.assertTrue(os.path.exists(db_path))
+        worker_a._pool.close_all()
+
+    def test_global_cache_is_shared_by_default(self):
+        """The module's cache keeps its versions in a file every worker can see."""
+        self.assertIsNotNone(response_cache.db_path)
+
+class TestCardWriteInvalidation(unittest.TestCase):
+    """Tests that card writes bump the session's response version."""
+
+    def setUp(self):
+        """Set up test environment."""
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.db.close()
+
+    def test_save_and_image_update_bump_version(self):
+        """save_card and set_card_image invalidate the session's responses."""
+        version = response_cache.version('write-session')
+        save_card(self.db, {'id': 'c1', 'type': 'event', 'title': 'Trip',
+                            'date': datetime(2020, 1, 1).isoformat()}, 'write-session')
+        self.assertEqual(response_cache.version('write-session'), version + 1)
+
+        set_card_image(self.db, 'c1', '/media/c1.png')
+        self.assertEqual(response_cache.version('write-session'), version + 2)
+
+class TestConditionalResponses(unittest.TestCase):
+    """Tests for ETag revalidation of cached responses."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.builds = 0
+        # Start from a version no other test has cached bodies for
+        response_cache.bump('etag-session')
+        self.app = Flask(__name__)
+
+        @self.app.route('/items')
+        def items():
+            def build() -> bytes:
+                self.builds += 1
+                return b'{"items": []}'
+            return cached_json_response('etag-session', 'items', build)
+
+        self.client = self.app.test_client()
+
+    def test_not_modified_skips_the_body(self):
+        """A matching If-None-Match gets an empty 304."""
+        first = self.client.get('/items')
+        etag = first.headers['ETag']
+        self.assertEqual(first.status_code, 200)
+
+        second = self.client.get('/items', headers={'If-None-Match': etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b'')
+        self.assertEqual(second.headers['ETag'], etag)
+        self.assertEqual(self.builds, 1)
+
+    def test_write_changes_the_tag(self):
+        """After a card write the old tag no longer matches."""
+        etag = self.client.get('/items').headers['ETag']
+        response_cache.bump('etag-session')
+
+        response = self.client.get('/items', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(self.builds, 2)
+
+    def test_tags_differ_across_processes(self):
+        """Process-local caches never issue the same tag for a version."""
+        self.assertNotEqual(ResponseCache().etag('s', 'k'), ResponseCache().etag('s', 'k'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from utils.run_waiter import (
+    Backoff, RunCancelledError, RunFailedError, RunTimeoutError,
+    wait_for_run, wait_for_run_async
+)
+
+def fast_backoff() -> Backoff:
+    return Backoff(initial=0.001, maximum=0.002)
+
+def fake_client(statuses):
+    """Client whose runs.retrieve walks through the given statuses."""
+    client = MagicMock()
+    client.beta.threads.runs.retrieve.side_effect = [SimpleNamespace(status=s) for s in statuses]
+    return client
+
+class TestRunWaiter(unittest.TestCase):
+    """Tests for the shared assistant run waiter."""
+
+    def test_backoff_grows_to_maximum(self):
+        """Delays grow exponentially, are capped and jittered downwards."""
+        backoff = Backoff(initial=1, maximum=4, multiplier=2, jitter=0.5)
+        delays = [backoff.next_delay() for _ in range(5)]
+        for delay, base in zip(delays, [1, 2, 4, 4, 4]):
+            self.assertGreaterEqual(delay, base * 0.5)
+            self.assertLessEqual(delay, base)
+
+    def test_wait_for_completed_run(self):
+        """Polling stops as soon as the run completes."""
+        client = fake_client(['queued', 'in_progress', 'completed'])
+        run = wait_for_run(client, 'thread', 'run', backoff=fast_backoff())
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(client.beta.threads.runs.retrieve.call_count, 3)
+
+    def test_failed_run_raises(self):
+        """Terminal statuses other than completed raise RunFailedError."""
+        client = fake_client(['in_progress', 'expired'])
+        with self.assertRaises(RunFailedError) as ctx:
+            wait_for_run(client, 'thread', 'run', backoff=fast_backoff())
+        self.assertEqual(ctx.exception.run.status, 'expired')
+
+    def test_timeout_cancels_run(self):
+        """Hitting the deadline cancels the run server-side."""
+        client = MagicMock()
+        client.beta.threads.runs.retrieve.return_value = SimpleNamespace(status='in_progress')
+        with self.assertRaises(RunTimeoutError):
+            wait_for_run(client, 'thread', 'run', timeout=0.02, backoff=fast_backoff())
+        client.beta.threads.runs.cancel.assert_called_once_with(thread_id='thread', run_id='run')
+
+    def test_cancel_event_stops_waiting(self):
+        """Setting the cancel event stops the wait."""
+        client = MagicMock()
+        client.beta.threads.runs.retrieve.return_value = SimpleNamespace(status='in_progress')
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with self.assertRaises(RunCancelledError):
+            wait_for_run(client, 'thread', 'run', cancel_event=cancel_event)
+
+    def test_async_waits_on_many_runs(self):
+        """One event loop can wait on several runs concurrently."""
+        async def retrieve(thread_id, run_id):
+            counts[run_id] += 1
+            return SimpleNamespace(status='completed' if counts[run_id] >= 3 else 'in_progress')
+
+        counts = {'run-1': 0, 'run-2': 0, 'run-3': 0}
+        client = MagicMock()
+        client.beta.threads.runs.retrieve = retrieve
+
+        async def main():
+            return await asyncio.gather(*[
+                wait_for_run_async(client, 'thread', run_id, backoff=fast_backoff())
+                for run_id in counts
+            ])
+
+        runs = asyncio.run(main())
+        self.assertEqual([run.status for run in runs], ['completed'] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import shutil
+import tempfile
+
+from cards.memory_card import MemoryCard
+from cards.place_card import PlaceCard
+from core.droe_core import DROECore
+from storage.search_index import tokenize
+
+class TestSearchIndex(unittest.TestCase):
+    """Tests for full-text card search."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.core = DROECore(storage_path=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.core.storage_manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _memory(self, title: str, description: str, **kwargs) -> MemoryCard:
+        memory = MemoryCard(title=title, description=description, **kwargs)
+        self.core.save_card(memory)
+        return memory
+
+    def test_tokenize(self):
+        """Tokens are lowercased and stop words dropped."""
+        self.assertEqual(tokenize("The Lake House, in 1985!"), ['lake', 'house', '1985'])
+
+    def test_search_ranks_by_relevance(self):
+        """Cards with more matching terms rank first."""
+        lake = self._memory("Summer at the lake", "Swimming in the lake every morning")
+        beach = self._memory("Beach trip", "A day at the beach, near a lake")
+        self._memory("First job", "Working at the bakery")
+
+        results = self.core.search_cards("lake")
+        self.assertEqual([r['id'] for r in results], [lake.id, beach.id])
+        self.assertGreater(results[0]['score'], results[1]['score'])
+
+    def test_search_metadata_and_type_filter(self):
+        """Metadata is searchable and card_type narrows results."""
+        memory = self._memory("Wedding", "The big day", metadata={'tags': ['Grandma', 'family']})
+        place = PlaceCard(title="Grandma's farm", description="Where we spent summers")
+        self.core.save_card(place)
+
+        self.assertEqual(len(self.core.search_cards("grandma")), 2)
+        results = self.core.search_cards("grandma", card_type='memory')
+        self.assertEqual([r['id'] for r in results], [memory.id])
+
+    def test_search_updates_incrementally(self):
+        """Saves and deletes are reflected without a rebuild."""
+        memory = self._memory("Old title", "Nothing special")
+        self.assertEqual(self.core.search_cards("graduation"), [])
+
+        memory.update(title="Graduation")
+        self.core.save_card(memory)
+        self.assertEqual([r['id'] for r in self.core.search_cards("graduation")], [memory.id])
+        self.assertEqual(self.core.search_cards("old"), [])
+
+        self.core.delete_card(memory.id, 'memory')
+        self.assertEqual(self.core.search_cards("graduation"), [])
+
+    def test_search_empty_query(self):
+        """Queries without searchable terms return nothing."""
+        self._memory("Lake", "Swimming")
+        self.assertEqual(self.core.search_cards("the of"), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+from cards.memory_card import MemoryCard
+from core.droe_core import DROECore
+from storage.segment_store import (
+    SegmentStore, SegmentStorageManager, SegmentStoreLockedError, SEGMENT_SUFFIX
+)
+
+class TestSegmentStore(unittest.TestCase):
+    """Tests for the append-only segment store."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SegmentStore(self.temp_dir, max_segment_size=256, fsync=False)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _reopen(self):
+        self.store.close()
+        self.store = SegmentStore(self.temp_dir, max_segment_size=256, fsync=False)
+
+    def _segment_files(self):
+        return sorted(f for f in os.listdir(self.temp_dir) if f.endswith(SEGMENT_SUFFIX))
+
+    def test_put_get_overwrite_delete(self):
+        """Test that the latest value wins and deletes leave nothing behind."""
+        self.store.put('memory', 'a', b'one')
+        self.store.put('memory', 'a', b'two')
+        self.assertEqual(self.store.get('memory', 'a'), b'two')
+        self.assertIsNone(self.store.get('event', 'a'))
+
+        self.assertTrue(self.store.delete('memory', 'a'))
+        self.assertFalse(self.store.delete('memory', 'a'))
+        self.assertIsNone(self.store.get('memory', 'a'))
+        self.assertFalse(self.store.contains('memory', 'a'))
+
+    def test_rotation_and_reopen(self):
+        """Test that the index is rebuilt from sealed and unsealed segments."""
+        for i in range(20):
+            self.store.put('memory', f"card-{i}", f"value-{i}".encode() * 5)
+        self.store.delete('memory', 'card-3')
+        self.assertGreater(len(self._segment_files()), 1)
+
+        self._reopen()
+        self.assertEqual(len(self.store), 19)
+        self.assertIsNone(self.store.get('memory', 'card-3'))
+        self.assertEqual(self.store.get('memory', 'card-7'), b'value-7' * 5)
+
+    def test_torn_tail_is_truncated(self):
+        """Test that a partially written record is dropped on reopen."""
+        self.store.put('memory', 'a', b'kept')
+        self.store.close()
+        active = os.path.join(self.temp_dir, self._segment_files()[-1])
+        with open(active, 'ab') as f:
+            f.write(b'\x00\x01\x02')
+
+        self.store = SegmentStore(self.temp_dir, max_segment_size=256, fsync=False)
+        self.assertEqual(self.store.get('memory', 'a'), b'kept')
+        self.store.put('memory', 'b', b'after')
+        self._reopen()
+        self.assertEqual(self.store.get('memory', 'b'), b'after')
+
+    def test_compaction(self):
+        """Test that compaction drops dead records and keeps live ones."""
+        for round_ in range(5):
+            for i in range(5):
+                self.store.put('memory', f"card-{i}", f"{round_}-{i}".encode() * 8)
+        self.store.delete('memory', 'card-0')
+        self.assertGreater(self.store.garbage_ratio(), 0)
+
+        reclaimed = self.store.compact()
+        self.assertGreater(reclaimed, 0)
+        self.assertLess(len(self._segment_files()), 5)
+        for i in range(1, 5):
+            self.assertEqual(self.store.get('memory', f"card-{i}"), f"4-{i}".encode() * 8)
+        self.assertIsNone(self.store.get('memory', 'card-0'))
+
+        self._reopen()
+        self.assertEqual(len(self.store), 4)
+        self.assertIsNone(self.store.get('memory', 'card-0'))
+        self.assertEqual(self.store.get('memory', 'card-4'), b'4-4' * 8)
+
+    def test_directory_is_locked(self):
+        """Test that a second store can't open a directory that is in use."""
+        with self.assertRaises(SegmentStoreLockedError):
+            SegmentStore(self.temp_dir)
+        self._reopen()
+        self.store.put('memory', 'a', b'still writable')
+        self.assertEqual(self.store.get('memory', 'a'), b'still writable')
+
+    def test_compactor_survives_errors(self):
+        """Test that the background compactor keeps running after a failed compaction."""
+        calls = []
+        retried = threading.Event()
+
+        def compact():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError("corrupt footer")
+            retried.set()
+            return 0
+
+        with patch.object(self.store, 'compact', side_effect=compact), \
+                patch.object(self.store, 'garbage_ratio', return_value=1.0):
+            self.store.start_compactor(interval=0.01)
+            self.assertTrue(retried.wait(5))
+
+class TestSegmentStorageManager(unittest.TestCase):
+    """Tests for the segment storage backend."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_cards_survive_restart(self):
+        """Test saving, searching and deleting cards through the backend."""
+        manager = SegmentStorageManager(self.temp_dir, fsync=False, compaction_interval=None)
+        card = MemoryCard(title="Lake", description="Summer at the lake")
+        other = MemoryCard(title="Snow", description="Winter storm")
+        manager.save_card(card)
+        manager.save_card(other)
+        self.assertTrue(manager.delete_card(other.id, 'memory'))
+        manager.close()
+
+        manager = SegmentStorageManager(self.temp_dir, fsync=False, compaction_interval=None)
+        try:
+            self.assertEqual(manager.load_card(card.id, 'memory').title, "Lake")
+            self.assertIsNone(manager.load_card(other.id, 'memory'))
+            self.assertEqual([c['id'] for c in manager.search_cards("lake")], [card.id])
+            self.assertEqual(manager.rebuild_index(), 1)
+        finally:
+            manager.close()
+
+    def test_droe_core_backend(self):
+        """Test selecting the backend through DROECore."""
+        core = DROECore(self.temp_dir, storage_backend='segments')
+        try:
+            self.assertIsInstance(core.storage_manager, SegmentStorageManager)
+            card = core.create_memory("Kite", "Flying a kite")
+            self.assertEqual(core.load_card(card.id, 'memory').title, "Kite")
+        finally:
+            core.storage_manager.close()
+
+        with self.assertRaises(ValueError):
+            DROECore(self.temp_dir, storage_backend='tape')
+
+if __name__ == '__main__':
+    unittest.main()
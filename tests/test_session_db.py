@@ -0,0 +1,158 @@
+import unittest
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from db.session_db import SessionDB
+
+class TestSessionDB(unittest.TestCase):
+    """Tests for the session store."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'sessions.db')
+        self.stores = []
+
+    def tearDown(self):
+        """Clean up test environment."""
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _store(self, **kwargs) -> SessionDB:
+        store = SessionDB(self.db_path, **kwargs)
+        self.stores.append(store)
+        return store
+
+    def _row(self, session_id: str):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(
+                "SELECT data, created_at, updated_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def test_upsert_keeps_created_at(self):
+        """Saving an existing session updates it in place."""
+        store = self._store()
+        store.save_session('s1', {'stage': 1})
+        created_at = self._row('s1')[1]
+
+        store.save_session('s1', {'stage': 2})
+
+        data, created, updated = self._row('s1')
+        self.assertEqual(data, '{"stage": 2}')
+        self.assertEqual(created, created_at)
+        self.assertEqual(store.get_session('s1'), {'stage': 2})
+
+    def test_write_behind_coalesces_saves(self):
+        """Rapid saves of one session become a single write."""
+        store = self._store(write_behind=60)
+        with patch.object(store, '_write', wraps=store._write) as write:
+            for stage in range(10):
+                store.save_session('s1', {'stage': stage})
+
+            self.assertIsNone(self._row('s1'))
+            self.assertEqual(store.get_session('s1'), {'stage': 9})
+
+            store.flush()
+            write.assert_called_once()
+        self.assertEqual(self._row('s1')[0], '{"stage": 9}')
+
+    def test_write_behind_flushes_in_background(self):
+        """Buffered saves reach the database after the write-behind delay."""
+        store = self._store(write_behind=0.01)
+        store.save_session('s1', {'stage': 1})
+        deadline = time.monotonic() + 5
+        while self._row('s1') is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsNotNone(self._row('s1'))
+
+    def test_reads_during_flush_see_buffered_save(self):
+        """A session being flushed stays readable, and a save made meanwhile is kept."""
+        store = self._store(write_behind=60)
+        store.save_session('s1', {'stage': 1})
+        write = store._write
+        seen = []
+
+        def slow_write(rows):
+            seen.append(store.get_session('s1'))
+            store.save_session('s1', {'stage': 2})
+            write(rows)
+
+        with patch.object(store, '_write', side_effect=slow_write):
+            store.flush()
+        self.assertEqual(seen, [{'stage': 1}])
+        self.assertEqual(store.get_session('s1'), {'stage': 2})
+        store.flush()
+        self.assertEqual(self._row('s1')[0], '{"stage": 2}')
+
+    def test_environment_read_at_construction(self):
+        """Write-behind settings come from the environment when the store is built."""
+        with patch.dict(os.environ, {'SESSION_WRITE_BEHIND': '5', 'SESSION_LOG_PAYLOADS': '0.5'}):
+            store = self._store()
+        self.assertEqual(store.write_behind, 5.0)
+        self.assertEqual(store.payload_log_rate, 0.5)
+
+    def test_buffered_save_is_isolated_from_later_changes(self):
+        """Mutating the saved dict afterwards doesn't change the buffered save."""
+        store = self._store(write_behind=60)
+        data = {'answers': []}
+        store.save_session('s1', data)
+        data['answers'].append('changed')
+        self.assertEqual(store.get_session('s1'), {'answers': []})
+
+    def test_delete_drops_buffered_save(self):
+        """Deleting a session also discards its buffered save."""
+        store = self._store(write_behind=60)
+        store.save_session('s1', {'stage': 1})
+        store.delete_session('s1')
+        store.flush()
+        self.assertIsNone(store.get_session('s1'))
+        self.assertIsNone(self._row('s1'))
+
+    def test_close_flushes(self):
+        """Closing the store writes buffered saves."""
+        store = self._store(write_behind=60)
+        store.save_session('s1', {'stage': 1})
+        store.close()
+        self.assertEqual(self._row('s1')[0], '{"stage": 1}')
+
+    def test_concurrent_saves(self):
+        """Threads can save sessions concurrently."""
+        store = self._store()
+
+        def save(n):
+            for i in range(20):
+                store.save_session(f"s{n}", {'i': i})
+
+        threads = [threading.Thread(target=save, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([store.get_session(f"s{n}") for n in range(4)], [{'i': 19}] * 4)
+
+    def test_payloads_are_not_logged_by_default(self):
+        """Session payloads are only logged when sampling is enabled."""
+        store = self._store()
+        with self.assertLogs('db.session_db', level=logging.DEBUG) as logs:
+            store.save_session('s1', {'secret': 'answer'})
+            store.get_session('s1')
+            logging.getLogger('db.session_db').debug("marker")
+        self.assertFalse(any('answer' in line for line in logs.output))
+
+        store.payload_log_rate = 1.0
+        with self.assertLogs('db.session_db', level=logging.DEBUG) as logs:
+            store.save_session('s1', {'secret': 'answer'})
+        self.assertTrue(any('answer' in line for line in logs.output))
+
+if __name__ == '__main__':
+    unittest.main()
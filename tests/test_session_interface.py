@@ -0,0 +1,156 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import timedelta
+
+from flask import Flask, session
+
+from db.session_db import SessionDB
+from db.session_interface import SessionTooLargeError, SQLiteSessionInterface
+
+class TestSQLiteSessionInterface(unittest.TestCase):
+    """Tests for the SQLite Flask session interface."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'flask_sessions.db')
+        self.interface = SQLiteSessionInterface(self.db_path, max_size=1024)
+
+        self.app = Flask(__name__)
+        self.app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=1)
+        self.interface.init_app(self.app)
+
+        @self.app.route('/set/<value>')
+        def set_value(value):
+            session['value'] = value
+            return 'ok'
+
+        @self.app.route('/get')
+        def get_value():
+            return session.get('value', '')
+
+        @self.app.route('/clear')
+        def clear():
+            session.clear()
+            return 'ok'
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.interface.stop_sweeper()
+        self.interface._pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    def _count(self) -> int:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM flask_sessions").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_session_round_trip(self):
+        """Session data is stored server-side and found by the cookie's ID."""
+        self.client.get('/set/hello')
+        self.assertEqual(self.client.get('/get').data, b'hello')
+        self.assertEqual(self._count(), 1)
+
+        cookie = self.client.get_cookie('session')
+        self.assertNotIn('hello', cookie.value)
+
+    def test_empty_sessions_are_not_stored(self):
+        """Requests that never touch the session don't create rows."""
+        self.client.get('/get')
+        self.assertEqual(self._count(), 0)
+
+    def test_clearing_deletes_the_row(self):
+        """Clearing the session removes it from storage."""
+        self.client.get('/set/hello')
+        self.client.get('/clear')
+        self.assertEqual(self._count(), 0)
+
+    def test_expired_sessions_are_ignored_and_swept(self):
+        """Expired sessions are invisible and removed by the sweeper."""
+        self.client.get('/set/hello')
+        expired = time.time() + 2 * 3600
+
+        self.assertEqual(self.interface.sweep(now=time.time()), 0)
+        self.assertEqual(self.interface.sweep(now=expired), 1)
+        self.assertEqual(self.client.get('/get').data, b'')
+
+    def test_size_cap(self):
+        """Sessions over the size cap are rejected with a 413 and not stored."""
+        self.client.get('/set/hello')
+        response = self.client.get('/set/' + 'x' * 2000)
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("larger than 1024 bytes", response.get_json()['error'])
+        self.assertEqual(self.client.get('/get').data, b'hello')
+
+    def test_size_cap_without_init_app(self):
+        """Without the hooks an oversized session is logged and left unsaved."""
+        app = Flask(__name__)
+        app.session_interface = self.interface
+        app.add_url_rule('/set/<value>', view_func=lambda value: session.update(value=value) or 'ok')
+        with self.assertLogs('db.session_interface', level='ERROR'):
+            response = app.test_client().get('/set/' + 'x' * 2000)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._count(), 0)
+
+    def test_views_can_raise_size_error(self):
+        """SessionTooLargeError raised by a view is answered with a 413."""
+        def too_large():
+            raise SessionTooLargeError("too big")
+        self.app.add_url_rule('/big', view_func=too_large)
+        self.assertEqual(self.client.get('/big').status_code, 413)
+
+    def test_unmodified_reads_do_not_write(self):
+        """Reading a fresh session does not rewrite it."""
+        self.client.get('/set/hello')
+        conn = sqlite3.connect(self.db_path)
+        before = conn.execute("SELECT expires_at FROM flask_sessions").fetchone()[0]
+        self.client.get('/get')
+        after = conn.execute("SELECT expires_at FROM flask_sessions").fetchone()[0]
+        conn.close()
+        self.assertEqual(before, after)
+
+    def test_sweeper_thread_runs_extra_sweeps(self):
+        """The background sweeper also runs the extra cleanup callables."""
+        swept = []
+        self.interface.sweep_interval = 0.01
+        self.interface.start_sweeper(lambda: swept.append(True))
+        deadline = time.monotonic() + 5
+        while not swept and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(swept)
+
+class TestSessionDBExpiry(unittest.TestCase):
+    """Tests for expiring interview sessions."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SessionDB(os.path.join(self.temp_dir, 'sessions.db'), ttl=60)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_delete_expired(self):
+        """Sessions not saved within the TTL are ignored and deleted."""
+        self.store.save_session('old', {'stage': 1})
+        self.store.save_session('new', {'stage': 2})
+        with self.store._pool.connection() as conn:
+            conn.execute("UPDATE sessions SET updated_at = '2000-01-01T00:00:00' WHERE session_id = 'old'")
+            conn.commit()
+
+        self.assertIsNone(self.store.get_session('old'))
+        self.assertEqual(self.store.delete_expired(), 1)
+        self.assertEqual(self.store.get_session('new'), {'stage': 2})
+
+if __name__ == '__main__':
+    unittest.main()
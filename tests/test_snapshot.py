@@ -0,0 +1,80 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from cards.memory_card import MemoryCard
+from storage.snapshot import CardSnapshot, write_snapshot
+from storage.storage_manager import StorageManager, SNAPSHOT_FILENAME
+
+class TestCardSnapshot(unittest.TestCase):
+    """Tests for packed, memory-mapped card snapshots."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage_manager = StorageManager(self.temp_dir, codec='msgpack', fsync=False)
+        self.cards = [
+            MemoryCard(title=f"Memory {i}", description=f"Description {i}") for i in range(5)
+        ]
+        for card in self.cards:
+            self.storage_manager.save_card(card)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.storage_manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Test that a snapshot holds every stored card, encoded as stored."""
+        self.assertEqual(self.storage_manager.write_snapshot(), 5)
+        snapshot = CardSnapshot(os.path.join(self.temp_dir, SNAPSHOT_FILENAME))
+        try:
+            self.assertEqual(len(snapshot), 5)
+            self.assertIn(('memory', self.cards[0].id), snapshot)
+            self.assertIsInstance(snapshot.get('memory', self.cards[0].id), memoryview)
+            self.assertEqual(snapshot.load('memory', self.cards[2].id)['title'], "Memory 2")
+            self.assertIsNone(snapshot.get('event', self.cards[2].id))
+            self.assertEqual(len(list(snapshot.items('memory'))), 5)
+        finally:
+            snapshot.close()
+
+    def test_empty_and_corrupt(self):
+        """Test an empty snapshot and rejection of files that aren't snapshots."""
+        path = os.path.join(self.temp_dir, 'empty.snapshot')
+        self.assertEqual(write_snapshot(path, [], fsync=False), 0)
+        snapshot = CardSnapshot(path)
+        self.assertEqual(len(snapshot), 0)
+        snapshot.close()
+
+        with open(path, 'wb') as f:
+            f.write(b'not a snapshot at all')
+        with self.assertRaises(ValueError):
+            CardSnapshot(path)
+
+    def test_load_card_from_snapshot(self):
+        """Test that load_card serves the snapshot but never hides later writes."""
+        self.storage_manager.write_snapshot()
+        self.storage_manager.open_snapshot()
+
+        # Served from the mapping even once the card's file is gone
+        path = self.storage_manager._find_card_path(self.cards[0].id, 'memory')
+        os.remove(path)
+        self.assertEqual(self.storage_manager.load_card(self.cards[0].id, 'memory').title, "Memory 0")
+
+        self.cards[1].title = "Edited"
+        self.storage_manager.save_card(self.cards[1])
+        self.assertEqual(self.storage_manager.load_card(self.cards[1].id, 'memory').title, "Edited")
+
+        self.storage_manager.delete_card(self.cards[2].id, 'memory')
+        self.assertIsNone(self.storage_manager.load_card(self.cards[2].id, 'memory'))
+
+        new_card = MemoryCard(title="New", description="Saved after the snapshot")
+        self.storage_manager.save_card(new_card)
+        self.assertEqual(self.storage_manager.load_card(new_card.id, 'memory').title, "New")
+
+        self.storage_manager.close_snapshot()
+        self.assertIsNone(self.storage_manager.load_card(self.cards[0].id, 'memory'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+
+from cards.event_card import EventCard
+from cards.memory_card import MemoryCard
+from storage.storage_manager import StorageManager
+
+class TestStorageIndex(unittest.TestCase):
+    """Tests for the StorageManager metadata index."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage_manager = StorageManager(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.storage_manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _memory(self, title: str) -> MemoryCard:
+        return MemoryCard(title=title, description=f"{title} description")
+
+    def test_list_cards_uses_index(self):
+        """Listing should not need to open card files."""
+        self.storage_manager.list_cards()
+        memory = self._memory("First Day")
+        self.storage_manager.save_card(memory)
+
+        # Corrupt the file on disk; the index still answers
+        with open(self.storage_manager._get_card_path(memory.id, 'memory'), 'w') as f:
+            f.write("not json")
+
+        cards = self.storage_manager.list_cards('memory')
+        self.assertEqual(len(cards), 1)
+        self.assertEqual(cards[0]['id'], memory.id)
+        self.assertEqual(cards[0]['title'], "First Day")
+        self.assertEqual(cards[0]['type'], 'memory')
+
+    def test_delete_removes_from_index(self):
+        """Deleted cards should disappear from listings."""
+        first = self._memory("First")
+        second = self._memory("Second")
+        self.storage_manager.save_card(first)
+        self.storage_manager.save_card(second)
+
+        self.assertTrue(self.storage_manager.delete_card(first.id, 'memory'))
+
+        ids = [card['id'] for card in self.storage_manager.list_cards()]
+        self.assertEqual(ids, [second.id])
+
+    def test_update_replaces_entry(self):
+        """Re-saving a card should replace its index entry."""
+        memory = self._memory("Before")
+        self.storage_manager.save_card(memory)
+        memory.update(title="After")
+        self.storage_manager.save_card(memory)
+
+        cards = self.storage_manager.list_cards('memory')
+        self.assertEqual(len(cards), 1)
+        self.assertEqual(cards[0]['title'], "After")
+
+    def test_index_rebuilt_from_existing_store(self):
+        """A store written without an index should be indexed on first listing."""
+        event = EventCard(title="Graduation", description="Finished school")
+        with open(os.path.join(self.temp_dir, 'event', f"{event.id}.json"), 'w') as f:
+            json.dump(event.to_dict(), f)
+
+        self.storage_manager.close()
+        os.remove(os.path.join(self.temp_dir, '.index.db'))
+        os.remove(os.path.join(self.temp_dir, '.search.db'))
+        self.storage_manager = StorageManager(self.temp_dir)
+
+        cards = self.storage_manager.list_cards()
+        self.assertEqual([card['id'] for card in cards], [event.id])
+        self.assertEqual(self.storage_manager.rebuild_index(), 1)
+
+    def test_index_persists_across_instances(self):
+        """A second StorageManager should reuse the persisted index."""
+        memory = self._memory("Persisted")
+        self.storage_manager.save_card(memory)
+        self.storage_manager.list_cards()
+        self.storage_manager.close()
+
+        reopened = StorageManager(self.temp_dir)
+        try:
+            self.assertTrue(reopened.index.is_built)
+            self.assertEqual([card['id'] for card in reopened.list_cards('memory')], [memory.id])
+        finally:
+            reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()
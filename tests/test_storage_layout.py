@@ -0,0 +1,122 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+from cards.event_card import EventCard
+from cards.memory_card import MemoryCard
+from storage.codecs import encode_card, get_codec
+from storage.storage_manager import StorageManager
+
+class TestStorageLayout(unittest.TestCase):
+    """Tests for the sharded card layout, atomic writes and layout migration."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage_manager = StorageManager(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.storage_manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _memory(self, title: str) -> MemoryCard:
+        return MemoryCard(title=title, description=f"{title} description")
+
+    def _write_flat(self, card, card_type: str, legacy: bool = False) -> str:
+        """Write a card the way stores did before sharding."""
+        if legacy:
+            path = os.path.join(self.temp_dir, card_type, f"{card.id}.json")
+            with open(path, 'w') as f:
+                json.dump(card.to_dict(), f, indent=2)
+        else:
+            path = os.path.join(self.temp_dir, card_type, f"{card.id}.card")
+            with open(path, 'wb') as f:
+                f.write(encode_card(card.to_dict(), get_codec('json')))
+        return path
+
+    def test_cards_are_sharded(self):
+        """Card files live two hash-prefix levels below their type directory."""
+        memory = self._memory("Sharded")
+        self.storage_manager.save_card(memory)
+
+        path = self.storage_manager._get_card_path(memory.id, 'memory')
+        relative = os.path.relpath(path, os.path.join(self.temp_dir, 'memory'))
+        self.assertEqual(len(relative.split(os.sep)), 3)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.storage_manager.load_card(memory.id, 'memory').title, "Sharded")
+
+    def test_failed_write_keeps_previous_version(self):
+        """A save that dies mid-write leaves the old card intact and no temp files."""
+        memory = self._memory("Before")
+        self.storage_manager.save_card(memory)
+        memory.update(title="After")
+
+        with patch('storage.storage_manager.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.storage_manager.save_card(memory)
+
+        self.assertEqual(self.storage_manager.load_card(memory.id, 'memory').title, "Before")
+        shard_dir = os.path.dirname(self.storage_manager._get_card_path(memory.id, 'memory'))
+        self.assertEqual(os.listdir(shard_dir), [f"{memory.id}.card"])
+
+    def test_flat_cards_readable_before_and_after_migration(self):
+        """Unsharded and legacy cards load before, and after, being migrated."""
+        flat = self._memory("Flat")
+        legacy = EventCard(title="Legacy", description="Old JSON file")
+        self._write_flat(flat, 'memory')
+        self._write_flat(legacy, 'event', legacy=True)
+
+        self.assertEqual(self.storage_manager.load_card(flat.id, 'memory').title, "Flat")
+        self.assertEqual(self.storage_manager.rebuild_index(), 2)
+
+        self.assertEqual(self.storage_manager.migrate_layout(), 2)
+        self.assertEqual(self.storage_manager.migrate_layout(), 0)
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, 'memory')), [
+            os.path.relpath(self.storage_manager._get_card_path(flat.id, 'memory'),
+                            os.path.join(self.temp_dir, 'memory')).split(os.sep)[0]
+        ])
+        self.assertEqual(self.storage_manager.load_card(flat.id, 'memory').title, "Flat")
+        self.assertEqual(self.storage_manager.load_card(legacy.id, 'event').title, "Legacy")
+        self.assertEqual(self.storage_manager.rebuild_index(), 2)
+
+    def test_migration_never_overwrites_newer_saves(self):
+        """A card saved after its flat copy was written keeps the saved version."""
+        memory = self._memory("Old")
+        self._write_flat(memory, 'memory')
+        memory.update(title="New")
+        # Simulate a save whose flat-copy cleanup hasn't happened yet
+        self.storage_manager._atomic_write(
+            self.storage_manager._get_card_path(memory.id, 'memory'),
+            encode_card(memory.to_dict(), get_codec('json'))
+        )
+
+        self.storage_manager.migrate_layout()
+        self.assertEqual(self.storage_manager.load_card(memory.id, 'memory').title, "New")
+
+    def test_reads_during_migration(self):
+        """Every card stays loadable while a migration runs."""
+        cards = [self._memory(f"Card {i}") for i in range(200)]
+        for card in cards:
+            self._write_flat(card, 'memory')
+
+        migration = threading.Thread(target=self.storage_manager.migrate_layout)
+        migration.start()
+        missing, listed = [], []
+        while migration.is_alive():
+            for card in cards[::7]:
+                if self.storage_manager.load_card(card.id, 'memory') is None:
+                    missing.append(card.id)
+            listed.append(len(list(self.storage_manager._iter_stored_cards(['memory']))))
+        migration.join()
+
+        self.assertEqual(missing, [])
+        self.assertEqual(set(listed), {200})
+        self.assertEqual(self.storage_manager.rebuild_index(), 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+from db.timeline_buckets import ensure_timeline_buckets, get_bucket_counts, get_cards_for_period
+from init_db import init_db
+
+class TestTimelineBuckets(unittest.TestCase):
+    """Tests for the year/month/day timeline buckets."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, 'droecore.db')
+        with redirect_stdout(StringIO()):
+            init_db(db_path)
+        self.conn = sqlite3.connect(db_path)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _add(self, table: str, column: str, title: str, date: str) -> int:
+        card_id = self.conn.execute("INSERT INTO cards (title) VALUES (?)", (title,)).lastrowid
+        self.conn.execute(f"INSERT INTO {table} (id, {column}) VALUES (?, ?)", (card_id, date))
+        self.conn.commit()
+        return card_id
+
+    def _seed(self):
+        self.graduation = self._add('events', 'start_date', "Graduation", "1998-06-15 10:00:00")
+        self.wedding = self._add('events', 'start_date', "Wedding", "2003-09-20T14:00:00")
+        self.summer = self._add('memories', 'date', "Summer camp", "1998-07-02 09:00:00")
+        self.birthday = self._add('days', 'date', "Birthday", "1998-06-15 00:00:00")
+
+    def _titles(self, *args, **kwargs):
+        return [card['title'] for card in get_cards_for_period(self.conn, *args, **kwargs)]
+
+    def test_period_lookups(self):
+        """Year, month, day and decade views return cards in date order."""
+        self._seed()
+        self.assertEqual(self._titles(1998), ["Birthday", "Graduation", "Summer camp"])
+        self.assertEqual(self._titles(1998, month=6), ["Birthday", "Graduation"])
+        self.assertEqual(self._titles(1998, month=6, day=15, card_type='event'), ["Graduation"])
+        self.assertEqual(self._titles(1990, 1999, card_type='event'), ["Graduation"])
+        self.assertEqual(self._titles(2000, 2009), ["Wedding"])
+
+    def test_bucket_counts(self):
+        """Counts per decade, year, month and day come from the counts table."""
+        self._seed()
+        self.assertEqual(get_bucket_counts(self.conn), {1998: 3, 2003: 1})
+        self.assertEqual(get_bucket_counts(self.conn, decades=True), {1990: 3, 2000: 1})
+        self.assertEqual(get_bucket_counts(self.conn, year=1998), {6: 2, 7: 1})
+        self.assertEqual(get_bucket_counts(self.conn, year=1998, month=6, card_type='event'), {15: 1})
+
+    def test_buckets_follow_updates_and_deletes(self):
+        """Moving or deleting a card updates its bucket and the counts."""
+        self._seed()
+        self.conn.execute("UPDATE events SET start_date = '2003-01-01' WHERE id = ?", (self.graduation,))
+        self.conn.execute("DELETE FROM memories WHERE id = ?", (self.summer,))
+        self.conn.commit()
+
+        self.assertEqual(self._titles(1998), ["Birthday"])
+        self.assertEqual(get_bucket_counts(self.conn), {1998: 1, 2003: 2})
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM bucket_counts WHERE count <= 0").fetchone()[0], 0)
+
+    def test_undated_cards_are_skipped(self):
+        """Cards without a usable date are not bucketed."""
+        self._add('events', 'start_date', "Someday", None)
+        self.assertEqual(get_bucket_counts(self.conn), {})
+
+    def test_existing_cards_are_backfilled(self):
+        """Creating the buckets on an existing database fills them and their counts."""
+        self._seed()
+        self.conn.execute("DROP TABLE card_dates")
+        self.conn.execute("DROP TABLE bucket_counts")
+
+        ensure_timeline_buckets(self.conn)
+
+        self.assertEqual(get_bucket_counts(self.conn), {1998: 3, 2003: 1})
+
+    def test_period_lookup_uses_index(self):
+        """Period lookups are index range scans, not scans of the cards."""
+        self._seed()
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        get_cards_for_period(self.conn, 1990, 1999, card_type='event')
+        self.conn.set_trace_callback(None)
+
+        plan = [row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}")]
+        self.assertTrue(any('idx_card_dates_period' in step for step in plan), plan)
+        self.assertFalse(any(step.startswith('SCAN') for step in plan), plan)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+import streamlit as st
+import requests
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Optional
+
+API_BASE_URL = "http://localhost:5001"
+
+# (connect, read) timeouts in seconds for every backend request
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Seconds a cached GET is served without asking the backend
+INTERVIEW_TTL = 30
+TIMELINE_TTL = 60
+
+# Responses whose ETag is kept for revalidation
+MAX_ETAGS = 256
+
+class APIError(Exception):
+    """The backend answered with an error status."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"{status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Get the requests session shared by every rerun and every user.
+
+    Its connection pool keeps TCP connections to the backend alive across
+    reruns. Cookies from responses are never stored on it, since it is
+    shared; callers pass their session cookie with each request.
+
+    Returns:
+        requests.Session: The shared session
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@st.cache_resource
+def _etag_store() -> Dict[str, Any]:
+    return {'lock': threading.Lock(), 'entries': OrderedDict()}
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the pooled session, with the default timeout."""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_http_session().request(method, url, **kwargs)
+
+def _cookies(session_id: Optional[str]) -> Optional[Dict[str, str]]:
+    return {'session_id': session_id} if session_id else None
+
+def get_json(url: str, params: Optional[Dict[str, Any]] = None,
+             cookies: Optional[Dict[str, str]] = None) -> requests.Response:
+    """
+    GET a JSON endpoint, revalidating the last response with its ETag.
+
+    The body and ETag of recent successful responses are kept per URL,
+    parameters and cookies. Later requests for the same URL send
+    If-None-Match, and a 304 from the server is answered from the stored
+    body, so unchanged data is never transferred again.
+
+    Args:
+        url (str): The endpoint URL
+        params (Optional[Dict[str, Any]]): Query parameters
+        cookies (Optional[Dict[str, str]]): Cookies to send
+
+    Returns:
+        requests.Response: The response; a 304 is returned as a 200 whose
+        json() is the stored body
+    """
+    store = _etag_store()
+    key = (url, tuple(sorted((params or {}).items())), tuple(sorted((cookies or {}).items())))
+    with store['lock']:
+        cached = store['entries'].get(key)
+
+    headers = {'If-None-Match': cached['etag']} if cached else {}
+    response = request('GET', url, params=params, cookies=cookies, headers=headers)
+
+    if response.status_code == 304 and cached:
+        response.status_code = 200
+        response._content = cached['content']
+    elif response.status_code == 200 and response.headers.get('ETag'):
+        with store['lock']:
+            store['entries'][key] = {'etag': response.headers['ETag'], 'content': response.content}
+            store['entries'].move_to_end(key)
+            while len(store['entries']) > MAX_ETAGS:
+                store['entries'].popitem(last=False)
+    return response
+
+def _json_or_raise(response: requests.Response) -> Dict[str, Any]:
+    if response.status_code != 200:
+        raise APIError(response.status_code, response.text)
+    return response.json()
+
+@st.cache_data(ttl=INTERVIEW_TTL, show_spinner=False)
+def get_interview(session_id: str, base_url: str = API_BASE_URL) -> Dict[str, Any]:
+    """
+    Get the current interview state of a session.
+
+    Results are cached for INTERVIEW_TTL seconds, or until submit_answer
+    invalidates them; errors are not cached.
+
+    Args:
+        session_id (str): The user's session ID
+        base_url (str): The backend URL
+
+    Returns:
+        Dict[str, Any]: The interview state
+
+    Raises:
+        APIError: If the backend answers with an error
+        requests.exceptions.RequestException: If the backend can't be reached
+    """
+    return _json_or_raise(request('GET', f"{base_url}/interview", cookies=_cookies(session_id)))
+
+@st.cache_data(ttl=TIMELINE_TTL, show_spinner=False)
+def get_timeline_page(session_id: Optional[str], cursor: Optional[str] = None,
+                      base_url: str = API_BASE_URL) -> Dict[str, Any]:
+    """
+    Get a page of a session's timeline.
+
+    Results are cached for TIMELINE_TTL seconds, or until a write through
+    this module invalidates them; expired results are revalidated with
+    their ETag.
+
+    Args:
+        session_id (Optional[str]): The user's session ID
+        cursor (Optional[str]): next_cursor of the previous page
+        base_url (str): The backend URL
+
+    Returns:
+        Dict[str, Any]: The timeline response
+
+    Raises:
+        APIError: If the backend answers with an error
+        requests.exceptions.RequestException: If the backend can't be reached
+    """
+    params = {'cursor': cursor} if cursor else None
+    return _json_or_raise(get_json(f"{base_url}/timeline", params=params, cookies=_cookies(session_id)))
+
+def invalidate() -> None:
+    """Drop every cached GET, e.g. after a write changed backend data."""
+    get_interview.clear()
+    get_timeline_page.clear()
+
+def start_interview(base_url: str = API_BASE_URL) -> Dict[str, Any]:
+    """
+    Start a new interview; never cached.
+
+    Raises:
+        APIError: If the backend answers with an error
+        requests.exceptions.RequestException: If the backend can't be reached
+    """
+    return _json_or_raise(request('GET', f"{base_url}/interview"))
+
+def submit_answer(answer: str, session_id: Optional[str] = None,
+                  base_url: str = API_BASE_URL) -> Dict[str, Any]:
+    """
+    Submit an answer to the current interview question.
+
+    Cached GETs are invalidated afterwards, since answers create cards.
+
+    Args:
+        answer (str): The user's answer
+        session_id (Optional[str]): The user's session ID
+        base_url (str): The backend URL
+
+    Returns:
+        Dict[str, Any]: The backend's response
+
+    Raises:
+        APIError: If the backend answers with an error
+        requests.exceptions.RequestException: If the backend can't be reached
+    """
+    try:
+        return _json_or_raise(request(
+            'POST', f"{base_url}/interview", json={'answer': answer}, cookies=_cookies(session_id)
+        ))
+    finally:
+        invalidate()
+
+def add_timeline_event(event: Dict[str, Any], session_id: Optional[str] = None,
+                       base_url: str = API_BASE_URL) -> Dict[str, Any]:
+    """
+    Add an event to the timeline and invalidate cached GETs.
+
+    Raises:
+        APIError: If the backend answers with an error
+        requests.exceptions.RequestException: If the backend can't be reached
+    """
+    try:
+        return _json_or_raise(request(
+            'POST', f"{base_url}/timeline", json=event, cookies=_cookies(session_id)
+        ))
+    finally:
+        invalidate()
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+from ui_components import api_client
 from time import sleep
 
 def reset_session():
@@ -117,7 +118,7 @@ def render():
                 name = st.text_input("Enter your name", key="name_input")
                 if st.button("CONTINUE"):
                     try:
-                        response = requests.get("http://localhost:5001/interview", timeout=5)
+                        response = api_client.request("GET", f"{api_client.API_BASE_URL}/interview", timeout=5)
                         if response.status_code == 200:
                             data = response.json()
                             if "question" in data:
@@ -146,11 +147,14 @@ def render():
                 if st.button("CONTINUE"):
                     if answer.strip():
                         try:
-                            response = requests.post(
-                                "http://localhost:5001/interview",
+                            response = api_client.request(
+                                "POST",
+                                f"{api_client.API_BASE_URL}/interview",
                                 json={"answer": answer.strip()},
                                 timeout=5
                             )
+                            # Answers create cards, so cached timeline pages are stale
+                            api_client.invalidate()
                             if response.status_code == 200:
                                 data = response.json()
                                 if data.get("completed", False):
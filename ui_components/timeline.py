@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 from datetime import datetime
 import json
+from ui_components import api_client
 
 def create_timeline_ui():
     """Create the timeline UI component."""
@@ -17,24 +18,23 @@ def create_timeline_ui():
         return
 
     try:
-        # Fetch events from backend
-        response = requests.get(f"{st.session_state['backend_url']}/timeline")
-        if response.status_code == 200:
-            events = response.json().get('events', [])
-            
-            # Display timeline
-            for event in events:
-                date = datetime.fromisoformat(event['date']).strftime('%B %d, %Y')
-                st.markdown(f"""
-                    <div style='background-color: #f8f9fa; padding: 1.5rem; border-radius: 10px; margin: 1rem 0; border-left: 4px solid #4a90e2;'>
-                        <h3 style='color: #4a90e2; margin-top: 0;'>{event['title']}</h3>
-                        <p style='color: #666;'>{date}</p>
-                        <p>{event['description']}</p>
-                    </div>
-                """, unsafe_allow_html=True)
+        # Fetch events from backend; reruns are served from the client cache
+        timeline_data = api_client.get_timeline_page(None, base_url=st.session_state['backend_url'])
+        events = timeline_data.get('events', [])
         
-        else:
-            st.error("Failed to load timeline events. Please try again later.")
+        # Display timeline
+        for event in events:
+            date = datetime.fromisoformat(event['date']).strftime('%B %d, %Y')
+            st.markdown(f"""
+                <div style='background-color: #f8f9fa; padding: 1.5rem; border-radius: 10px; margin: 1rem 0; border-left: 4px solid #4a90e2;'>
+                    <h3 style='color: #4a90e2; margin-top: 0;'>{event['title']}</h3>
+                    <p style='color: #666;'>{date}</p>
+                    <p>{event['description']}</p>
+                </div>
+            """, unsafe_allow_html=True)
+    
+    except api_client.APIError:
+        st.error("Failed to load timeline events. Please try again later.")
     
     except requests.exceptions.RequestException as e:
         st.error(f"Error connecting to the server: {str(e)}")
@@ -53,21 +53,21 @@ def create_timeline_ui():
             if st.form_submit_button("Save Event"):
                 try:
                     # Submit event to backend
-                    response = requests.post(
-                        f"{st.session_state['backend_url']}/timeline",
-                        json={
+                    api_client.add_timeline_event(
+                        {
                             "title": title,
                             "date": date.isoformat(),
                             "description": description
-                        }
+                        },
+                        base_url=st.session_state['backend_url']
                     )
                     
-                    if response.status_code == 200:
-                        st.success("Event added successfully!")
-                        st.session_state.show_event_form = False
-                        st.experimental_rerun()
-                    else:
-                        st.error("Failed to add event. Please try again.")
+                    st.success("Event added successfully!")
+                    st.session_state.show_event_form = False
+                    st.experimental_rerun()
+                
+                except api_client.APIError:
+                    st.error("Failed to add event. Please try again.")
                 
                 except requests.exceptions.RequestException as e:
                     st.error(f"Error connecting to the server: {str(e)}")
@@ -0,0 +1,146 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from utils.logger import get_logger
+from utils.paths import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+
+class AssistantIdCache:
+    """On-disk cache of resolved OpenAI assistant IDs, keyed by assistant name.
+
+    Resolution is serialized across processes with a lock file, so worker
+    processes starting together resolve (and possibly create) the assistant
+    only once and then share the cached ID until it expires.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path (Optional[str]): Path to the JSON cache file, by default
+                $ASSISTANT_ID_CACHE or .assistant_cache.json in the data directory
+            ttl (Optional[float]): Seconds a resolved ID stays valid, by default
+                $ASSISTANT_ID_CACHE_TTL or a day
+        """
+        if path is None:
+            path = os.getenv('ASSISTANT_ID_CACHE') or os.path.join(DATA_DIR, '.assistant_cache.json')
+        if ttl is None:
+            ttl = float(os.getenv('ASSISTANT_ID_CACHE_TTL', DEFAULT_TTL))
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _make_directory(self) -> str:
+        # Created on first write rather than at construction, so importing
+        # the module leaves the filesystem alone
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable assistant cache {self.path}: {str(e)}")
+            return {}
+
+    def _write(self, entries: Dict[str, Dict]) -> None:
+        directory = self._make_directory()
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.assistant_cache.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock shared by every process using this cache."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self._make_directory()
+            with open(f"{self.path}.lock", 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Get a cached assistant ID if it hasn't expired.
+
+        Args:
+            name (str): The assistant name
+
+        Returns:
+            Optional[str]: The cached ID, or None
+        """
+        entry = self._read().get(name)
+        if not entry or time.time() - entry.get('resolved_at', 0) > self.ttl:
+            return None
+        return entry.get('id')
+
+    def get_or_resolve(self, name: str, resolve: Callable[[], str]) -> str:
+        """
+        Return the cached ID for an assistant, resolving it at most once across processes.
+
+        Args:
+            name (str): The assistant name
+            resolve (Callable[[], str]): Looks up or creates the assistant over the network
+
+        Returns:
+            str: The assistant ID
+        """
+        assistant_id = self.get(name)
+        if assistant_id:
+            return assistant_id
+        with self._file_lock():
+            # Another process may have resolved it while we waited for the lock
+            assistant_id = self.get(name)
+            if assistant_id:
+                return assistant_id
+            assistant_id = resolve()
+            entries = self._read()
+            entries[name] = {'id': assistant_id, 'resolved_at': time.time()}
+            try:
+                self._write(entries)
+            except OSError as e:
+                logger.warning(f"Could not write assistant cache {self.path}: {str(e)}")
+            return assistant_id
+
+    def invalidate(self, name: str) -> None:
+        """
+        Drop a cached assistant ID, e.g. after the assistant was deleted.
+
+        Args:
+            name (str): The assistant name
+        """
+        with self._file_lock():
+            entries = self._read()
+            if entries.pop(name, None) is not None:
+                self._write(entries)
+
+# Create a global instance
+assistant_id_cache = AssistantIdCache()
@@ -1,5 +1,5 @@
-from typing import Union, Dict, Any, List, Optional, Type, TypeVar
-from cards.base_card import BaseCard
+from typing import Union, Dict, Any, Iterator, List, Optional, Type, TypeVar
+from cards.base_card import BaseCard, DEFAULT_IMAGE_PATH
 from cards.event_card import EventCard
 from cards.location_card import LocationCard
 from cards.person_card import PersonCard
@@ -9,25 +9,52 @@ from cards.place_card import PlaceCard
 from cards.time_period_card import TimePeriodCard
 from cards.day_card import DayCard
 from cards.year_card import YearCard
-from cards.media import Media
+from cards.media import Media, MediaType
 import uuid
+from collections import defaultdict
 from datetime import datetime
 import sqlite3
+from db.pool import DEFAULT_DB_PATH, get_pool
+from utils.image_resolver import ImageResolver
 
 T = TypeVar('T', bound=BaseCard)
 
 class CardUtils:
     """Utility functions for working with cards in the DROE Core system."""
     
-    def __init__(self, db_path: str = 'droecore.db'):
+    # Cards loaded per batch; relationship queries are issued once per batch
+    page_size = 500
+    
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, image_resolver: Optional[ImageResolver] = None):
+        """
+        Initialize the card utilities.
+        
+        Args:
+            db_path (str): Path to the SQLite database file
+            image_resolver (Optional[ImageResolver]): Resolver that generates the
+                images of saved cards in the background; without one, cards
+                saved with a pending image get the default image
+        """
         self.db_path = db_path
+        self.pool = get_pool(db_path)
+        self.image_resolver = image_resolver
     
     def get_db(self):
-        """Get a database connection"""
-        return sqlite3.connect(self.db_path)
+        """Check out this thread's pooled database connection; hand it back with release_db"""
+        return self.pool.acquire()
+    
+    def release_db(self, conn: sqlite3.Connection):
+        """Return a connection checked out with get_db"""
+        self.pool.release(conn)
     
     def save_card(self, card: BaseCard) -> int:
         """Save a card to the database and return its ID"""
+        if card.image_pending:
+            if self.image_resolver:
+                self.image_resolver.submit(card)
+            else:
+                card.image_path = DEFAULT_IMAGE_PATH
+        
         conn = self.get_db()
         cursor = conn.cursor()
         
@@ -66,67 +93,42 @@ class CardUtils:
             return card_id
             
         finally:
-            conn.close()
+            self.release_db(conn)
     
     def get_card(self, card_id: int, card_type: Type[T]) -> Optional[T]:
         """Get a card by ID and type"""
+        if card_type not in _CARD_SELECTS:
+            return None
+        
         conn = self.get_db()
-        cursor = conn.cursor()
         
         try:
-            # Get base card data
-            cursor.execute('SELECT * FROM cards WHERE id = ?', (card_id,))
-            card_data = cursor.fetchone()
-            
-            if not card_data:
-                return None
-            
-            # Get card-specific data
-            if card_type == EventCard:
-                return self._get_event_card(cursor, card_id)
-            elif card_type == MemoryCard:
-                return self._get_memory_card(cursor, card_id)
-            elif card_type == PersonCard:
-                return self._get_person_card(cursor, card_id)
-            elif card_type == PlaceCard:
-                return self._get_place_card(cursor, card_id)
-            elif card_type == TimePeriodCard:
-                return self._get_time_period_card(cursor, card_id)
-            elif card_type == DayCard:
-                return self._get_day_card(cursor, card_id)
-            elif card_type == YearCard:
-                return self._get_year_card(cursor, card_id)
-            
+            for cards in self._load_cards(conn, card_type, 'WHERE c.id = ?', (card_id,)):
+                return cards[0]
             return None
             
         finally:
-            conn.close()
+            self.release_db(conn)
     
     def get_cards_by_type(self, card_type: Type[T]) -> List[T]:
         """Get all cards of a specific type"""
+        cards = []
+        for page in self.iter_cards_by_type(card_type):
+            cards.extend(page)
+        return cards
+    
+    def iter_cards_by_type(self, card_type: Type[T]) -> Iterator[List[T]]:
+        """Yield all cards of a specific type, one page of page_size cards at a time"""
+        if card_type not in _CARD_SELECTS:
+            return
+        
         conn = self.get_db()
-        cursor = conn.cursor()
         
         try:
-            if card_type == EventCard:
-                return self._get_all_event_cards(cursor)
-            elif card_type == MemoryCard:
-                return self._get_all_memory_cards(cursor)
-            elif card_type == PersonCard:
-                return self._get_all_person_cards(cursor)
-            elif card_type == PlaceCard:
-                return self._get_all_place_cards(cursor)
-            elif card_type == TimePeriodCard:
-                return self._get_all_time_period_cards(cursor)
-            elif card_type == DayCard:
-                return self._get_all_day_cards(cursor)
-            elif card_type == YearCard:
-                return self._get_all_year_cards(cursor)
-            
-            return []
+            yield from self._load_cards(conn, card_type)
             
         finally:
-            conn.close()
+            self.release_db(conn)
     
     def _save_event_card(self, cursor: sqlite3.Cursor, card_id: int, card: EventCard):
         """Save event card specific data"""
@@ -238,540 +240,212 @@ class CardUtils:
                 VALUES (?, ?, ?)
             ''', (card_id, type(card).__name__, media_id))
     
-    def _get_event_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[EventCard]:
-        """Get event card by ID"""
-        cursor.execute('''
-            SELECT c.*, e.start_date, e.end_date
-            FROM cards c
-            JOIN events e ON c.id = e.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = EventCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            start_date=datetime.fromisoformat(data[4]),
-            end_date=datetime.fromisoformat(data[5]) if data[5] else None
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_memory_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[MemoryCard]:
-        """Get memory card by ID"""
-        cursor.execute('''
-            SELECT c.*, m.date, m.emotion, m.intensity
-            FROM cards c
-            JOIN memories m ON c.id = m.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = MemoryCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            date=datetime.fromisoformat(data[4]),
-            emotion=data[5],
-            intensity=data[6]
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_person_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[PersonCard]:
-        """Get person card by ID"""
-        cursor.execute('''
-            SELECT c.*, p.relationship
-            FROM cards c
-            JOIN people p ON c.id = p.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = PersonCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            relationship=data[4]
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_place_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[PlaceCard]:
-        """Get place card by ID"""
-        cursor.execute('''
-            SELECT c.*, p.latitude, p.longitude
-            FROM cards c
-            JOIN places p ON c.id = p.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = PlaceCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            latitude=data[4],
-            longitude=data[5]
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_time_period_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[TimePeriodCard]:
-        """Get time period card by ID"""
-        cursor.execute('''
-            SELECT c.*, tp.start_date, tp.end_date
-            FROM cards c
-            JOIN time_periods tp ON c.id = tp.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = TimePeriodCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            start_date=datetime.fromisoformat(data[4]),
-            end_date=datetime.fromisoformat(data[5]) if data[5] else None
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_day_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[DayCard]:
-        """Get day card by ID"""
-        cursor.execute('''
-            SELECT c.*, d.date
-            FROM cards c
-            JOIN days d ON c.id = d.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = DayCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            date=datetime.fromisoformat(data[4])
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_year_card(self, cursor: sqlite3.Cursor, card_id: int) -> Optional[YearCard]:
-        """Get year card by ID"""
-        cursor.execute('''
-            SELECT c.*, y.year
-            FROM cards c
-            JOIN years y ON c.id = y.id
-            WHERE c.id = ?
-        ''', (card_id,))
-        
-        data = cursor.fetchone()
-        if not data:
-            return None
-        
-        card = YearCard(
-            id=data[0],
-            title=data[1],
-            description=data[2],
-            created_at=datetime.fromisoformat(data[3]),
-            year=data[4]
-        )
-        
-        # Get related data
-        self._get_card_relationships(cursor, card)
-        self._get_card_media(cursor, card)
-        
-        return card
-    
-    def _get_card_relationships(self, cursor: sqlite3.Cursor, card: BaseCard):
-        """Get card relationships"""
-        if isinstance(card, EventCard):
-            # Get people
-            cursor.execute('''
-                SELECT p.*
-                FROM people p
-                JOIN event_people ep ON p.id = ep.person_id
-                WHERE ep.event_id = ?
-            ''', (card.id,))
-            
-            for person_data in cursor.fetchall():
-                person = PersonCard(
-                    id=person_data[0],
-                    title=person_data[1],
-                    description=person_data[2],
-                    created_at=datetime.fromisoformat(person_data[3]),
-                    relationship=person_data[4]
-                )
-                card.people.append(person)
-            
-            # Get location
-            cursor.execute('''
-                SELECT p.*
-                FROM places p
-                JOIN event_places ep ON p.id = ep.place_id
-                WHERE ep.event_id = ?
-            ''', (card.id,))
-            
-            place_data = cursor.fetchone()
-            if place_data:
-                card.location = PlaceCard(
-                    id=place_data[0],
-                    title=place_data[1],
-                    description=place_data[2],
-                    created_at=datetime.fromisoformat(place_data[3]),
-                    latitude=place_data[4],
-                    longitude=place_data[5]
-                )
-            
-            # Get time period
-            cursor.execute('''
-                SELECT tp.*
-                FROM time_periods tp
-                JOIN event_time_periods etp ON tp.id = etp.time_period_id
-                WHERE etp.event_id = ?
-            ''', (card.id,))
-            
-            time_period_data = cursor.fetchone()
-            if time_period_data:
-                card.time_period = TimePeriodCard(
-                    id=time_period_data[0],
-                    title=time_period_data[1],
-                    description=time_period_data[2],
-                    created_at=datetime.fromisoformat(time_period_data[3]),
-                    start_date=datetime.fromisoformat(time_period_data[4]),
-                    end_date=datetime.fromisoformat(time_period_data[5]) if time_period_data[5] else None
-                )
-        
-        elif isinstance(card, MemoryCard):
-            # Get people
-            cursor.execute('''
-                SELECT p.*
-                FROM people p
-                JOIN memory_people mp ON p.id = mp.person_id
-                WHERE mp.memory_id = ?
-            ''', (card.id,))
-            
-            for person_data in cursor.fetchall():
-                person = PersonCard(
-                    id=person_data[0],
-                    title=person_data[1],
-                    description=person_data[2],
-                    created_at=datetime.fromisoformat(person_data[3]),
-                    relationship=person_data[4]
-                )
-                card.associated_people.append(person)
-            
-            # Get place
-            cursor.execute('''
-                SELECT p.*
-                FROM places p
-                JOIN memory_places mp ON p.id = mp.place_id
-                WHERE mp.memory_id = ?
-            ''', (card.id,))
-            
-            place_data = cursor.fetchone()
-            if place_data:
-                card.associated_place = PlaceCard(
-                    id=place_data[0],
-                    title=place_data[1],
-                    description=place_data[2],
-                    created_at=datetime.fromisoformat(place_data[3]),
-                    latitude=place_data[4],
-                    longitude=place_data[5]
-                )
-            
-            # Get time period
-            cursor.execute('''
-                SELECT tp.*
-                FROM time_periods tp
-                JOIN memory_time_periods mtp ON tp.id = mtp.time_period_id
-                WHERE mtp.memory_id = ?
-            ''', (card.id,))
-            
-            time_period_data = cursor.fetchone()
-            if time_period_data:
-                card.associated_time_period = TimePeriodCard(
-                    id=time_period_data[0],
-                    title=time_period_data[1],
-                    description=time_period_data[2],
-                    created_at=datetime.fromisoformat(time_period_data[3]),
-                    start_date=datetime.fromisoformat(time_period_data[4]),
-                    end_date=datetime.fromisoformat(time_period_data[5]) if time_period_data[5] else None
-                )
-            
-            # Get event
-            cursor.execute('''
-                SELECT e.*
-                FROM events e
-                JOIN memory_events me ON e.id = me.event_id
-                WHERE me.memory_id = ?
-            ''', (card.id,))
-            
-            event_data = cursor.fetchone()
-            if event_data:
-                card.associated_event = EventCard(
-                    id=event_data[0],
-                    title=event_data[1],
-                    description=event_data[2],
-                    created_at=datetime.fromisoformat(event_data[3]),
-                    start_date=datetime.fromisoformat(event_data[4]),
-                    end_date=datetime.fromisoformat(event_data[5]) if event_data[5] else None
-                )
-    
-    def _get_card_media(self, cursor: sqlite3.Cursor, card: BaseCard):
-        """Get card media"""
-        cursor.execute('''
-            SELECT m.*
-            FROM media m
-            JOIN card_media cm ON m.id = cm.media_id
-            WHERE cm.card_id = ? AND cm.card_type = ?
-        ''', (card.id, type(card).__name__))
-        
-        for media_data in cursor.fetchall():
-            media = Media(
-                id=media_data[0],
-                file_path=media_data[1],
-                type=media_data[2],
-                created_at=datetime.fromisoformat(media_data[3]),
-                description=media_data[4]
-            )
-            card.media.append(media)
-    
-    def _get_all_event_cards(self, cursor: sqlite3.Cursor) -> List[EventCard]:
-        """Get all event cards"""
-        cursor.execute('''
-            SELECT c.*, e.start_date, e.end_date
-            FROM cards c
-            JOIN events e ON c.id = e.id
-        ''')
-        
-        cards = []
-        for data in cursor.fetchall():
-            card = EventCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                start_date=datetime.fromisoformat(data[4]),
-                end_date=datetime.fromisoformat(data[5]) if data[5] else None
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
-    
-    def _get_all_memory_cards(self, cursor: sqlite3.Cursor) -> List[MemoryCard]:
-        """Get all memory cards"""
-        cursor.execute('''
-            SELECT c.*, m.date, m.emotion, m.intensity
-            FROM cards c
-            JOIN memories m ON c.id = m.id
-        ''')
-        
-        cards = []
-        for data in cursor.fetchall():
-            card = MemoryCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                date=datetime.fromisoformat(data[4]),
-                emotion=data[5],
-                intensity=data[6]
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
-    
-    def _get_all_person_cards(self, cursor: sqlite3.Cursor) -> List[PersonCard]:
-        """Get all person cards"""
-        cursor.execute('''
-            SELECT c.*, p.relationship
-            FROM cards c
-            JOIN people p ON c.id = p.id
-        ''')
-        
-        cards = []
-        for data in cursor.fetchall():
-            card = PersonCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                relationship=data[4]
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
-    
-    def _get_all_place_cards(self, cursor: sqlite3.Cursor) -> List[PlaceCard]:
-        """Get all place cards"""
-        cursor.execute('''
-            SELECT c.*, p.latitude, p.longitude
-            FROM cards c
-            JOIN places p ON c.id = p.id
-        ''')
-        
-        cards = []
-        for data in cursor.fetchall():
-            card = PlaceCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                latitude=data[4],
-                longitude=data[5]
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
-    
-    def _get_all_time_period_cards(self, cursor: sqlite3.Cursor) -> List[TimePeriodCard]:
-        """Get all time period cards"""
-        cursor.execute('''
-            SELECT c.*, tp.start_date, tp.end_date
-            FROM cards c
-            JOIN time_periods tp ON c.id = tp.id
-        ''')
-        
-        cards = []
-        for data in cursor.fetchall():
-            card = TimePeriodCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                start_date=datetime.fromisoformat(data[4]),
-                end_date=datetime.fromisoformat(data[5]) if data[5] else None
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
-    
-    def _get_all_day_cards(self, cursor: sqlite3.Cursor) -> List[DayCard]:
-        """Get all day cards"""
-        cursor.execute('''
-            SELECT c.*, d.date
-            FROM cards c
-            JOIN days d ON c.id = d.id
-        ''')
+    def _load_cards(self, conn: sqlite3.Connection, card_type: Type[T], where: str = '',
+                    params: tuple = ()) -> Iterator[List[T]]:
+        """Yield pages of fully loaded cards of one type.
         
-        cards = []
-        for data in cursor.fetchall():
-            card = DayCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                date=datetime.fromisoformat(data[4])
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
-    
-    def _get_all_year_cards(self, cursor: sqlite3.Cursor) -> List[YearCard]:
-        """Get all year cards"""
-        cursor.execute('''
-            SELECT c.*, y.year
-            FROM cards c
-            JOIN years y ON c.id = y.id
-        ''')
-        
-        cards = []
-        for data in cursor.fetchall():
-            card = YearCard(
-                id=data[0],
-                title=data[1],
-                description=data[2],
-                created_at=datetime.fromisoformat(data[3]),
-                year=data[4]
-            )
-            
-            # Get related data
-            self._get_card_relationships(cursor, card)
-            self._get_card_media(cursor, card)
-            
-            cards.append(card)
-        
-        return cards
+        Every page costs a constant number of queries: one for the cards, one
+        per relationship table and one for media, however large the page is.
+        """
+        select, build = _CARD_SELECTS[card_type]
+        cursor = conn.cursor()
+        cursor.execute(f'{select} {where} ORDER BY c.id', params)
+        
+        while True:
+            rows = cursor.fetchmany(self.page_size)
+            if not rows:
+                return
+            cards = [build(row) for row in rows]
+            for card in cards:
+                # The relational schema doesn't store images
+                card.image_path = DEFAULT_IMAGE_PATH
+            self._load_relationships(conn, cards)
+            self._load_media(conn, cards)
+            yield cards
+    
+    def _fetch_related(self, conn: sqlite3.Connection, link_table: str, owner_column: str,
+                       related_column: str, card_type: Type[BaseCard],
+                       owner_ids: List[int]) -> Dict[int, List[BaseCard]]:
+        """Fetch the cards linked to a batch of owners through a junction table."""
+        select, build = _CARD_SELECTS[card_type]
+        placeholders = ', '.join('?' * len(owner_ids))
+        rows = conn.execute(f'''
+            SELECT l.{owner_column}, sub.*
+            FROM {link_table} l
+            JOIN ({select}) sub ON sub.id = l.{related_column}
+            WHERE l.{owner_column} IN ({placeholders})
+        ''', owner_ids).fetchall()
+        
+        related: Dict[int, List[BaseCard]] = defaultdict(list)
+        for row in rows:
+            related[row[0]].append(build(row[1:]))
+        return related
+    
+    def _load_relationships(self, conn: sqlite3.Connection, cards: List[BaseCard]):
+        """Attach related cards to a page of cards"""
+        events = [card for card in cards if isinstance(card, EventCard)]
+        if events:
+            ids = [card.id for card in events]
+            people = self._fetch_related(conn, 'event_people', 'event_id', 'person_id', PersonCard, ids)
+            places = self._fetch_related(conn, 'event_places', 'event_id', 'place_id', PlaceCard, ids)
+            periods = self._fetch_related(conn, 'event_time_periods', 'event_id', 'time_period_id', TimePeriodCard, ids)
+            for card in events:
+                card.people = people.get(card.id, [])
+                card.location = _first(places.get(card.id))
+                card.time_period = _first(periods.get(card.id))
+        
+        memories = [card for card in cards if isinstance(card, MemoryCard)]
+        if memories:
+            ids = [card.id for card in memories]
+            people = self._fetch_related(conn, 'memory_people', 'memory_id', 'person_id', PersonCard, ids)
+            places = self._fetch_related(conn, 'memory_places', 'memory_id', 'place_id', PlaceCard, ids)
+            periods = self._fetch_related(conn, 'memory_time_periods', 'memory_id', 'time_period_id', TimePeriodCard, ids)
+            events = self._fetch_related(conn, 'memory_events', 'memory_id', 'event_id', EventCard, ids)
+            for card in memories:
+                card.associated_people = people.get(card.id, [])
+                card.associated_place = _first(places.get(card.id))
+                card.associated_time_period = _first(periods.get(card.id))
+                card.associated_event = _first(events.get(card.id))
+    
+    def _load_media(self, conn: sqlite3.Connection, cards: List[BaseCard]):
+        """Attach media to a page of cards"""
+        placeholders = ', '.join('?' * len(cards))
+        rows = conn.execute(f'''
+            SELECT cm.card_id, cm.card_type, m.id, m.file_path, m.type, m.created_at, m.description
+            FROM card_media cm
+            JOIN media m ON m.id = cm.media_id
+            WHERE cm.card_id IN ({placeholders})
+            ORDER BY m.id
+        ''', [card.id for card in cards]).fetchall()
+        
+        media: Dict[tuple, List[Media]] = defaultdict(list)
+        for card_id, card_type, media_id, file_path, media_type, created_at, description in rows:
+            media[(card_id, card_type)].append(Media(
+                id=media_id,
+                file_path=file_path,
+                type=MediaType(media_type),
+                created_at=_parse_datetime(created_at),
+                description=description
+            ))
+        for card in cards:
+            card.media = media.get((card.id, type(card).__name__), [])
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """Parse a stored timestamp, which may be missing."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+def _first(cards: Optional[List[BaseCard]]) -> Optional[BaseCard]:
+    return cards[0] if cards else None
+
+def _event_card_from_row(row: tuple) -> EventCard:
+    # EventCard has a single date; the stored start_date is used for it
+    return EventCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        date=_parse_datetime(row[4])
+    )
+
+def _memory_card_from_row(row: tuple) -> MemoryCard:
+    return MemoryCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        date=_parse_datetime(row[4]),
+        emotion=row[5],
+        intensity=row[6]
+    )
+
+def _person_card_from_row(row: tuple) -> PersonCard:
+    return PersonCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        relationships=[row[4]] if row[4] else []
+    )
+
+def _place_card_from_row(row: tuple) -> PlaceCard:
+    return PlaceCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        latitude=row[4],
+        longitude=row[5]
+    )
+
+def _time_period_card_from_row(row: tuple) -> TimePeriodCard:
+    return TimePeriodCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        start_date=_parse_datetime(row[4]),
+        end_date=_parse_datetime(row[5])
+    )
+
+def _day_card_from_row(row: tuple) -> DayCard:
+    return DayCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        date=_parse_datetime(row[4])
+    )
+
+def _year_card_from_row(row: tuple) -> YearCard:
+    return YearCard(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        created_at=_parse_datetime(row[3]),
+        year=row[4]
+    )
+
+# Card type -> (SELECT yielding id, title, description, created_at and the
+# type-specific columns in builder order, row builder)
+_CARD_SELECTS = {
+    EventCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, e.start_date, e.end_date '
+        'FROM cards c JOIN events e ON c.id = e.id',
+        _event_card_from_row
+    ),
+    MemoryCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, m.date, m.emotion, m.intensity '
+        'FROM cards c JOIN memories m ON c.id = m.id',
+        _memory_card_from_row
+    ),
+    PersonCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, p.relationship '
+        'FROM cards c JOIN people p ON c.id = p.id',
+        _person_card_from_row
+    ),
+    PlaceCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, p.latitude, p.longitude '
+        'FROM cards c JOIN places p ON c.id = p.id',
+        _place_card_from_row
+    ),
+    TimePeriodCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, tp.start_date, tp.end_date '
+        'FROM cards c JOIN time_periods tp ON c.id = tp.id',
+        _time_period_card_from_row
+    ),
+    DayCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, d.date '
+        'FROM cards c JOIN days d ON c.id = d.id',
+        _day_card_from_row
+    ),
+    YearCard: (
+        'SELECT c.id, c.title, c.description, c.created_at, y.year '
+        'FROM cards c JOIN years y ON c.id = y.id',
+        _year_card_from_row
+    ),
+}
 
 def validate_card(card: Union[BaseCard, EventCard, LocationCard, PersonCard, EmotionCard]) -> bool:
     """Validate card structure and required fields"""
@@ -1,15 +1,15 @@
 import sqlite3
 from flask import g
+from db.pool import get_pool
 
 def get_db():
-    """Get database connection from the application context."""
+    """Get the pooled database connection for the application context."""
     if 'db' not in g:
-        g.db = sqlite3.connect('droecore.db')
-        g.db.row_factory = sqlite3.Row
+        g.db = get_pool().acquire(row_factory=sqlite3.Row)
     return g.db
 
 def close_db(error):
-    """Close database connection when the application context ends."""
+    """Return the database connection to the pool when the application context ends."""
     db = g.pop('db', None)
     if db is not None:
-        db.close() 
\ No newline at end of file
+        get_pool().release(db)
\ No newline at end of file
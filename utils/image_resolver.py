@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Optional
+import threading
+from utils.image_generator import ImageGenerator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ImageResolver:
+    """Resolves pending card images in the background."""
+
+    def __init__(self, max_workers: int = 2, image_generator: Optional[ImageGenerator] = None):
+        """
+        Initialize the image resolver.
+
+        Args:
+            max_workers (int): Maximum number of concurrent image generations
+            image_generator (Optional[ImageGenerator]): Generator shared by all workers
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-resolver")
+        self._image_generator = image_generator
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def image_generator(self) -> ImageGenerator:
+        """Shared image generator, created on first use."""
+        if self._image_generator is None:
+            self._image_generator = ImageGenerator()
+        return self._image_generator
+
+    def submit(self, card, callback: Optional[Callable] = None) -> Future:
+        """
+        Queue a card for image generation.
+
+        A card that is already queued is not submitted twice.
+
+        Args:
+            card (BaseCard): The card whose image is pending
+            callback (Optional[Callable]): Called with the card once its image is set
+
+        Returns:
+            Future: Resolves to the card's image path
+        """
+        with self._lock:
+            future = self._pending.get(card.id)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._resolve, card, callback)
+            self._pending[card.id] = future
+            return future
+
+    def _resolve(self, card, callback: Optional[Callable]) -> str:
+        try:
+            image_path = card.resolve_image(self.image_generator)
+            if callback:
+                callback(card)
+            return image_path
+        except Exception as e:
+            logger.error(f"Error resolving image for card {card.id}: {str(e)}")
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(card.id, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work and optionally wait for queued images.
+
+        Args:
+            wait (bool): Whether to block until queued images are resolved
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,18 @@
+import os
+
+# Runtime state (session, job and cache databases) lives here instead of
+# in whatever directory the process was started from
+DATA_DIR = os.getenv('DROE_DATA_DIR', 'instance')
+
+def data_path(filename: str) -> str:
+    """
+    Get the path of a runtime file in DATA_DIR, creating the directory if needed.
+
+    Args:
+        filename (str): Name of the file
+
+    Returns:
+        str: Path to the file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
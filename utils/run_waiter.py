@@ -0,0 +1,207 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Assistant run statuses after which polling stops
+TERMINAL_RUN_STATUSES = frozenset([
+    'completed', 'failed', 'cancelled', 'expired', 'incomplete', 'requires_action'
+])
+
+class RunWaitError(Exception):
+    """Base class for run waiting errors."""
+    pass
+
+class RunTimeoutError(RunWaitError, TimeoutError):
+    """The run did not finish before the deadline."""
+    pass
+
+class RunCancelledError(RunWaitError):
+    """Waiting was cancelled by the caller."""
+    pass
+
+class RunFailedError(RunWaitError):
+    """The run finished without completing."""
+
+    def __init__(self, run: Any):
+        self.run = run
+        super().__init__(f"Run failed with status: {run.status}")
+
+class Backoff:
+    """Exponential backoff delays with full jitter."""
+
+    def __init__(self, initial: float = 0.25, maximum: float = 4.0,
+                 multiplier: float = 2.0, jitter: float = 0.5):
+        """
+        Initialize the backoff schedule.
+
+        Args:
+            initial (float): First delay in seconds
+            maximum (float): Upper bound for a single delay in seconds
+            multiplier (float): Growth factor between attempts
+            jitter (float): Fraction of each delay that is randomized (0 to 1)
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._current = initial
+
+    def next_delay(self) -> float:
+        """Return the next delay and advance the schedule."""
+        delay = self._current
+        self._current = min(self._current * self.multiplier, self.maximum)
+        return delay * (1 - self.jitter * random.random())
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else deadline - time.monotonic()
+
+def poll(fetch: Callable[[], Any], is_done: Callable[[Any], bool], timeout: Optional[float] = 60.0,
+         backoff: Optional[Backoff] = None, cancel_event: Optional[threading.Event] = None) -> Any:
+    """
+    Call ``fetch`` with backoff until ``is_done`` accepts its result.
+
+    Args:
+        fetch (Callable): Retrieves the current state
+        is_done (Callable): Returns True once the state is final
+        timeout (Optional[float]): Seconds before giving up, or None to wait forever
+        backoff (Optional[Backoff]): Delay schedule between polls
+        cancel_event (Optional[threading.Event]): Set to stop waiting early
+
+    Returns:
+        Any: The final state
+
+    Raises:
+        RunTimeoutError: If the deadline passes first
+        RunCancelledError: If cancel_event is set
+    """
+    backoff = backoff or Backoff()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            raise RunCancelledError("Waiting was cancelled")
+        state = fetch()
+        if is_done(state):
+            return state
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= 0:
+            raise RunTimeoutError(f"Timed out after {timeout} seconds")
+        delay = backoff.next_delay()
+        if remaining is not None:
+            delay = min(delay, remaining)
+        # Event.wait doubles as an interruptible sleep
+        if cancel_event is not None:
+            cancel_event.wait(delay)
+        else:
+            time.sleep(delay)
+
+async def poll_async(fetch: Callable[[], Awaitable[Any]], is_done: Callable[[Any], bool],
+                     timeout: Optional[float] = 60.0, backoff: Optional[Backoff] = None,
+                     cancel_event: Optional[asyncio.Event] = None) -> Any:
+    """
+    Asyncio variant of :func:`poll` that waits without holding a thread.
+
+    Cancelling the surrounding task also stops the wait.
+    """
+    backoff = backoff or Backoff()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            raise RunCancelledError("Waiting was cancelled")
+        state = await fetch()
+        if is_done(state):
+            return state
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= 0:
+            raise RunTimeoutError(f"Timed out after {timeout} seconds")
+        delay = backoff.next_delay()
+        if remaining is not None:
+            delay = min(delay, remaining)
+        if cancel_event is not None:
+            try:
+                await asyncio.wait_for(cancel_event.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(delay)
+
+def _run_finished(run: Any) -> bool:
+    return run.status in TERMINAL_RUN_STATUSES
+
+def _check_run(run: Any) -> Any:
+    if run.status != 'completed':
+        raise RunFailedError(run)
+    return run
+
+def wait_for_run(client: Any, thread_id: str, run_id: str, timeout: Optional[float] = 60.0,
+                 backoff: Optional[Backoff] = None,
+                 cancel_event: Optional[threading.Event] = None) -> Any:
+    """
+    Wait for an assistant run to complete.
+
+    Args:
+        client: OpenAI client (or the ``openai`` module) exposing ``beta.threads.runs``
+        thread_id (str): The thread the run belongs to
+        run_id (str): The run to wait for
+        timeout (Optional[float]): Seconds before giving up
+        backoff (Optional[Backoff]): Delay schedule between polls
+        cancel_event (Optional[threading.Event]): Set to stop waiting early
+
+    Returns:
+        The completed run
+
+    Raises:
+        RunFailedError: If the run ends in any status other than completed
+        RunTimeoutError: If the deadline passes first; the run is cancelled server-side
+        RunCancelledError: If cancel_event is set; the run is cancelled server-side
+    """
+    runs = client.beta.threads.runs
+    try:
+        run = poll(
+            lambda: runs.retrieve(thread_id=thread_id, run_id=run_id),
+            _run_finished,
+            timeout=timeout,
+            backoff=backoff,
+            cancel_event=cancel_event
+        )
+    except (RunTimeoutError, RunCancelledError):
+        _cancel_run(runs, thread_id, run_id)
+        raise
+    return _check_run(run)
+
+async def wait_for_run_async(client: Any, thread_id: str, run_id: str, timeout: Optional[float] = 60.0,
+                             backoff: Optional[Backoff] = None,
+                             cancel_event: Optional[asyncio.Event] = None) -> Any:
+    """
+    Asyncio variant of :func:`wait_for_run` for an ``AsyncOpenAI`` client.
+
+    Many runs can be awaited concurrently from one event loop, e.g. with
+    ``asyncio.gather``.
+    """
+    runs = client.beta.threads.runs
+    try:
+        run = await poll_async(
+            lambda: runs.retrieve(thread_id=thread_id, run_id=run_id),
+            _run_finished,
+            timeout=timeout,
+            backoff=backoff,
+            cancel_event=cancel_event
+        )
+    except (RunTimeoutError, RunCancelledError, asyncio.CancelledError):
+        try:
+            await runs.cancel(thread_id=thread_id, run_id=run_id)
+        except Exception as e:
+            logger.warning(f"Could not cancel run {run_id}: {str(e)}")
+        raise
+    return _check_run(run)
+
+def _cancel_run(runs: Any, thread_id: str, run_id: str) -> None:
+    """Best-effort server-side cancellation of an abandoned run."""
+    try:
+        runs.cancel(thread_id=thread_id, run_id=run_id)
+    except Exception as e:
+        logger.warning(f"Could not cancel run {run_id}: {str(e)}")